@@ -1,4 +1,4 @@
-from .budget import Budget
+from .budget import Budget, EnvelopeBudget
 from .expense_tracker import ExpenseTracker
 from .savings_calculator import SavingsCalculator
 from .investment_portfolio import InvestmentPortfolio
@@ -7,4 +7,17 @@ from .net_worth_calculator import NetWorthCalculator
 from .financial_goal_planner import FinancialGoalPlanner
 from .currency_converter import CurrencyConverter
 from .tax_estimator import TaxEstimator
-from .debt_manager import DebtManager
\ No newline at end of file
+from .debt_manager import DebtManager
+from .columnar_store import BulkValidationError, ColumnarExpenseStore
+from .expense_io import read_expenses_csv, read_expenses_jsonl, write_expenses_csv, write_expenses_jsonl
+from .ledger_file import ExpenseLedgerFile
+from .partitioned_tracker import PartitionedExpenseTracker
+from .sketches import HeavyHitters, QuantileSketch
+from .recurring import RecurringExpense
+from .anomaly_detector import SpendAnomalyDetector
+from .budget_book import BudgetBook
+from .cost_basis import CostBasisLedger
+from .price_history import PriceHistory
+from .monte_carlo import MonteCarloSimulator
+from .price_feed import PortfolioRevaluer
+from .rebalancer import Rebalancer
\ No newline at end of file
@@ -0,0 +1,147 @@
+import math
+
+
+class RunningStats:
+    """
+    Running mean and variance of a stream (Welford's algorithm), with an
+    optional exponentially weighted mean and variance alongside.
+    """
+
+    def __init__(self, alpha=None):
+        """
+        Initialize empty statistics.
+        :param alpha: Smoothing factor of the EWMA between 0 and 1 (optional).
+        """
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.ewma = None
+        self.ewm_variance = 0.0
+
+    def update(self, value):
+        """
+        Add one value.
+        :param value: The value to add.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.alpha is not None:
+            if self.ewma is None:
+                self.ewma = float(value)
+            else:
+                diff = value - self.ewma
+                increment = self.alpha * diff
+                self.ewma += increment
+                self.ewm_variance = (1 - self.alpha) * (self.ewm_variance + diff * increment)
+
+    @property
+    def variance(self):
+        """
+        Sample variance of the values seen so far.
+        """
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def z_score(self, value):
+        """
+        Standard score of a value against the running mean and variance, or None when undefined.
+        :param value: The value to score.
+        """
+        std = math.sqrt(self.variance)
+        return (value - self.mean) / std if std > 0 else None
+
+    def ewma_z_score(self, value):
+        """
+        Standard score of a value against the EWMA, or None when undefined.
+        :param value: The value to score.
+        """
+        if self.ewma is None or self.ewm_variance <= 0:
+            return None
+        return (value - self.ewma) / math.sqrt(self.ewm_variance)
+
+
+class SpendAnomalyDetector:
+    """
+    Flags unusual expenses as they arrive, with O(1) work per expense.
+
+    Running statistics are kept per description (or per tag) and per weekday.
+    An expense is flagged when its amount lies more than `threshold` standard
+    deviations above the mean of any of its groups, using only the history seen
+    before it. Flagged records go to the callback and are also yielded by stream().
+    """
+
+    def __init__(self, threshold=3.0, min_samples=5, alpha=None, group_by="description", callback=None):
+        """
+        Initialize the detector.
+        :param threshold: Number of standard deviations above the mean that counts as unusual (default 3).
+        :param min_samples: History a group needs before it can flag anything (default 5).
+        :param alpha: EWMA smoothing factor; also scores against the EWMA when given (optional).
+        :param group_by: "description" or "tags" (each tag is its own group).
+        :param callback: Function called with each flagged record (optional).
+        """
+        if threshold <= 0:
+            raise ValueError("Threshold must be greater than zero.")
+        if min_samples < 2:
+            raise ValueError("Minimum samples must be at least 2.")
+        if alpha is not None and not 0 < alpha <= 1:
+            raise ValueError("Alpha must be between 0 and 1.")
+        if group_by not in ("description", "tags"):
+            raise ValueError("Group by must be 'description' or 'tags'.")
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.group_by = group_by
+        self.callback = callback
+        self.groups = {}
+        self.weekdays = {}
+
+    def _groups_for(self, expense):
+        groups = []
+        if self.group_by == "description":
+            groups.append((("description", expense["description"]), self.groups))
+        else:
+            groups.extend((("tag", tag), self.groups) for tag in expense.get("tags", ()))
+        date = expense.get("date")
+        if hasattr(date, "weekday"):
+            groups.append((("weekday", date.weekday()), self.weekdays))
+        return groups
+
+    def observe(self, expense):
+        """
+        Score an expense and add it to the statistics.
+        Can be registered directly with ExpenseTracker.add_listener.
+        :param expense: Expense dict with "description", "amount" and "date" keys.
+        :return: The flagged record, or None when the expense looks normal.
+        """
+        amount = expense["amount"]
+        reasons = []
+        for key, table in self._groups_for(expense):
+            stats = table.get(key)
+            if stats is None:
+                stats = table[key] = RunningStats(self.alpha)
+            if stats.count >= self.min_samples:
+                score = stats.z_score(amount)
+                if score is not None and score > self.threshold:
+                    reasons.append({"group": key, "z_score": score, "mean": stats.mean})
+                score = stats.ewma_z_score(amount)
+                if score is not None and score > self.threshold:
+                    reasons.append({"group": key, "ewma_z_score": score, "ewma": stats.ewma})
+            stats.update(amount)
+        if not reasons:
+            return None
+        flagged = {"expense": expense, "reasons": reasons}
+        if self.callback is not None:
+            self.callback(flagged)
+        return flagged
+
+    def stream(self, expenses):
+        """
+        Observe a stream of expenses and lazily yield the flagged records.
+        :param expenses: Iterable of expense dicts.
+        """
+        for expense in expenses:
+            flagged = self.observe(expense)
+            if flagged is not None:
+                yield flagged
@@ -1,43 +1,269 @@
+from datetime import date as _date, datetime, timedelta
+
+import numpy as np
+
+from .calendar_periods import PERIODS, period_start
+from .columnar_store import BulkValidationError, batch_columns, batch_ordinals
+from .expense_io import write_expenses_jsonl
+
 class Budget : 
-    def __init__(self, name, total_amount):
+    def __init__(self, name, total_amount, retention_days=None, compaction_period="month", archive_path=None):
         """
             Initialize a budget with a name and total amount.
+            :param retention_days : Keep individual expenses for this many days and fold older ones
+                into one aggregate record per period, keeping memory bounded (optional).
+            :param compaction_period : Period of the aggregate records: "week", "month", "quarter" or "year".
+            :param archive_path : JSON Lines file that compacted expenses are appended to (optional).
         """
 
+        if retention_days is not None and retention_days < 0 :
+            raise ValueError("Retention days must be non-negative.")
+        if compaction_period not in PERIODS :
+            raise ValueError(f"Compaction period must be one of: {', '.join(PERIODS)}.")
         self.name = name
         self.total_amount = total_amount
         self.expenses = []
+        self._spent = 0
+        self.retention_days = retention_days
+        self.compaction_period = compaction_period
+        self.archive_path = archive_path
+        self._compact_at = COMPACTION_MIN_ROWS
 
-    def add_expense(self, description, amount):
+    def add_expense(self, description, amount, date=None):
         """
             Add an expense to the budget.
+            :param date : Date of the expense (optional, defaults to today).
         """
 
         if amount > self.total_amount : 
             raise ValueError("Expense exceeds remaining budget.")
-        self.expenses.append({"description" : description, "amount" : amount})
+        if date is None :
+            date = datetime.now().date()
+        elif isinstance(date, datetime) :
+            date = date.date()
+        elif not isinstance(date, _date) :
+            raise ValueError("Date must be a date.")
+        self.expenses.append({"description" : description, "amount" : amount, "date" : date})
+        self._spent += amount
+        self._maybe_compact()
+
+    def add_expenses_bulk(self, records=None, descriptions=None, amounts=None, dates=None):
+        """
+            Add a batch of expenses to the budget in one step.
+            Every row is validated first and all rejected rows are reported together.
+            :param records: Iterable of dicts or (description, amount[, date]) tuples, or a mapping of columns (optional).
+            :param descriptions: Sequence of descriptions, used when records is not given.
+            :param amounts: Sequence or array of amounts, used when records is not given.
+            :param dates: Sequence, datetime64 array or single date (optional, defaults to today).
+            :return: The number of expenses added.
+        """
+
+        descriptions, amounts, dates, _ = batch_columns(records, descriptions, amounts, dates)
+        ordinals, invalid = batch_ordinals(dates, len(amounts), datetime.now().date())
+        invalid |= ~(amounts > 0)
+        if invalid.any():
+            raise BulkValidationError(
+                "Amount must be greater than zero and date must be a date.", np.flatnonzero(invalid)
+            )
+        invalid = amounts > self.total_amount
+        if invalid.any():
+            raise BulkValidationError("Expense exceeds remaining budget.", np.flatnonzero(invalid))
+        unique, inverse = np.unique(ordinals, return_inverse=True)
+        days = [_date.fromordinal(ordinal) for ordinal in unique.tolist()]
+        self.expenses.extend(
+            {"description" : description, "amount" : amount, "date" : days[day]}
+            for description, amount, day in zip(descriptions, amounts.tolist(), inverse.tolist())
+        )
+        self._spent += float(amounts.sum())
+        self._maybe_compact()
+        return len(amounts)
+
+    def _maybe_compact(self):
+        """
+            Compact once the expense list has doubled since the last compaction,
+            so the amortized cost per expense stays constant.
+        """
+
+        if self.retention_days is not None and len(self.expenses) >= self._compact_at :
+            self.compact()
+
+    def compact(self, before=None, archive_path=None):
+        """
+            Fold expenses dated before a cutoff into one aggregate record per period.
+            Aggregate records keep the total amount and the number of expenses they
+            replace, so total_expenses() and summary() are unchanged.
+            :param before : Cutoff date (optional, defaults to today minus retention_days).
+            :param archive_path : JSON Lines file to append the raw compacted expenses to
+                (optional, defaults to the budget's archive_path).
+            :return : The number of expenses folded into aggregates.
+        """
+
+        if before is None :
+            if self.retention_days is None :
+                raise ValueError("Provide a cutoff date or set retention_days.")
+            before = datetime.now().date() - timedelta(days=self.retention_days)
+        elif isinstance(before, datetime) :
+            before = before.date()
+        archive_path = archive_path or self.archive_path
+
+        buckets = {}
+        kept = []
+        archived = []
+        for expense in self.expenses :
+            date = expense.get("date")
+            if date is None or date >= before :
+                kept.append(expense)
+                continue
+            start = period_start(date.toordinal(), self.compaction_period)
+            bucket = buckets.setdefault(start, [0, 0])
+            bucket[0] += expense["amount"]
+            if expense.get("compacted") :
+                bucket[1] += expense["count"]
+            else :
+                bucket[1] += 1
+                archived.append(expense)
+
+        if archived and archive_path is not None :
+            with open(archive_path, "a", newline="", encoding="utf-8") as f :
+                write_expenses_jsonl(archived, f)
+
+        aggregates = [
+            {
+                "description" : f"{count} expenses compacted",
+                "amount" : amount,
+                "date" : _date.fromordinal(start),
+                "count" : count,
+                "compacted" : True,
+            }
+            for start, (amount, count) in sorted(buckets.items())
+        ]
+        self.expenses = aggregates + kept
+        self._compact_at = max(COMPACTION_MIN_ROWS, 2 * len(self.expenses))
+        return len(archived)
 
     def total_expenses(self):
         """
             Calculate the total expenses.
         """
-        return sum(expense["amount"] for expense in self.expenses)
+        return self._spent
 
     def remaining_budget(self):
         """
             Caclulate the remaining budget.
         """
 
-        return self.total_amount - self.total_expenses()
+        return self.total_amount - self._spent
 
     def summary(self):
         """
             Return a summary of the budget.
         """
 
+        spent = self._spent
         return {
             "name" : self.name,
             "total_amount" : self.total_amount,
-            "total_expenses" : self.total_expenses(),
-            "remaining_budget" : self.remaining_budget(),
-        }
\ No newline at end of file
+            "total_expenses" : spent,
+            "remaining_budget" : self.total_amount - spent,
+        }
+
+# Never compact automatically below this many expense records.
+COMPACTION_MIN_ROWS = 1024
+
+
+class EnvelopeBudget(Budget) :
+    def __init__(self, name, total_amount, parent=None):
+        """
+            Initialize an envelope in a budget tree, e.g. Household -> Food -> Groceries.
+            Totals of an envelope include the expenses of all envelopes below it.
+            :param name : Name of the envelope.
+            :param total_amount : Amount allocated to the envelope.
+            :param parent : The envelope this one belongs to (optional).
+        """
+
+        super().__init__(name, total_amount)
+        self.parent = parent
+        self.children = {}
+
+    def add_envelope(self, name, total_amount):
+        """
+            Create a child envelope.
+            :param name : Name of the child, unique among its siblings.
+            :param total_amount : Amount allocated to the child.
+        """
+
+        if name in self.children :
+            raise ValueError(f"Envelope {name} already exists.")
+        child = EnvelopeBudget(name, total_amount, parent=self)
+        self.children[name] = child
+        return child
+
+    def envelope(self, *path):
+        """
+            Look up a descendant by its names, e.g. envelope("Food", "Groceries").
+        """
+
+        node = self
+        for name in path :
+            if name not in node.children :
+                raise ValueError(f"Envelope {name} not found.")
+            node = node.children[name]
+        return node
+
+    def ancestors(self):
+        """
+            Yield the parent, grandparent and so on up to the root.
+        """
+
+        node = self.parent
+        while node is not None :
+            yield node
+            node = node.parent
+
+    def add_expense(self, description, amount, date=None):
+        """
+            Add an expense to this envelope and roll it up to every ancestor in O(depth).
+        """
+
+        for node in self.ancestors() :
+            if amount > node.total_amount :
+                raise ValueError("Expense exceeds remaining budget.")
+        super().add_expense(description, amount, date)
+        for node in self.ancestors() :
+            node._spent += amount
+
+    def add_expenses_bulk(self, records=None, descriptions=None, amounts=None, dates=None):
+        """
+            Add a batch of expenses to this envelope and roll the batch total up to every ancestor.
+        """
+
+        descriptions, amounts, dates, _ = batch_columns(records, descriptions, amounts, dates)
+        for node in self.ancestors() :
+            invalid = amounts > node.total_amount
+            if invalid.any() :
+                raise BulkValidationError("Expense exceeds remaining budget.", np.flatnonzero(invalid))
+        before = self._spent
+        added = super().add_expenses_bulk(descriptions=descriptions, amounts=amounts, dates=dates)
+        for node in self.ancestors() :
+            node._spent += self._spent - before
+        return added
+
+    def tree_summary(self):
+        """
+            Return the summary of this envelope with the summaries of all envelopes below it
+            under "envelopes". Uses the rolled-up totals, so no expense list is scanned.
+        """
+
+        summary = self.summary()
+        summary["envelopes"] = [child.tree_summary() for child in self.children.values()]
+        return summary
+
+    def over_budget(self):
+        """
+            Return the envelopes in this tree whose expenses exceed their allocation.
+        """
+
+        found = [self] if self._spent > self.total_amount else []
+        for child in self.children.values() :
+            found.extend(child.over_budget())
+        return found
@@ -0,0 +1,223 @@
+from numbers import Integral
+
+import numpy as np
+
+from .columnar_store import BulkValidationError
+
+
+class BudgetBook:
+    """
+    Many budgets held in columnar arrays, one row per budget.
+
+    Totals and spent amounts live in float64 arrays so that over-budget checks,
+    batch summaries and bulk expense application are single vectorized
+    operations instead of a Python loop over Budget objects. Budgets are keyed
+    by an id; integer ids are looked up with a sorted index in bulk operations.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty book.
+        :param capacity: Number of budgets to reserve space for up front (optional).
+        """
+        capacity = max(int(capacity), 1)
+        self._totals = np.zeros(capacity, dtype=np.float64)
+        self._spent = np.zeros(capacity, dtype=np.float64)
+        self.ids = []
+        self.names = []
+        self._rows = {}
+        self._integer_ids = True
+        self._sorted = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, budget_id):
+        return budget_id in self._rows
+
+    @classmethod
+    def from_budgets(cls, budgets):
+        """
+        Build a book from existing Budget objects, keyed by their position.
+        :param budgets: Sequence of Budget instances.
+        """
+        budgets = list(budgets)
+        book = cls(len(budgets))
+        book.add_budgets(range(len(budgets)), [b.name for b in budgets], [b.total_amount for b in budgets])
+        book._spent[:len(budgets)] = [b.total_expenses() for b in budgets]
+        return book
+
+    def _reserve(self, extra):
+        needed = len(self.ids) + extra
+        capacity = len(self._totals)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_totals", "_spent"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=np.float64)
+            new[:len(self.ids)] = old[:len(self.ids)]
+            setattr(self, name, new)
+
+    def add_budget(self, budget_id, name, total_amount):
+        """
+        Add one budget.
+        :param budget_id: Unique id of the budget, e.g. a user id.
+        :param name: Name of the budget.
+        :param total_amount: Total amount of the budget.
+        """
+        self.add_budgets([budget_id], [name], [total_amount])
+
+    def add_budgets(self, budget_ids, names, total_amounts):
+        """
+        Add a batch of budgets.
+        :param budget_ids: Unique ids of the budgets.
+        :param names: Names of the budgets.
+        :param total_amounts: Total amounts of the budgets.
+        """
+        budget_ids = list(budget_ids)
+        names = list(names)
+        totals = np.asarray(total_amounts, dtype=np.float64)
+        if not len(budget_ids) == len(names) == len(totals):
+            raise ValueError("Budget ids, names and totals must have the same length.")
+        seen = set()
+        duplicates = []
+        for i, budget_id in enumerate(budget_ids):
+            if budget_id in self._rows or budget_id in seen:
+                duplicates.append(i)
+            seen.add(budget_id)
+        if duplicates:
+            raise BulkValidationError("Budget id already exists.", duplicates)
+        self._reserve(len(budget_ids))
+        start = len(self.ids)
+        self._totals[start:start + len(totals)] = totals
+        for offset, budget_id in enumerate(budget_ids):
+            self._rows[budget_id] = start + offset
+        self._integer_ids = self._integer_ids and all(isinstance(b, Integral) for b in budget_ids)
+        self.ids.extend(budget_ids)
+        self.names.extend(names)
+        self._sorted = None
+
+    def _lookup(self, budget_ids):
+        """
+        Map budget ids to row numbers; unknown ids map to -1.
+        """
+        if isinstance(budget_ids, np.ndarray) and self._integer_ids and np.issubdtype(budget_ids.dtype, np.integer):
+            if self._sorted is None:
+                keys = np.asarray(self.ids, dtype=np.int64)
+                order = np.argsort(keys, kind="stable")
+                self._sorted = (keys[order], order)
+            keys, order = self._sorted
+            if not len(keys):
+                return np.full(len(budget_ids), -1, dtype=np.int64)
+            positions = np.clip(np.searchsorted(keys, budget_ids), 0, len(keys) - 1)
+            return np.where(keys[positions] == budget_ids, order[positions], -1)
+        return np.fromiter((self._rows.get(b, -1) for b in budget_ids), dtype=np.int64, count=len(budget_ids))
+
+    def add_expense(self, budget_id, amount):
+        """
+        Add an expense to one budget.
+        :param budget_id: Id of the budget.
+        :param amount: Amount of the expense.
+        """
+        self.apply_expenses([budget_id], [amount])
+
+    def apply_expenses(self, budget_ids, amounts):
+        """
+        Apply a batch of expenses keyed by budget id in one vectorized step.
+        As with Budget.add_expense, an expense larger than its budget's total is rejected;
+        every rejected or unknown row is reported before anything is applied.
+        :param budget_ids: Budget id of each expense; ids may repeat.
+        :param amounts: Amount of each expense.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if not isinstance(budget_ids, np.ndarray):
+            budget_ids = list(budget_ids)
+        if len(budget_ids) != len(amounts):
+            raise ValueError("Budget ids and amounts must have the same length.")
+        rows = self._lookup(budget_ids)
+        unknown = rows < 0
+        if unknown.any():
+            raise BulkValidationError("Budget not found.", np.flatnonzero(unknown))
+        invalid = amounts > self._totals[rows]
+        if invalid.any():
+            raise BulkValidationError("Expense exceeds remaining budget.", np.flatnonzero(invalid))
+        self._spent[:len(self.ids)] += np.bincount(rows, weights=amounts, minlength=len(self.ids))
+
+    @property
+    def total_amounts(self):
+        """
+        Total amount of every budget, in insertion order.
+        """
+        return self._totals[:len(self.ids)]
+
+    @property
+    def spent_amounts(self):
+        """
+        Spent amount of every budget, in insertion order.
+        """
+        return self._spent[:len(self.ids)]
+
+    def remaining_budgets(self):
+        """
+        Remaining amount of every budget, in insertion order.
+        """
+        return self.total_amounts - self.spent_amounts
+
+    def over_budget(self):
+        """
+        Return the ids of the budgets whose expenses exceed their total.
+        """
+        return [self.ids[i] for i in np.flatnonzero(self.spent_amounts > self.total_amounts).tolist()]
+
+    def near_limit(self, threshold=0.9):
+        """
+        Return the ids of the budgets that have used at least `threshold` of their total,
+        including those already over budget.
+        :param threshold: Fraction of the total, e.g. 0.9 for 90% (default 0.9).
+        """
+        if threshold < 0:
+            raise ValueError("Threshold must be non-negative.")
+        return [self.ids[i] for i in np.flatnonzero(self.spent_amounts >= threshold * self.total_amounts).tolist()]
+
+    def summary(self, budget_id):
+        """
+        Return the summary of one budget, in the same shape as Budget.summary().
+        :param budget_id: Id of the budget.
+        """
+        row = self._rows.get(budget_id)
+        if row is None:
+            raise ValueError("Budget not found.")
+        total = float(self._totals[row])
+        spent = float(self._spent[row])
+        return {
+            "name": self.names[row],
+            "total_amount": total,
+            "total_expenses": spent,
+            "remaining_budget": total - spent,
+        }
+
+    def summaries(self, budget_ids=None):
+        """
+        Return the summaries of many budgets as columns.
+        :param budget_ids: Ids to include (optional, defaults to every budget).
+        :return: Dict of "id", "name", "total_amount", "total_expenses" and "remaining_budget" columns.
+        """
+        if budget_ids is None:
+            rows = np.arange(len(self.ids))
+        else:
+            if not isinstance(budget_ids, np.ndarray):
+                budget_ids = list(budget_ids)
+            rows = self._lookup(budget_ids)
+            if (rows < 0).any():
+                raise BulkValidationError("Budget not found.", np.flatnonzero(rows < 0))
+        totals = self._totals[rows]
+        spent = self._spent[rows]
+        return {
+            "id": [self.ids[i] for i in rows.tolist()],
+            "name": [self.names[i] for i in rows.tolist()],
+            "total_amount": totals,
+            "total_expenses": spent,
+            "remaining_budget": totals - spent,
+        }
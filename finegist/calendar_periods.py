@@ -0,0 +1,43 @@
+from datetime import date as _date
+
+import numpy as np
+
+# Ordinal of 1970-01-01, the epoch of numpy datetime64 values.
+EPOCH_ORDINAL = _date(1970, 1, 1).toordinal()
+
+PERIODS = ("week", "month", "quarter", "year")
+# Days to add to the first day of a period to land inside the next one.
+PERIOD_SPAN = {"week": 7, "month": 31, "quarter": 92, "year": 366}
+
+
+def period_starts(ordinals, period):
+    """
+    Map an array of date ordinals to the ordinals of the first day of their period.
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if period == "week":
+        # Ordinal 1 (0001-01-01) is a Monday.
+        return ordinals - (ordinals - 1) % 7
+    days = (ordinals - EPOCH_ORDINAL).astype("datetime64[D]")
+    if period == "month":
+        starts = days.astype("datetime64[M]")
+    elif period == "quarter":
+        months = days.astype("datetime64[M]").astype(np.int64)
+        starts = (months - months % 3).astype("datetime64[M]")
+    else:
+        starts = days.astype("datetime64[Y]")
+    return starts.astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+
+
+def period_start(ordinal, period):
+    """
+    Ordinal of the first day of the period containing a single date ordinal.
+    """
+    if period == "week":
+        return ordinal - (ordinal - 1) % 7
+    date = _date.fromordinal(ordinal)
+    if period == "month":
+        return date.replace(day=1).toordinal()
+    if period == "quarter":
+        return date.replace(month=date.month - (date.month - 1) % 3, day=1).toordinal()
+    return date.replace(month=1, day=1).toordinal()
@@ -0,0 +1,280 @@
+from collections.abc import Mapping
+from datetime import date as _date
+from numbers import Real
+
+import numpy as np
+
+from .calendar_periods import EPOCH_ORDINAL
+from .expense_index import tag_tuple
+
+
+class BulkValidationError(ValueError):
+    """
+    Raised when a batch of expenses contains invalid rows.
+    The positions of every rejected row are available as `rows`.
+    """
+
+    def __init__(self, message, rows):
+        self.message = message
+        self.rows = [int(row) for row in rows]
+        shown = ", ".join(str(row) for row in self.rows[:10])
+        if len(self.rows) > 10:
+            shown += ", ..."
+        super().__init__(f"{message} ({len(self.rows)} invalid rows: {shown})")
+
+
+class ColumnarExpenseStore:
+    """
+    Array-backed storage for expenses.
+
+    Amounts, date ordinals and description ids live in contiguous typed arrays
+    and descriptions are interned, so a repeated merchant name is stored once.
+    Rows are handed out as dicts, which lets the store stand in for the plain
+    list of expenses used by ExpenseTracker.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty store.
+        :param capacity: Number of rows to reserve up front (optional).
+        """
+        capacity = max(int(capacity), 1)
+        self._amounts = np.empty(capacity, dtype=np.float64)
+        self._ordinals = np.empty(capacity, dtype=np.int32)
+        self._description_ids = np.empty(capacity, dtype=np.int32)
+        self._descriptions = []
+        self._description_lookup = {}
+        self._tags = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self._row(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if index < 0 or index >= self._size:
+            raise IndexError("Expense index out of range.")
+        return self._row(index)
+
+    def _row(self, index):
+        row = {
+            "description": self._descriptions[self._description_ids[index]],
+            "amount": float(self._amounts[index]),
+            "date": _date.fromordinal(int(self._ordinals[index])),
+        }
+        tags = self._tags.get(index)
+        if tags:
+            row["tags"] = tags
+        return row
+
+    def _reserve(self, extra):
+        """
+        Grow the column arrays so that `extra` more rows fit.
+        """
+        needed = self._size + extra
+        capacity = len(self._amounts)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_amounts", "_ordinals", "_description_ids"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def intern(self, description):
+        """
+        Return the id of a description, adding it to the table if needed.
+        :param description: Description of the expense.
+        """
+        description_id = self._description_lookup.get(description)
+        if description_id is None:
+            description_id = len(self._descriptions)
+            self._descriptions.append(description)
+            self._description_lookup[description] = description_id
+        return description_id
+
+    def append(self, expense):
+        """
+        Append one expense row.
+        :param expense: Dict with "description", "amount", "date" and optional "tags" keys.
+        """
+        self._reserve(1)
+        index = self._size
+        self._amounts[index] = expense["amount"]
+        self._ordinals[index] = to_ordinal(expense["date"])
+        self._description_ids[index] = self.intern(expense["description"])
+        if expense.get("tags"):
+            self._tags[index] = tuple(expense["tags"])
+        self._size += 1
+
+    def extend(self, descriptions, amounts, ordinals, tags=None):
+        """
+        Append a batch of rows in one step.
+        :param descriptions: Sequence of descriptions.
+        :param amounts: Array of amounts.
+        :param ordinals: Array of date ordinals.
+        :param tags: Sequence of tag tuples, one per row (optional).
+        """
+        count = len(amounts)
+        self._reserve(count)
+        start, stop = self._size, self._size + count
+        self._amounts[start:stop] = amounts
+        self._ordinals[start:stop] = ordinals
+        self._description_ids[start:stop] = np.fromiter(
+            (self.intern(description) for description in descriptions), dtype=np.int32, count=count
+        )
+        if tags is not None:
+            self._tags.update((start + i, tuple(row)) for i, row in enumerate(tags) if row)
+        self._size = stop
+
+    @property
+    def amounts(self):
+        """
+        Read-only view of the amount column.
+        """
+        view = self._amounts[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ordinals(self):
+        """
+        Read-only view of the date column as proleptic Gregorian ordinals.
+        """
+        view = self._ordinals[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def description_ids(self):
+        """
+        Read-only view of the interned description id column.
+        """
+        view = self._description_ids[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def descriptions(self):
+        """
+        The intern table, indexed by description id.
+        """
+        return self._descriptions
+
+    @property
+    def nbytes(self):
+        """
+        Bytes used by the populated part of the column arrays.
+        """
+        return self._size * (
+            self._amounts.itemsize + self._ordinals.itemsize + self._description_ids.itemsize
+        )
+
+
+def to_ordinal(value):
+    """
+    Convert a date to its proleptic Gregorian ordinal.
+    :param value: A date or datetime; datetimes are truncated to the day.
+    """
+    if not isinstance(value, _date):
+        raise ValueError("Date must be a date or datetime for columnar storage.")
+    return value.toordinal()
+
+
+def batch_columns(records=None, descriptions=None, amounts=None, dates=None, tags=None):
+    """
+    Normalize a batch of expenses into (descriptions, amounts, dates, tags) columns.
+    :param records: Iterable of dicts or (description, amount[, date[, tags]]) tuples,
+        or a mapping of "description", "amount", "date" and "tags" columns (optional).
+    :param descriptions: Sequence of descriptions, used when records is not given.
+    :param amounts: Sequence or array of amounts, used when records is not given.
+    :param dates: Sequence, array or single date, used when records is not given.
+    :param tags: Sequence of tag iterables, used when records is not given (optional).
+    :return: A list of descriptions, a float64 array of amounts, the raw dates
+        and a list of tag tuples (or None when the batch has no tags).
+    """
+    if records is not None:
+        if descriptions is not None or amounts is not None or dates is not None or tags is not None:
+            raise ValueError("Pass either records or columns, not both.")
+        if isinstance(records, Mapping):
+            descriptions = records.get("description")
+            amounts = records.get("amount")
+            dates = records.get("date")
+            tags = records.get("tags")
+        else:
+            descriptions, amounts, dates, tags = [], [], [], []
+            for record in records:
+                if isinstance(record, Mapping):
+                    descriptions.append(record["description"])
+                    amounts.append(record["amount"])
+                    dates.append(record.get("date"))
+                    tags.append(record.get("tags"))
+                else:
+                    descriptions.append(record[0])
+                    amounts.append(record[1])
+                    dates.append(record[2] if len(record) > 2 else None)
+                    tags.append(record[3] if len(record) > 3 else None)
+            if all(date is None for date in dates):
+                dates = None
+            if all(not row for row in tags):
+                tags = None
+    if descriptions is None or amounts is None:
+        raise ValueError("Descriptions and amounts are required.")
+    descriptions = descriptions.tolist() if isinstance(descriptions, np.ndarray) else list(descriptions)
+    try:
+        amounts = np.asarray(amounts, dtype=np.float64)
+    except (TypeError, ValueError):
+        amounts = list(amounts)
+        rows = [i for i, amount in enumerate(amounts) if not isinstance(amount, Real)]
+        raise BulkValidationError("Amounts must be numeric.", rows) from None
+    if amounts.ndim != 1 or len(amounts) != len(descriptions):
+        raise ValueError("Descriptions and amounts must have the same length.")
+    if tags is not None:
+        tags = [tag_tuple(row) for row in tags]
+        if len(tags) != len(amounts):
+            raise ValueError("Tags must have the same length as amounts.")
+    return descriptions, amounts, dates, tags
+
+
+def batch_ordinals(dates, count, default):
+    """
+    Convert a batch of dates to an array of ordinals.
+    :param dates: None, a single date, a datetime64 array or a sequence of dates.
+    :param count: Number of rows in the batch.
+    :param default: Date used for rows without one.
+    :return: An int64 array of ordinals and a boolean mask of rows with invalid dates.
+    """
+    if dates is None or isinstance(dates, _date):
+        ordinal = to_ordinal(default if dates is None else dates)
+        return np.full(count, ordinal, dtype=np.int64), np.zeros(count, dtype=bool)
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+        days = dates.astype("datetime64[D]")
+        invalid = np.isnat(days)
+        ordinals = np.where(invalid, 0, days.astype(np.int64)) + EPOCH_ORDINAL
+        if len(ordinals) != count:
+            raise ValueError("Dates must have the same length as amounts.")
+        return ordinals, invalid
+    dates = list(dates)
+    if len(dates) != count:
+        raise ValueError("Dates must have the same length as amounts.")
+    ordinals = np.empty(count, dtype=np.int64)
+    invalid = np.zeros(count, dtype=bool)
+    default_ordinal = default.toordinal()
+    for i, date in enumerate(dates):
+        if date is None:
+            ordinals[i] = default_ordinal
+        elif isinstance(date, _date):
+            ordinals[i] = date.toordinal()
+        else:
+            ordinals[i] = 0
+            invalid[i] = True
+    return ordinals, invalid
@@ -0,0 +1,236 @@
+from collections import deque
+
+METHODS = ("fifo", "lifo", "average")
+
+# Quantities below this are treated as zero to absorb floating-point residue.
+EPSILON = 1e-9
+
+
+class _Position:
+    __slots__ = ("lots", "quantity", "cost", "realized", "proceeds")
+
+    def __init__(self):
+        self.lots = deque()
+        self.quantity = 0.0
+        self.cost = 0.0
+        self.realized = 0.0
+        self.proceeds = 0.0
+
+
+class CostBasisLedger:
+    """
+    Lot-level cost basis for buy and sell trades.
+
+    Each symbol keeps a deque of open lots [quantity, unit cost, date]. Sales
+    consume lots from the front (FIFO) or the back (LIFO), so a sale costs
+    amortized O(lots consumed); with average cost a symbol has a single merged
+    lot. Quantities, remaining cost and realized gains are running totals, so
+    P&L reports never replay the trade history.
+    """
+
+    def __init__(self, method="fifo"):
+        """
+        Initialize an empty ledger.
+        :param method: Lot matching method: "fifo", "lifo" or "average" (default "fifo").
+        """
+        if method not in METHODS:
+            raise ValueError(f"Method must be one of: {', '.join(METHODS)}.")
+        self.method = method
+        self.positions = {}
+        self.trade_count = 0
+
+    def _position(self, symbol):
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = _Position()
+        return position
+
+    def buy(self, symbol, quantity, price, date=None):
+        """
+        Record a purchase as a new lot.
+        :param symbol: Symbol or name of the investment.
+        :param quantity: Number of units bought.
+        :param price: Price per unit.
+        :param date: Date of the trade (optional).
+        :return: The cost of the purchase.
+        """
+        if quantity <= 0 or price <= 0:
+            raise ValueError("Quantity and price must be greater than zero.")
+        position = self._position(symbol)
+        cost = quantity * price
+        if self.method == "average" and position.lots:
+            lot = position.lots[0]
+            lot[0] += quantity
+            lot[1] = (position.cost + cost) / lot[0]
+        else:
+            position.lots.append([quantity, price, date])
+        position.quantity += quantity
+        position.cost += cost
+        self.trade_count += 1
+        return cost
+
+    def sell(self, symbol, quantity, price, date=None):
+        """
+        Record a sale, matching it against open lots.
+        :param symbol: Symbol or name of the investment.
+        :param quantity: Number of units sold.
+        :param price: Price per unit.
+        :param date: Date of the trade (optional).
+        :return: Dict with the "proceeds", the "cost" of the lots consumed and the "realized" gain.
+        """
+        if quantity <= 0 or price <= 0:
+            raise ValueError("Quantity and price must be greater than zero.")
+        position = self.positions.get(symbol)
+        if position is None or quantity > position.quantity + EPSILON:
+            raise ValueError("Sell quantity exceeds holding.")
+        lots = position.lots
+        take = lots.popleft if self.method == "fifo" else lots.pop
+        remaining = quantity
+        cost = 0.0
+        while remaining > EPSILON:
+            lot = lots[0] if self.method == "fifo" else lots[-1]
+            if lot[0] <= remaining + EPSILON:
+                take()
+                cost += lot[0] * lot[1]
+                remaining -= lot[0]
+            else:
+                lot[0] -= remaining
+                cost += remaining * lot[1]
+                remaining = 0.0
+        proceeds = quantity * price
+        position.quantity -= quantity
+        position.cost -= cost
+        if not lots:
+            position.quantity = 0.0
+            position.cost = 0.0
+        position.realized += proceeds - cost
+        position.proceeds += proceeds
+        self.trade_count += 1
+        return {"proceeds": proceeds, "cost": cost, "realized": proceeds - cost}
+
+    def sale_cost(self, symbol, quantity):
+        """
+        Cost of the lots a sale would consume, without recording the sale.
+        :param symbol: Symbol or name of the investment.
+        :param quantity: Number of units to sell.
+        """
+        if quantity <= 0:
+            raise ValueError("Quantity and price must be greater than zero.")
+        position = self.positions.get(symbol)
+        if position is None or quantity > position.quantity + EPSILON:
+            raise ValueError("Sell quantity exceeds holding.")
+        lots = position.lots if self.method == "fifo" else reversed(position.lots)
+        remaining = quantity
+        cost = 0.0
+        for lot_quantity, unit_cost, _ in lots:
+            if remaining <= EPSILON:
+                break
+            if lot_quantity <= remaining + EPSILON:
+                cost += lot_quantity * unit_cost
+                remaining -= lot_quantity
+            else:
+                cost += remaining * unit_cost
+                remaining = 0.0
+        return cost
+
+    def drop_lots(self, symbol):
+        """
+        Discard the open lots of a symbol without recording a sale, e.g. when the
+        holding is removed from a portfolio. Realized gains are kept.
+        :param symbol: Symbol or name of the investment.
+        """
+        position = self.positions.get(symbol)
+        if position is not None:
+            position.lots.clear()
+            position.quantity = 0.0
+            position.cost = 0.0
+
+    def record_trades(self, trades):
+        """
+        Stream trades into the ledger without holding them in memory.
+        :param trades: Iterable of (symbol, side, quantity, price[, date]) tuples or dicts
+            with the same keys; side is "buy" or "sell".
+        :return: The number of trades recorded.
+        """
+        buy = self.buy
+        sell = self.sell
+        count = 0
+        for trade in trades:
+            if isinstance(trade, dict):
+                symbol, side, quantity, price = trade["symbol"], trade["side"], trade["quantity"], trade["price"]
+                date = trade.get("date")
+            else:
+                symbol, side, quantity, price = trade[:4]
+                date = trade[4] if len(trade) > 4 else None
+            if side == "buy":
+                buy(symbol, quantity, price, date)
+            elif side == "sell":
+                sell(symbol, quantity, price, date)
+            else:
+                raise ValueError("Side must be 'buy' or 'sell'.")
+            count += 1
+        return count
+
+    def lots(self, symbol):
+        """
+        Return the open lots of a symbol, oldest first, as dicts.
+        :param symbol: Symbol or name of the investment.
+        """
+        position = self.positions.get(symbol)
+        if position is None:
+            return []
+        return [{"quantity": q, "unit_cost": c, "date": d} for q, c, d in position.lots]
+
+    def quantity(self, symbol):
+        """
+        Number of units of a symbol currently held.
+        :param symbol: Symbol or name of the investment.
+        """
+        position = self.positions.get(symbol)
+        return position.quantity if position is not None else 0.0
+
+    def cost_basis(self, symbol):
+        """
+        Remaining cost of the open lots of a symbol.
+        :param symbol: Symbol or name of the investment.
+        """
+        position = self.positions.get(symbol)
+        return position.cost if position is not None else 0.0
+
+    def realized_gain(self, symbol=None):
+        """
+        Realized gain of one symbol, or of every symbol when none is given.
+        :param symbol: Symbol or name of the investment (optional).
+        """
+        if symbol is None:
+            return sum(position.realized for position in self.positions.values())
+        position = self.positions.get(symbol)
+        return position.realized if position is not None else 0.0
+
+    def report(self, prices=None):
+        """
+        Realized and unrealized P&L per symbol, in O(number of symbols).
+        :param prices: Mapping of symbol to current price; symbols without a price
+            get no market value or unrealized gain (optional).
+        :return: Dict with a "positions" dict per symbol and "realized" and "unrealized" totals.
+        """
+        prices = prices or {}
+        positions = {}
+        total_realized = 0.0
+        total_unrealized = 0.0
+        for symbol, position in self.positions.items():
+            row = {
+                "quantity": position.quantity,
+                "cost_basis": position.cost,
+                "realized": position.realized,
+                "market_value": None,
+                "unrealized": None,
+            }
+            price = prices.get(symbol)
+            if price is not None:
+                row["market_value"] = position.quantity * price
+                row["unrealized"] = row["market_value"] - position.cost
+                total_unrealized += row["unrealized"]
+            total_realized += position.realized
+            positions[symbol] = row
+        return {"positions": positions, "realized": total_realized, "unrealized": total_unrealized}
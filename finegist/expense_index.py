@@ -0,0 +1,155 @@
+import re
+from bisect import bisect_left, insort
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Split a description into lowercase word tokens.
+    :param text: The text to split.
+    """
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class ExpenseSearchIndex:
+    """
+    Inverted index from description tokens and tags to expense positions.
+    Positions are appended in increasing order, so every posting list stays sorted.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self._tokens = {}
+        self._sorted_tokens = []
+        self._tags = {}
+        self._token_cache = {}
+
+    def add(self, position, description, tags=()):
+        """
+        Index one expense.
+        :param position: Position of the expense in the tracker.
+        :param description: Description of the expense.
+        :param tags: Tags of the expense (optional).
+        """
+        tokens = self._token_cache.get(description)
+        if tokens is None:
+            tokens = self._token_cache[description] = tuple(dict.fromkeys(tokenize(description)))
+        for token in tokens:
+            postings = self._tokens.get(token)
+            if postings is None:
+                self._tokens[token] = [position]
+                insort(self._sorted_tokens, token)
+            else:
+                postings.append(position)
+        for tag in tag_tuple(tags):
+            self._tags.setdefault(normalize_tag(tag), []).append(position)
+
+    def add_many(self, start, descriptions, tags=None):
+        """
+        Index a batch of consecutive expenses.
+        :param start: Position of the first expense in the batch.
+        :param descriptions: Descriptions of the batch.
+        :param tags: Tags per expense, or None when the batch has no tags (optional).
+        """
+        if tags is None:
+            for position, description in enumerate(descriptions, start):
+                self.add(position, description)
+        else:
+            for position, (description, row_tags) in enumerate(zip(descriptions, tags), start):
+                self.add(position, description, row_tags)
+
+    def keyword(self, text):
+        """
+        Positions whose description contains every word of `text`.
+        :param text: One or more words.
+        """
+        return intersect_postings(self.keyword_postings(text))
+
+    def keyword_postings(self, text):
+        """
+        The posting list of every word of `text`, without copying; callers must not modify them.
+        :param text: One or more words.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return [[]]
+        return [self._tokens.get(token, []) for token in tokens]
+
+    def prefix(self, text):
+        """
+        Positions whose description contains a word starting with `text`.
+        :param text: The prefix to match.
+        """
+        prefix = str(text).lower()
+        lo = bisect_left(self._sorted_tokens, prefix)
+        matches = []
+        for token in self._sorted_tokens[lo:]:
+            if not token.startswith(prefix):
+                break
+            matches.append(self._tokens[token])
+        if len(matches) == 1:
+            return list(matches[0])
+        return sorted({position for postings in matches for position in postings})
+
+    def tag(self, tag):
+        """
+        Positions of expenses carrying a tag.
+        :param tag: The tag to match.
+        """
+        return list(self.tag_postings(tag))
+
+    def tag_postings(self, tag):
+        """
+        The posting list of a tag, without copying; callers must not modify it.
+        :param tag: The tag to match.
+        """
+        return self._tags.get(normalize_tag(tag), [])
+
+    def tags(self):
+        """
+        All known tags with their number of expenses.
+        """
+        return {tag: len(postings) for tag, postings in self._tags.items()}
+
+
+def normalize_tag(tag):
+    """
+    Tags are matched case-insensitively and without surrounding whitespace.
+    :param tag: The tag to normalize.
+    """
+    return str(tag).strip().lower()
+
+
+def tag_tuple(tags):
+    """
+    Turn the tags of one expense into a tuple; a single string is one tag, not a sequence of letters.
+    :param tags: A tag, an iterable of tags, or None.
+    """
+    if not tags:
+        return ()
+    if isinstance(tags, str):
+        return (tags,)
+    return tuple(tags)
+
+
+def intersect_postings(postings):
+    """
+    Intersect sorted posting lists, starting from the shortest.
+    """
+    postings = sorted(postings, key=len)
+    if not postings or not postings[0]:
+        return []
+    result = postings[0]
+    for other in postings[1:]:
+        result = [position for position in result if _contains(other, position)]
+        if not result:
+            break
+    return list(result)
+
+
+def _contains(postings, position):
+    index = bisect_left(postings, position)
+    return index < len(postings) and postings[index] == position
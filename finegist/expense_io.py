@@ -0,0 +1,140 @@
+import csv
+import json
+import os
+from contextlib import contextmanager
+from datetime import date as _date
+from itertools import islice
+
+FIELDS = ("description", "amount", "date")
+
+
+@contextmanager
+def _open(source, mode):
+    """
+    Open a path, or pass an already open file object through untouched.
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, mode, newline="", encoding="utf-8") as f:
+            yield f
+    else:
+        yield source
+
+
+def _parse_row(description, amount, date, line):
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid amount on line {line}: {amount!r}") from None
+    if date in (None, ""):
+        date = None
+    elif not isinstance(date, _date):
+        try:
+            date = _date.fromisoformat(date)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid date on line {line}: {date!r}") from None
+    return {"description": description, "amount": amount, "date": date}
+
+
+def read_expenses_csv(source):
+    """
+    Lazily read expenses from a CSV file with description, amount and date columns.
+    Rows are yielded one at a time, so memory use does not depend on file size.
+    :param source: Path or open text file.
+    """
+    with _open(source, "r") as f:
+        reader = csv.DictReader(f)
+        missing = {"description", "amount"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+        for row in reader:
+            yield _parse_row(row["description"], row["amount"], row.get("date"), reader.line_num)
+
+
+def read_expenses_jsonl(source):
+    """
+    Lazily read expenses from a JSON Lines file, one object per line.
+    :param source: Path or open text file.
+    """
+    with _open(source, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid JSON on line {line_number}") from None
+            yield _parse_row(row.get("description"), row.get("amount"), row.get("date"), line_number)
+
+
+def _serializable(expense):
+    date = expense.get("date")
+    return {
+        "description": expense["description"],
+        "amount": expense["amount"],
+        "date": date.isoformat() if isinstance(date, _date) else date,
+    }
+
+
+def write_expenses_csv(expenses, target):
+    """
+    Write expenses to a CSV file, consuming the iterable one row at a time.
+    :param expenses: Iterable of expense dicts, e.g. ExpenseTracker.expenses or a reader.
+    :param target: Path or open text file.
+    :return: The number of rows written.
+    """
+    count = 0
+    with _open(target, "w") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for expense in expenses:
+            writer.writerow(_serializable(expense))
+            count += 1
+    return count
+
+
+def write_expenses_jsonl(expenses, target):
+    """
+    Write expenses to a JSON Lines file, consuming the iterable one row at a time.
+    :param expenses: Iterable of expense dicts.
+    :param target: Path or open text file.
+    :return: The number of rows written.
+    """
+    count = 0
+    with _open(target, "w") as f:
+        for expense in expenses:
+            f.write(json.dumps(_serializable(expense)))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def batched(rows, size):
+    """
+    Group an iterable of rows into lists of at most `size` rows.
+    :param rows: Iterable of rows.
+    :param size: Maximum batch size.
+    """
+    if size <= 0:
+        raise ValueError("Batch size must be greater than zero.")
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def summarize_expenses(rows, default_date=None):
+    """
+    Group a stream of expenses by date without storing the rows,
+    giving the same result as ExpenseTracker.summary().
+    :param rows: Iterable of expense dicts.
+    :param default_date: Date used for rows without one (optional).
+    """
+    summary = {}
+    for row in rows:
+        date = row.get("date") or default_date
+        if date not in summary:
+            summary[date] = 0
+        summary[date] += row["amount"]
+    return summary
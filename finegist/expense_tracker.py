@@ -1,46 +1,545 @@
-from datetime import datetime
+import heapq
+import math
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as _date, datetime
+
+import numpy as np
+
+from .calendar_periods import PERIOD_SPAN, PERIODS, period_start, period_starts
+from .columnar_store import (
+    BulkValidationError,
+    ColumnarExpenseStore,
+    batch_columns,
+    batch_ordinals,
+)
+from .expense_index import ExpenseSearchIndex, intersect_postings, tag_tuple
+from .expense_io import batched
+from .ledger_file import ExpenseLedgerFile
+from .recurring import RecurringExpense
+from .sketches import HeavyHitters, QuantileSketch
+
+
+def exact_partials(values):
+    """
+    Reduce numbers to a short list of floats whose exact sum equals the exact sum
+    of the numbers, so running totals can be extended and merged without rounding.
+    :param values: Iterable of numbers, which may include earlier partials.
+    :return: List of floats; math.fsum of it is the correctly rounded sum.
+    """
+    values = list(values)
+    partials = []
+    while True:
+        total = math.fsum(values)
+        if not math.isfinite(total):
+            return [total]
+        if total == 0:
+            return partials
+        partials.append(total)
+        values.append(-total)
+
+
+def _as_date(value):
+    """
+    Truncate a datetime to its date; other values are returned unchanged.
+    """
+    return value.date() if isinstance(value, datetime) else value
+
 
 class ExpenseTracker:
-    def __init__(self):
+    def __init__(self, columnar=False):
         """
         Initialize the expense tracker with an empty list of expenses.
+        :param columnar: Keep expenses in typed column arrays instead of a list of dicts (optional).
+        """
+        self.expenses = ColumnarExpenseStore() if columnar else []
+        self._date_index = {}
+        self._sorted_dates = []
+        self._total_partials = []
+        self._daily_totals = {}
+        self._daily_partials = {}
+        self._rollups = {}
+        self._stale_buckets = {}
+        self._search_index = None
+        self.quantile_sketch = None
+        self.merchant_sketch = None
+        self.recurring = []
+        self._listeners = []
+        self._unindexed = None
+
+    @classmethod
+    def open_ledger(cls, path, readonly=False):
         """
-        self.expenses = []
+        Create a tracker backed by a memory-mapped binary ledger file.
+        New expenses are appended to the end of the file. Opening only maps the
+        file; the date index and totals are built on the first query that needs them.
+        :param path: Path of the ledger file, created if it does not exist.
+        :param readonly: Open the ledger without permission to add expenses (optional).
+        """
+        tracker = cls()
+        tracker.expenses = ExpenseLedgerFile(path, readonly=readonly)
+        tracker._unindexed = (0, len(tracker.expenses))
+        return tracker
 
-    def add_expense(self, description, amount, date=None):
+    def refresh(self):
+        """
+        Pick up expenses appended to the ledger file by another process.
+        :return: The number of new expenses.
+        """
+        if not isinstance(self.expenses, ExpenseLedgerFile):
+            return 0
+        start = len(self.expenses)
+        self.expenses.refresh()
+        first = start if self._unindexed is None else self._unindexed[0]
+        self._unindexed = (first, len(self.expenses))
+        if self._search_index is not None or self.merchant_sketch is not None:
+            descriptions = [expense["description"] for expense in self.expenses[start:]]
+            if self._search_index is not None:
+                self._search_index.add_many(start, descriptions)
+            self._update_sketches(descriptions, self.expenses.amounts[start:])
+        self._notify(start)
+        return len(self.expenses) - start
+
+    @property
+    def columnar(self):
+        """
+        Whether expenses are kept in array-backed storage rather than a list of dicts.
+        """
+        return not isinstance(self.expenses, list)
+
+    def add_expense(self, description, amount, date=None, tags=None):
         """
         Add an expense to the tracker.
         :param description: Description of the expense.
         :param amount: Amount of the expense.
         :param date: Date of the expense (optional, defaults to today).
+        :param tags: Tags or categories of the expense, e.g. ["food"] (optional).
         """
         if amount <= 0:
             raise ValueError("Amount must be greater than zero.")
-        if date is None:
-            date = datetime.now().date()
-        self.expenses.append({"description": description, "amount": amount, "date": date})
+        date = datetime.now().date() if date is None else _as_date(date)
+        if not isinstance(date, _date):
+            raise ValueError("Date must be a date.")
+        tags = tag_tuple(tags)
+        expense = {"description": description, "amount": amount, "date": date}
+        if tags:
+            expense["tags"] = tags
+        self.expenses.append(expense)
+        position = len(self.expenses) - 1
+        self._index_row(position, date, amount)
+        if self._search_index is not None:
+            self._search_index.add(position, description, tags)
+        if self.quantile_sketch is not None:
+            self.quantile_sketch.update(amount)
+            self.merchant_sketch.update(description, amount)
+        for listener in self._listeners:
+            listener(expense)
+
+    def add_listener(self, callback):
+        """
+        Register a function called with every expense dict as it is added,
+        e.g. SpendAnomalyDetector.observe to screen expenses inline.
+        :param callback: Function taking one expense dict.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, start):
+        """
+        Pass the expenses from position `start` onwards to the listeners.
+        """
+        if self._listeners:
+            for expense in self.expenses[start:]:
+                for listener in self._listeners:
+                    listener(expense)
+
+    def add_expenses_bulk(self, records=None, descriptions=None, amounts=None, dates=None, tags=None):
+        """
+        Add a batch of expenses in one step.
+        The whole batch is validated before anything is stored, and every invalid
+        row is reported at once through a BulkValidationError.
+        :param records: Iterable of dicts or (description, amount[, date[, tags]]) tuples,
+            or a mapping of "description", "amount", "date" and "tags" columns (optional).
+        :param descriptions: Sequence of descriptions, used when records is not given.
+        :param amounts: Sequence or array of amounts, used when records is not given.
+        :param dates: Sequence, datetime64 array or single date (optional, defaults to today).
+        :param tags: Sequence of tag lists, one per expense (optional).
+        :return: The number of expenses added.
+        """
+        descriptions, amounts, dates, tags = batch_columns(records, descriptions, amounts, dates, tags)
+        count = len(amounts)
+        today = datetime.now().date()
+        ordinals, invalid = batch_ordinals(dates, count, today)
+        invalid |= ~(amounts > 0)
+        if invalid.any():
+            raise BulkValidationError(
+                "Amount must be greater than zero and date must be a date.", np.flatnonzero(invalid)
+            )
+
+        start = len(self.expenses)
+        if self.columnar:
+            self.expenses.extend(descriptions, amounts, ordinals, tags)
+        else:
+            unique, inverse = np.unique(ordinals, return_inverse=True)
+            days = [_date.fromordinal(ordinal) for ordinal in unique.tolist()]
+            rows = [
+                {"description": description, "amount": amount, "date": days[day]}
+                for description, amount, day in zip(descriptions, amounts.tolist(), inverse.tolist())
+            ]
+            if tags is not None:
+                for row, row_tags in zip(rows, tags):
+                    if row_tags:
+                        row["tags"] = row_tags
+            self.expenses.extend(rows)
+        self._index_batch(start, ordinals, amounts)
+        if self._search_index is not None:
+            self._search_index.add_many(start, descriptions, tags)
+        self._update_sketches(descriptions, amounts)
+        self._notify(start)
+        return count
+
+    def enable_sketches(self, k=200, top_k=50, seed=None):
+        """
+        Start maintaining bounded-memory sketches of the expenses: a quantile
+        sketch over amounts and a heavy-hitters summary of spend per description.
+        Existing expenses are folded in once; later ones are added as they arrive.
+        :param k: Accuracy parameter of the quantile sketch (default 200).
+        :param top_k: Number of descriptions tracked by the heavy-hitters summary (default 50).
+        :param seed: Seed for the quantile sketch (optional).
+        """
+        self.quantile_sketch = QuantileSketch(k, seed=seed)
+        self.merchant_sketch = HeavyHitters(top_k)
+        if self.columnar:
+            self._update_sketches([e["description"] for e in self.expenses], self.expenses.amounts)
+        else:
+            self._update_sketches([e["description"] for e in self.expenses], [e["amount"] for e in self.expenses])
+
+    def _update_sketches(self, descriptions, amounts):
+        """
+        Fold a batch of expenses into the sketches, if they are enabled.
+        """
+        if self.quantile_sketch is None:
+            return
+        self.quantile_sketch.update_many(amounts)
+        spend = {}
+        for description, amount in zip(descriptions, np.asarray(amounts, dtype=np.float64).tolist()):
+            spend[description] = spend.get(description, 0) + amount
+        for description, amount in spend.items():
+            self.merchant_sketch.update(description, amount)
+
+    def spend_quantile(self, q):
+        """
+        Estimate a quantile of the expense amounts, e.g. 0.5 for the median.
+        Requires enable_sketches().
+        :param q: Quantile between 0 and 1.
+        """
+        if self.quantile_sketch is None:
+            raise ValueError("Sketches are not enabled; call enable_sketches() first.")
+        return self.quantile_sketch.quantile(q)
+
+    def top_merchants(self, n=10):
+        """
+        Return the descriptions with the highest estimated spend, heaviest first.
+        Requires enable_sketches().
+        :param n: Number of descriptions to return.
+        """
+        if self.merchant_sketch is None:
+            raise ValueError("Sketches are not enabled; call enable_sketches() first.")
+        return self.merchant_sketch.top(n)
+
+    def import_expenses(self, rows, batch_size=10000):
+        """
+        Add expenses from a stream of rows, such as read_expenses_csv(path),
+        in fixed-size batches so the input is never fully materialized.
+        The import is not atomic: each batch is validated and stored on its own, so
+        when a batch is rejected the batches before it stay added. The rows of the
+        BulkValidationError are positions in the whole stream, and every row before
+        the start of the failing batch has been stored.
+        :param rows: Iterable of expense dicts or tuples.
+        :param batch_size: Number of rows validated and appended per batch.
+        :return: The number of expenses added.
+        """
+        added = 0
+        for batch in batched(rows, batch_size):
+            try:
+                added += self.add_expenses_bulk(batch)
+            except BulkValidationError as error:
+                raise BulkValidationError(error.message, [row + added for row in error.rows]) from error
+        return added
+
+    def _ensure_index(self):
+        """
+        Index the ledger rows that were mapped but not yet indexed.
+        """
+        if self._unindexed is not None:
+            start, stop = self._unindexed
+            self._unindexed = None
+            self._index_batch(start, self.expenses.ordinals[start:stop], self.expenses.amounts[start:stop])
+
+    def _index_batch(self, start, ordinals, amounts):
+        """
+        Record a batch of rows in the date index and running totals,
+        grouping the batch by date with a single vectorized pass.
+        """
+        self._ensure_index()
+        if len(amounts) == 0:
+            return
+        unique, inverse = np.unique(ordinals, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(unique)))[:-1]
+        groups = np.split(order + start, bounds)
+        sorted_amounts = np.split(np.asarray(amounts, dtype=np.float64)[order], bounds)
+        new_dates = []
+        for ordinal, positions, day_amounts in zip(unique.tolist(), groups, sorted_amounts):
+            date = _date.fromordinal(ordinal)
+            existing = self._date_index.get(date)
+            if existing is None:
+                self._date_index[date] = positions.tolist()
+                partials = exact_partials(day_amounts.tolist())
+                new_dates.append(date)
+            else:
+                existing.extend(positions.tolist())
+                partials = exact_partials(self._daily_partials[date] + day_amounts.tolist())
+            self._daily_partials[date] = partials
+            self._daily_totals[date] = math.fsum(partials)
+        self._sorted_dates.extend(new_dates)
+        self._sorted_dates.sort()
+        self._total_partials = exact_partials(self._total_partials + amounts.tolist())
+        for period, stale in self._stale_buckets.items():
+            stale.update(period_starts(unique, period).tolist())
+
+    def _index_row(self, position, date, amount):
+        """
+        Record a newly added expense in the date index and running totals.
+        """
+        self._ensure_index()
+        positions = self._date_index.get(date)
+        if positions is None:
+            insort(self._sorted_dates, date)
+            self._date_index[date] = [position]
+            partials = exact_partials([amount])
+        else:
+            positions.append(position)
+            partials = exact_partials(self._daily_partials[date] + [amount])
+        self._daily_partials[date] = partials
+        self._daily_totals[date] = math.fsum(partials)
+        self._total_partials = exact_partials(self._total_partials + [amount])
+        for period, stale in self._stale_buckets.items():
+            stale.add(period_start(date.toordinal(), period))
 
     def total_expenses(self):
         """
-        Calculate the total amount of all expenses.
+        Calculate the total amount of all expenses, rounded once from the exact sum,
+        so it does not depend on the order or batching of the additions.
+        """
+        self._ensure_index()
+        return math.fsum(self._total_partials)
+
+    def total_partials(self):
+        """
+        The exact running total as a short list of floats, for merging totals of
+        several trackers with math.fsum without rounding error.
+        """
+        self._ensure_index()
+        return list(self._total_partials)
+
+    def daily_partials(self):
+        """
+        The exact per-date subtotals as lists of floats, keyed by date, for merging
+        summaries of several trackers with math.fsum without rounding error.
         """
-        return sum(expense["amount"] for expense in self.expenses)
+        self._ensure_index()
+        return {date: list(partials) for date, partials in self._daily_partials.items()}
+
+    def positions_between(self, start, end):
+        """
+        Positions of the expenses dated between two dates, inclusive, ordered by
+        date and then by insertion order.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        """
+        start, end = _as_date(start), _as_date(end)
+        self._ensure_index()
+        lo = bisect_left(self._sorted_dates, start)
+        hi = bisect_right(self._sorted_dates, end)
+        return [position for date in self._sorted_dates[lo:hi] for position in self._date_index[date]]
 
     def expenses_by_date(self, date):
         """
         Get all expenses for a specific date.
         :param date: The date to filter expenses by.
         """
-        return [expense for expense in self.expenses if expense["date"] == date]
+        self._ensure_index()
+        return [self.expenses[position] for position in self._date_index.get(_as_date(date), ())]
+
+    def expenses_between(self, start, end, include_recurring=False):
+        """
+        Get all expenses dated between two dates, inclusive, in date order.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        :param include_recurring: Also expand the recurring expenses that fall in the range (optional).
+        """
+        start, end = _as_date(start), _as_date(end)
+        expenses = [self.expenses[position] for position in self.positions_between(start, end)]
+        if include_recurring and self.recurring:
+            return list(heapq.merge(expenses, self.recurring_between(start, end), key=lambda e: e["date"]))
+        return expenses
+
+    def add_recurring_expense(self, description, amount, start, frequency="monthly", interval=1, end=None, tags=None):
+        """
+        Add a rule for an expense that repeats. Occurrences are not stored; they are
+        expanded only for the date ranges a query asks for, and are left out of
+        total_expenses() and summary(), which cover recorded expenses only.
+        :param description: Description of the expense.
+        :param amount: Amount of each occurrence.
+        :param start: Date of the first occurrence.
+        :param frequency: One of "daily", "weekly", "monthly" or "yearly" (default "monthly").
+        :param interval: Number of periods between occurrences (default 1).
+        :param end: Last date an occurrence may fall on (optional).
+        :param tags: Tags or categories of the expense (optional).
+        :return: The new RecurringExpense.
+        """
+        rule = RecurringExpense(description, amount, start, frequency, interval, end, tags)
+        self.recurring.append(rule)
+        return rule
+
+    def recurring_between(self, start, end):
+        """
+        Lazily yield the occurrences of every recurring expense between two dates, inclusive, in date order.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        """
+        return heapq.merge(*(rule.occurrences(start, end) for rule in self.recurring), key=lambda e: e["date"])
+
+    def projected_total(self, start, end):
+        """
+        Total of the recorded expenses plus all recurring occurrences between two dates, inclusive.
+        Recurring totals are computed from occurrence counts without expanding them.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        """
+        start, end = _as_date(start), _as_date(end)
+        self._ensure_index()
+        lo = bisect_left(self._sorted_dates, start)
+        hi = bisect_right(self._sorted_dates, end)
+        recorded = sum(self._daily_totals[date] for date in self._sorted_dates[lo:hi])
+        return recorded + sum(rule.total_between(start, end) for rule in self.recurring)
 
     def summary(self):
         """
         Return a summary of all expenses grouped by date.
+        Each subtotal is rounded once from the exact sum of that date's amounts.
+        """
+        self._ensure_index()
+        return dict(self._daily_totals)
+
+    def search(self, keyword=None, tag=None, prefix=None, start=None, end=None):
+        """
+        Find expenses by description keyword, tag or word prefix, optionally
+        limited to a date range. All given criteria must match.
+        Matching is case-insensitive on the words of the description. The index
+        is built on the first search and then kept up to date on every add.
+        :param keyword: One or more words that must all appear in the description (optional).
+        :param tag: A tag the expense must carry (optional).
+        :param prefix: A prefix one of the description words must start with (optional).
+        :param start: The first date of the range, inclusive (optional).
+        :param end: The last date of the range, inclusive (optional).
+        """
+        if keyword is None and tag is None and prefix is None:
+            raise ValueError("Provide a keyword, tag or prefix to search for.")
+        start, end = _as_date(start), _as_date(end)
+        index = self._ensure_search_index()
+        postings = []
+        if keyword is not None:
+            postings.extend(index.keyword_postings(keyword))
+        if tag is not None:
+            postings.append(index.tag_postings(tag))
+        if prefix is not None:
+            postings.append(index.prefix(prefix))
+        if start is None and end is None:
+            return [self.expenses[position] for position in intersect_postings(postings)]
+        self._ensure_index()
+        lo = 0 if start is None else bisect_left(self._sorted_dates, start)
+        hi = len(self._sorted_dates) if end is None else bisect_right(self._sorted_dates, end)
+        dates = self._sorted_dates[lo:hi]
+        # Use the date range as one more posting list when it is the most selective;
+        # otherwise check the dates of the few rows the other criteria leave.
+        if sum(len(self._date_index[date]) for date in dates) <= min(map(len, postings)):
+            postings.append(sorted(position for date in dates for position in self._date_index[date]))
+            positions = intersect_postings(postings)
+        else:
+            positions = self._positions_within(intersect_postings(postings), start, end)
+        return [self.expenses[position] for position in positions]
+
+    def _positions_within(self, positions, start, end):
+        """
+        Keep the positions whose expense is dated between two dates, inclusive, without building rows.
+        """
+        if not self.columnar:
+            return [
+                position for position in positions
+                if (start is None or self.expenses[position]["date"] >= start)
+                and (end is None or self.expenses[position]["date"] <= end)
+            ]
+        positions = np.asarray(positions, dtype=np.int64)
+        ordinals = self.expenses.ordinals[positions]
+        keep = np.ones(len(positions), dtype=bool)
+        if start is not None:
+            keep &= ordinals >= start.toordinal()
+        if end is not None:
+            keep &= ordinals <= end.toordinal()
+        return positions[keep].tolist()
+
+    def tags(self):
+        """
+        Return every tag in use with the number of expenses carrying it.
+        """
+        return self._ensure_search_index().tags()
+
+    def _ensure_search_index(self):
+        """
+        Build the search index over the existing expenses the first time it is needed.
+        """
+        if self._search_index is None:
+            index = ExpenseSearchIndex()
+            index.add_many(0, [e["description"] for e in self.expenses], [e.get("tags") for e in self.expenses])
+            self._search_index = index
+        return self._search_index
+
+    def rollup(self, period="month"):
+        """
+        Return the total expenses per calendar period, keyed by the first day of
+        each period and ordered by date. Weeks start on Monday.
+        Results are cached per period; a new expense only invalidates the bucket
+        it falls in, which is recomputed from the per-date subtotals on the next call.
+        :param period: One of "week", "month", "quarter" or "year".
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Period must be one of: {', '.join(PERIODS)}.")
+        self._ensure_index()
+        rollup = self._rollups.get(period)
+        if rollup is None:
+            rollup = self._rollups[period] = self._compute_rollup(period)
+            self._stale_buckets[period] = set()
+        stale = self._stale_buckets[period]
+        if stale:
+            for start in stale:
+                end = period_start(start + PERIOD_SPAN[period], period)
+                lo = bisect_left(self._sorted_dates, _date.fromordinal(start))
+                hi = bisect_left(self._sorted_dates, _date.fromordinal(end))
+                rollup[_date.fromordinal(start)] = sum(
+                    self._daily_totals[date] for date in self._sorted_dates[lo:hi]
+                )
+            stale.clear()
+            self._rollups[period] = rollup = dict(sorted(rollup.items()))
+        return dict(rollup)
+
+    def _compute_rollup(self, period):
+        """
+        Group the per-date subtotals into calendar buckets in one vectorized pass.
         """
-        summary = {}
-        for expense in self.expenses:
-            date = expense["date"]
-            if date not in summary:
-                summary[date] = 0
-            summary[date] += expense["amount"]
-        return summary
\ No newline at end of file
+        if not self._sorted_dates:
+            return {}
+        ordinals = np.fromiter((date.toordinal() for date in self._sorted_dates), dtype=np.int64)
+        totals = np.fromiter((self._daily_totals[date] for date in self._sorted_dates), dtype=np.float64)
+        buckets, inverse = np.unique(period_starts(ordinals, period), return_inverse=True)
+        sums = np.bincount(inverse, weights=totals, minlength=len(buckets))
+        return {_date.fromordinal(start): total for start, total in zip(buckets.tolist(), sums.tolist())}
@@ -1,36 +1,231 @@
+from .cost_basis import EPSILON, CostBasisLedger
+from .monte_carlo import MonteCarloSimulator
+from .price_history import PriceHistory
+
+
 class InvestmentPortfolio:
-    def __init__(self):
+    def __init__(self, cost_basis="fifo"):
+        """
+            Initialize the investment portfolio with an empty index of holdings.
+            Holdings are keyed by name and the totals are kept up to date as they change.
+            :param cost_basis : Lot matching method for buy and sell trades: "fifo", "lifo" or "average".
+        """
+
+        self.ledger = CostBasisLedger(cost_basis)
+        self.price_history = PriceHistory()
+        self.holdings = {}
+        self._invested = 0
+        self._current_value = 0
+
+    @property
+    def investments(self):
+        """
+            List of the holdings, one per name, in the order they were first added.
         """
-            Initialize the investment portfolio with an empty list of investments.
+
+        return list(self.holdings.values())
+
+    def holding(self, name):
+        """
+            Look up a holding by name.
+            :param name: Name of the investment.
         """
 
-        self.investments = []
+        holding = self.holdings.get(name)
+        if holding is None:
+            raise ValueError("Investment not found.")
+        return holding
 
-    def add_investment(self, name, amount, current_value):
+    def add_investment(self, name, amount, current_value, quantity=None):
         """
             Add an investment to the portfolio.
+            Buying a name that is already held is merged into the existing holding.
             :param name: Name of the investment.
             :param amount : Amount invested.
             :param current_value : Current value of the investment.
+            :param quantity : Number of units bought (optional).
         """
 
         if amount <= 0 or current_value <= 0:
             raise ValueError("Amount must be greater than zero and current value must be non - negative.")
-        self.investments.append({"name" : name, "amount" : amount, "current_value" : current_value})
+        if quantity is not None and quantity <= 0:
+            raise ValueError("Quantity must be greater than zero.")
+        holding = self.holdings.get(name)
+        if holding is None:
+            holding = {"name" : name, "amount" : amount, "current_value" : current_value}
+            if quantity is not None:
+                holding["quantity"] = quantity
+            self.holdings[name] = holding
+        else:
+            holding["amount"] += amount
+            holding["current_value"] += current_value
+            if quantity is not None:
+                holding["quantity"] = holding.get("quantity", 0) + quantity
+        self._invested += amount
+        self._current_value += current_value
+
+    def update_investment(self, name, amount=None, current_value=None, quantity=None):
+        """
+            Replace the amount, current value or quantity of a holding.
+            :param name: Name of the investment.
+            :param amount : New amount invested (optional).
+            :param current_value : New current value (optional).
+            :param quantity : New number of units (optional).
+        """
+
+        holding = self.holding(name)
+        if (amount is not None and amount <= 0) or (current_value is not None and current_value <= 0):
+            raise ValueError("Amount must be greater than zero and current value must be non - negative.")
+        if quantity is not None and quantity <= 0:
+            raise ValueError("Quantity must be greater than zero.")
+        if amount is not None:
+            self._invested += amount - holding["amount"]
+            holding["amount"] = amount
+        if current_value is not None:
+            self._current_value += current_value - holding["current_value"]
+            holding["current_value"] = current_value
+        if quantity is not None:
+            holding["quantity"] = quantity
+
+    def revalue(self, name, current_value=None, price=None):
+        """
+            Set the current value of a holding, either directly or from a unit price.
+            :param name: Name of the investment.
+            :param current_value : New current value (optional).
+            :param price : Price per unit; requires the holding to have a quantity (optional).
+        """
+
+        if (current_value is None) == (price is None):
+            raise ValueError("Provide either a current value or a price.")
+        if price is not None:
+            quantity = self.holding(name).get("quantity")
+            if quantity is None:
+                raise ValueError("Investment has no quantity to price.")
+            current_value = price * quantity
+        self.update_investment(name, current_value=current_value)
+
+    def remove_investment(self, name):
+        """
+            Remove a holding from the portfolio, discarding its open cost basis lots.
+            :param name: Name of the investment.
+            :return: The removed holding.
+        """
+
+        holding = self.holding(name)
+        del self.holdings[name]
+        self.ledger.drop_lots(name)
+        self._invested -= holding["amount"]
+        self._current_value -= holding["current_value"]
+        return holding
+
+    def buy(self, name, quantity, price, date=None):
+        """
+            Record a purchase as a new lot and add it to the holding.
+            :param name: Name of the investment.
+            :param quantity : Number of units bought.
+            :param price : Price per unit.
+            :param date : Date of the trade (optional).
+        """
+
+        cost = self.ledger.buy(name, quantity, price, date)
+        self.add_investment(name, cost, cost, quantity)
+
+    def sell(self, name, quantity, price, date=None):
+        """
+            Record a sale, matching it against the open lots of the holding.
+            The holding's amount drops by the cost of the lots consumed and its
+            current value is revalued at the sale price.
+            :param name: Name of the investment.
+            :param quantity : Number of units sold.
+            :param price : Price per unit.
+            :param date : Date of the trade (optional).
+            :return : Dict with the "proceeds", "cost" and "realized" gain of the sale.
+        """
+
+        holding = self.holding(name)
+        if price <= 0:
+            raise ValueError("Quantity and price must be greater than zero.")
+        if holding.get("quantity", 0) > self.ledger.quantity(name) + EPSILON:
+            raise ValueError("Investment has units without a cost basis; record purchases with buy() to sell them.")
+        remaining = holding.get("quantity", 0) - quantity
+        if remaining > EPSILON and holding["amount"] - self.ledger.sale_cost(name, quantity) <= 0:
+            raise ValueError("Sale would leave the holding with no amount invested.")
+        result = self.ledger.sell(name, quantity, price, date)
+        if remaining <= EPSILON:
+            self.remove_investment(name)
+        else:
+            self.update_investment(
+                name, amount=holding["amount"] - result["cost"], current_value=remaining * price, quantity=remaining
+            )
+        return result
+
+    def pnl_report(self):
+        """
+            Return realized and unrealized gains per holding, valuing open lots at
+            each holding's current value per unit.
+        """
+
+        prices = {
+            name : holding["current_value"] / holding["quantity"]
+            for name, holding in self.holdings.items()
+            if holding.get("quantity")
+        }
+        return self.ledger.report(prices)
+
+    def record_prices(self, date, prices):
+        """
+            Record a day's prices and revalue the holdings that have a quantity.
+            :param date: Date of the prices.
+            :param prices : Mapping of investment name to price per unit.
+        """
+
+        self.price_history.record_prices(date, prices)
+        if self.price_history.ordinals[-1] != date.toordinal():
+            return
+        for name, price in prices.items():
+            holding = self.holdings.get(name)
+            if holding is not None and holding.get("quantity"):
+                self.revalue(name, price=price)
+
+    def value_history(self):
+        """
+            Value of the current holdings on every recorded date, for the holdings that have a quantity.
+            :return : Tuple (dates, values array).
+        """
+
+        quantities = {
+            name : holding["quantity"]
+            for name, holding in self.holdings.items()
+            if holding.get("quantity") and name in self.price_history
+        }
+        return self.price_history.dates, self.price_history.portfolio_values(quantities)
+
+    def simulate(self, years, simulator=None, **options):
+        """
+            Project the current value of the portfolio forward with a Monte Carlo simulation.
+            :param years: Number of years to project.
+            :param simulator : A MonteCarloSimulator (optional, defaults to one with its default model).
+            :param options : Further arguments of MonteCarloSimulator.simulate, e.g. paths or target.
+        """
+
+        if simulator is None:
+            with MonteCarloSimulator() as simulator:
+                return simulator.simulate(self.total_current_value(), years, **options)
+        return simulator.simulate(self.total_current_value(), years, **options)
 
     def total_invested(self):
         """
-            Calculate the total current value of all investments.
+            Calculate the total amount invested.
         """
 
-        return sum(investment["amount"] for investment in self.investments)
+        return self._invested
 
     def total_current_value(self):
         """
         Calculate the total current value of all investments.
         """
 
-        return sum(investment["current_value"] for investment in self.investments)
+        return self._current_value
 
     def portfolio_summary(self):
         """
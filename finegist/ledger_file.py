@@ -0,0 +1,168 @@
+import mmap
+import os
+import struct
+from datetime import date as _date
+
+import numpy as np
+
+from .columnar_store import to_ordinal
+
+MAGIC = b"FGLEDGR1"
+HEADER = struct.Struct("<8sII")
+DESCRIPTION_BYTES = 52
+RECORD_DTYPE = np.dtype([
+    ("date", "<i4"),
+    ("amount", "<f8"),
+    ("description", f"S{DESCRIPTION_BYTES}"),
+])
+
+
+class ExpenseLedgerFile:
+    """
+    Append-only binary ledger of expenses, read through a memory map.
+
+    The file is a small header followed by fixed-width 64-byte records holding
+    the date ordinal, the amount and a UTF-8 description of at most 52 bytes.
+    Columns are exposed as numpy views over the mapped file, so opening a
+    ledger does not copy or parse it and several read-only processes share the
+    same pages through the OS page cache. Only one process should append.
+    """
+
+    def __init__(self, path, readonly=False):
+        """
+        Open a ledger file, creating it if needed.
+        :param path: Path of the ledger file.
+        :param readonly: Open without permission to append (optional).
+        """
+        self.path = path
+        self.readonly = readonly
+        if not readonly and not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, RECORD_DTYPE.itemsize, 0))
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("Not an expense ledger file.")
+        magic, record_size, _ = HEADER.unpack(header)
+        if magic != MAGIC or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError("Not an expense ledger file.")
+        self._file = open(path, "rb" if readonly else "a+b")
+        self._mmap = None
+        self._records = np.empty(0, dtype=RECORD_DTYPE)
+        self._count = 0
+        self.refresh()
+
+    def refresh(self):
+        """
+        Pick up records appended to the file since it was last checked.
+        :return: The number of records now visible.
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        self._count = (size - HEADER.size) // RECORD_DTYPE.itemsize
+        return self._count
+
+    @property
+    def records(self):
+        """
+        Zero-copy structured view over all records, remapped lazily after appends.
+        """
+        if len(self._records) != self._count:
+            # Views handed out earlier keep their own map alive until released.
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=self._count, offset=HEADER.size)
+        return self._records
+
+    def close(self):
+        """
+        Close the underlying file. Views already handed out stay readable.
+        """
+        self._file.close()
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._row(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError("Expense index out of range.")
+        return self._row(index)
+
+    def _row(self, index):
+        record = self.records[index]
+        return {
+            "description": record["description"].decode("utf-8"),
+            "amount": float(record["amount"]),
+            "date": _date.fromordinal(int(record["date"])),
+        }
+
+    def _write(self, records):
+        if self.readonly:
+            raise ValueError("Ledger is opened read-only.")
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self._count += len(records)
+
+    def append(self, expense):
+        """
+        Append one expense to the end of the file.
+        :param expense: Dict with "description", "amount" and "date" keys.
+        """
+        if expense.get("tags"):
+            raise ValueError("Tags are not stored in the binary ledger.")
+        self.extend([expense["description"]], [expense["amount"]], [to_ordinal(expense["date"])])
+
+    def extend(self, descriptions, amounts, ordinals, tags=None):
+        """
+        Append a batch of expenses to the end of the file with a single write.
+        :param descriptions: Sequence of descriptions.
+        :param amounts: Array of amounts.
+        :param ordinals: Array of date ordinals.
+        :param tags: Must be empty; tags are not part of the record format.
+        """
+        if tags and any(tags):
+            raise ValueError("Tags are not stored in the binary ledger.")
+        encoded = [str(description).encode("utf-8") for description in descriptions]
+        too_long = [i for i, value in enumerate(encoded) if len(value) > DESCRIPTION_BYTES]
+        if too_long:
+            raise ValueError(
+                f"Description exceeds {DESCRIPTION_BYTES} bytes on rows: {', '.join(map(str, too_long[:10]))}"
+            )
+        records = np.empty(len(encoded), dtype=RECORD_DTYPE)
+        records["date"] = ordinals
+        records["amount"] = amounts
+        records["description"] = encoded
+        self._write(records)
+
+    @property
+    def amounts(self):
+        """
+        Zero-copy view of the amount column.
+        """
+        return self.records["amount"]
+
+    @property
+    def ordinals(self):
+        """
+        Zero-copy view of the date column as proleptic Gregorian ordinals.
+        """
+        return self.records["date"]
+
+    def total(self):
+        """
+        Sum of all amounts.
+        """
+        return float(self.amounts.sum())
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class LoanRepaymentCalculator:
     def __init__(self, principal, annual_interest_rate, years):
         """
@@ -36,25 +39,116 @@ class LoanRepaymentCalculator:
 
         return monthly_payment
 
-    def generate_repayment_schedule(self):
+    @staticmethod
+    def calculate_batch(principals, annual_interest_rates, years, grid=False):
         """
-        Generate the repayment schedule showing principal and interest breakdown.
+        Evaluate many loans in one vectorized pass.
+        Zero-rate loans are handled by masking, and invalid rows are reported through
+        masks with NaN results instead of raising.
+        :param principals: Array of loan amounts.
+        :param annual_interest_rates: Array of annual interest rates (in percentage).
+        :param years: Array of loan durations in years.
+        :param grid: Evaluate the Cartesian product of the three inputs, giving a
+            (principals, rates, years) shaped result, instead of broadcasting them together.
+        :return: Dict with "monthly_payment", "total_interest" and "total_cost" arrays and an
+            "errors" dict of boolean masks: "principal", "rate" and "years".
+        """
+        principals = np.asarray(principals, dtype=np.float64)
+        rates = np.asarray(annual_interest_rates, dtype=np.float64)
+        years = np.asarray(years, dtype=np.float64)
+        if grid:
+            principals, rates, years = np.meshgrid(principals, rates, years, indexing="ij", sparse=True)
+        principals, rates, years = np.broadcast_arrays(principals, rates, years)
+        with np.errstate(invalid="ignore"):
+            errors = {
+                "principal": ~(principals > 0),
+                "rate": ~(rates >= 0),
+                "years": ~(years > 0),
+            }
+        invalid = errors["principal"] | errors["rate"] | errors["years"]
+        monthly_rates = np.where(invalid, 1.0, rates / 1200)
+        total_payments = np.where(invalid, 1.0, years * 12)
+        zero_rate = monthly_rates == 0
+        safe_rates = np.where(zero_rate, 1.0, monthly_rates)
+        # P * r / (1 - (1 + r) ** -n), with expm1 and log1p for accuracy at small rates.
+        amortized = principals * safe_rates / -np.expm1(-total_payments * np.log1p(safe_rates))
+        payments = np.where(zero_rate, principals / total_payments, amortized)
+        payments[invalid] = np.nan
+        total_cost = payments * total_payments
+        return {
+            "monthly_payment": payments,
+            "total_interest": total_cost - principals,
+            "total_cost": total_cost,
+            "errors": errors,
+        }
+
+    def remaining_balance(self, month):
+        """
+        Calculate the balance left after a given month in O(1) with the amortization formula.
+        :param month: Number of payments made, from 0 to years * 12; may be an array.
+        """
+        total_payments = self.years * 12
+        months = np.asarray(month)
+        if (months < 0).any() or (months > total_payments).any():
+            raise ValueError(f"Month must be between 0 and {total_payments}.")
+        monthly_interest_rate = self.annual_interest_rate / 12
+        monthly_payment = self.calculate_monthly_payment()
+        if monthly_interest_rate == 0:
+            balance = self.principal - monthly_payment * months
+        else:
+            growth = (1 + monthly_interest_rate) ** months
+            balance = self.principal * growth - monthly_payment * (growth - 1) / monthly_interest_rate
+        return balance if np.ndim(month) else float(balance)
+
+    def schedule_arrays(self, start=1, stop=None, decimals=None):
+        """
+        Compute the repayment schedule as arrays, without a Python loop.
+        Any range of months can be computed on its own.
+        :param start: First month to include (default 1).
+        :param stop: Last month to include (optional, defaults to the final month).
+        :param decimals: Round the amounts to this many decimals (optional).
+        :return: Dict of "month", "principal_payment", "interest_payment" and "remaining_balance" arrays.
+        """
+        total_payments = self.years * 12
+        stop = total_payments if stop is None else stop
+        if not 1 <= start <= stop <= total_payments:
+            raise ValueError(f"Months must be between 1 and {total_payments}.")
+        months = np.arange(start, stop + 1)
+        balances = self.remaining_balance(np.arange(start - 1, stop + 1))
+        interest = balances[:-1] * (self.annual_interest_rate / 12)
+        schedule = {
+            "month": months,
+            "principal_payment": self.calculate_monthly_payment() - interest,
+            "interest_payment": interest,
+            "remaining_balance": balances[1:],
+        }
+        if decimals is not None:
+            for key in ("principal_payment", "interest_payment", "remaining_balance"):
+                schedule[key] = np.round(schedule[key], decimals)
+        return schedule
+
+    def iter_repayment_schedule(self):
+        """
+        Lazily yield the rows of the repayment schedule, one month at a time.
         """
         monthly_payment = self.calculate_monthly_payment()
         monthly_interest_rate = self.annual_interest_rate / 12
         remaining_balance = self.principal
-        schedule = []
 
         for month in range(1, self.years * 12 + 1):
             interest_payment = remaining_balance * monthly_interest_rate
             principal_payment = monthly_payment - interest_payment
             remaining_balance -= principal_payment
 
-            schedule.append({
+            yield {
                 "month": month,
                 "principal_payment": round(principal_payment, 2),
                 "interest_payment": round(interest_payment, 2),
                 "remaining_balance": round(remaining_balance, 2),
-            })
+            }
 
-        return schedule
\ No newline at end of file
+    def generate_repayment_schedule(self):
+        """
+        Generate the repayment schedule showing principal and interest breakdown.
+        """
+        return list(self.iter_repayment_schedule())
\ No newline at end of file
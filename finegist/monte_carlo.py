@@ -0,0 +1,159 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+MODELS = ("lognormal", "normal", "bootstrap")
+
+# Paths simulated per block; each block gets its own child seed.
+BLOCK_SIZE = 10000
+
+
+def _simulate_block(seed, paths, years, initial_value, contribution, model, drift, scale, samples, steps_per_year):
+    """
+    Simulate one block of paths and return their values at every year end,
+    as a (paths, years + 1) array.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.empty((paths, years + 1))
+    values[:, 0] = initial_value
+    current = np.full(paths, float(initial_value))
+    for year in range(1, years + 1):
+        if model == "bootstrap":
+            growth = 1 + rng.choice(samples, size=(paths, steps_per_year))
+        elif model == "normal":
+            growth = 1 + rng.normal(drift, scale, size=(paths, steps_per_year))
+        else:
+            growth = np.exp(rng.normal(drift, scale, size=(paths, steps_per_year)))
+        np.maximum(growth, 0.0, out=growth)
+        if contribution:
+            for step in range(steps_per_year):
+                current *= growth[:, step]
+                current += contribution
+        else:
+            current *= growth.prod(axis=1)
+        values[:, year] = current
+    return values
+
+
+class MonteCarloSimulator:
+    """
+    Monte Carlo projection of a portfolio value.
+
+    Paths are generated as whole NumPy blocks of random returns. Blocks run in a
+    process pool, and each one draws from its own child of a SeedSequence, so the
+    results depend only on the seed and never on the number of workers. Only the
+    year-end values are kept, so 100k paths over 40 years take about 32 MB.
+    """
+
+    def __init__(self, mean_return=0.07, volatility=0.15, model="lognormal", historical_returns=None,
+                 steps_per_year=12, max_workers=None, seed=None):
+        """
+        Initialize the simulator.
+        :param mean_return: Expected annual return, e.g. 0.07 for 7% (default 0.07).
+        :param volatility: Annual standard deviation of returns (default 0.15).
+        :param model: "lognormal", "normal" or "bootstrap" (default "lognormal").
+        :param historical_returns: Per-step returns to resample with the bootstrap model, e.g. monthly returns.
+        :param steps_per_year: Number of return draws per year (default 12).
+        :param max_workers: Worker processes; 0 or 1 runs in-process (optional, defaults to all cores).
+        :param seed: Seed for reproducible results (optional).
+        """
+        if model not in MODELS:
+            raise ValueError(f"Model must be one of: {', '.join(MODELS)}.")
+        if volatility < 0:
+            raise ValueError("Volatility must be non-negative.")
+        if mean_return <= -1:
+            raise ValueError("Mean return must be greater than -100%.")
+        if steps_per_year <= 0:
+            raise ValueError("Steps per year must be greater than zero.")
+        if model == "bootstrap":
+            if historical_returns is None or not len(historical_returns):
+                raise ValueError("The bootstrap model needs historical returns.")
+            historical_returns = np.asarray(historical_returns, dtype=np.float64)
+        self.mean_return = mean_return
+        self.volatility = volatility
+        self.model = model
+        self.historical_returns = historical_returns
+        self.steps_per_year = steps_per_year
+        self.max_workers = os.cpu_count() if max_workers is None else max_workers
+        self.seed = seed
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the worker pool, if one was started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _step_parameters(self):
+        """
+        Drift and scale of a single step's return.
+        The lognormal drift makes the expected annual growth exactly 1 + mean_return.
+        """
+        steps = self.steps_per_year
+        if self.model == "normal":
+            return self.mean_return / steps, self.volatility / np.sqrt(steps)
+        drift = (np.log1p(self.mean_return) - self.volatility ** 2 / 2) / steps
+        return drift, self.volatility / np.sqrt(steps)
+
+    def simulate(self, initial_value, years, paths=10000, annual_contribution=0.0,
+                 percentiles=(5, 25, 50, 75, 95), target=None):
+        """
+        Project a value forward and summarize the distribution of outcomes.
+        :param initial_value: Starting value, e.g. portfolio.total_current_value().
+        :param years: Number of years to project.
+        :param paths: Number of simulated paths (default 10000).
+        :param annual_contribution: Amount added each year, spread evenly over its steps (default 0).
+        :param percentiles: Percentiles of the bands (default 5, 25, 50, 75 and 95).
+        :param target: Value whose probability of being reached by the end is reported (optional).
+        :return: Dict with "years", "bands" (percentile -> array of year-end values), "mean",
+            "terminal_values" and, when a target is given, "probability_of_target".
+        """
+        if initial_value < 0:
+            raise ValueError("Initial value must be non-negative.")
+        if years <= 0 or paths <= 0:
+            raise ValueError("Years and paths must be greater than zero.")
+        drift, scale = self._step_parameters()
+        sizes = [min(BLOCK_SIZE, paths - start) for start in range(0, paths, BLOCK_SIZE)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        args = (
+            seeds, sizes, [years] * len(sizes), [initial_value] * len(sizes),
+            [annual_contribution / self.steps_per_year] * len(sizes), [self.model] * len(sizes),
+            [drift] * len(sizes), [scale] * len(sizes), [self.historical_returns] * len(sizes),
+            [self.steps_per_year] * len(sizes),
+        )
+        if self.max_workers <= 1 or len(sizes) == 1:
+            blocks = list(map(_simulate_block, *args))
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            blocks = list(self._executor.map(_simulate_block, *args))
+        values = np.concatenate(blocks)
+        result = {
+            "years": np.arange(years + 1),
+            "bands": dict(zip(percentiles, np.percentile(values, percentiles, axis=0))),
+            "mean": values.mean(axis=0),
+            "terminal_values": values[:, -1],
+        }
+        if target is not None:
+            result["probability_of_target"] = float(np.mean(values[:, -1] >= target))
+        return result
+
+    def probability_of_target(self, initial_value, target, years, paths=10000, annual_contribution=0.0):
+        """
+        Probability that the value reaches a target by the end of the projection.
+        :param initial_value: Starting value.
+        :param target: The target value.
+        :param years: Number of years to project.
+        :param paths: Number of simulated paths (default 10000).
+        :param annual_contribution: Amount added each year (default 0).
+        """
+        return self.simulate(initial_value, years, paths, annual_contribution, (), target)["probability_of_target"]
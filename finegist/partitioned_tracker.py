@@ -0,0 +1,152 @@
+import math
+import zlib
+from array import array
+from datetime import date as _date, datetime
+
+import numpy as np
+
+from .calendar_periods import EPOCH_ORDINAL
+from .columnar_store import BulkValidationError, batch_columns, batch_ordinals, to_ordinal
+from .expense_tracker import ExpenseTracker
+
+
+class PartitionedExpenseTracker:
+    """
+    Expense tracker split into columnar partitions, either by calendar month or
+    by a hash of the description. Aggregates and range queries merge the exact
+    running totals and date indexes each partition already keeps, so totals,
+    per-date subtotals and range queries are identical to a single ExpenseTracker.
+
+    Everything runs in the calling process; there is no parallel aggregation.
+    With running totals a merge costs O(partitions + dates), far less than
+    sending a partition's arrays to a worker process, so a process pool would
+    only add overhead. Partitioning bounds the size of each tracker and lets
+    month-partitioned range queries skip partitions outside the range.
+    """
+
+    def __init__(self, partition_by="month", partitions=8):
+        """
+        Initialize an empty partitioned tracker.
+        :param partition_by: "month" to partition by calendar month or "hash" to partition by description.
+        :param partitions: Number of partitions when partitioning by hash.
+        """
+        if partition_by not in ("month", "hash"):
+            raise ValueError("Partition by must be 'month' or 'hash'.")
+        if partitions <= 0:
+            raise ValueError("Number of partitions must be greater than zero.")
+        self.partition_by = partition_by
+        self.partition_count = partitions
+        self.partitions = {}
+        self._sequences = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _partition_key(self, description, ordinal):
+        if self.partition_by == "month":
+            day = _date.fromordinal(ordinal)
+            return day.year * 12 + day.month - 1
+        return zlib.crc32(str(description).encode("utf-8")) % self.partition_count
+
+    def _partition(self, key):
+        tracker = self.partitions.get(key)
+        if tracker is None:
+            tracker = self.partitions[key] = ExpenseTracker(columnar=True)
+            self._sequences[key] = array("q")
+        return tracker
+
+    def add_expense(self, description, amount, date=None, tags=None):
+        """
+        Add an expense to the partition it belongs to.
+        :param description: Description of the expense.
+        :param amount: Amount of the expense.
+        :param date: Date of the expense (optional, defaults to today).
+        :param tags: Tags or categories of the expense (optional).
+        """
+        if date is None:
+            date = datetime.now().date()
+        key = self._partition_key(description, to_ordinal(date))
+        self._partition(key).add_expense(description, amount, date, tags)
+        self._sequences[key].append(self._size)
+        self._size += 1
+
+    def add_expenses_bulk(self, records=None, descriptions=None, amounts=None, dates=None, tags=None):
+        """
+        Validate a batch once and append it to the partitions in one step each.
+        Takes the same arguments as ExpenseTracker.add_expenses_bulk.
+        :return: The number of expenses added.
+        """
+        descriptions, amounts, dates, tags = batch_columns(records, descriptions, amounts, dates, tags)
+        count = len(amounts)
+        ordinals, invalid = batch_ordinals(dates, count, datetime.now().date())
+        invalid |= ~(amounts > 0)
+        if invalid.any():
+            raise BulkValidationError(
+                "Amount must be greater than zero and date must be a date.", np.flatnonzero(invalid)
+            )
+        if self.partition_by == "month":
+            months = (ordinals - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+            keys = months + 1970 * 12
+        else:
+            hashes = {}
+            keys = np.fromiter(
+                (hashes.setdefault(d, self._partition_key(d, 0)) for d in descriptions), dtype=np.int64, count=count
+            )
+        sequence = np.arange(self._size, self._size + count, dtype=np.int64)
+        days = (ordinals - EPOCH_ORDINAL).astype("datetime64[D]")
+        for key in np.unique(keys).tolist():
+            rows = np.flatnonzero(keys == key)
+            self._partition(key).add_expenses_bulk(
+                descriptions=[descriptions[i] for i in rows.tolist()],
+                amounts=amounts[rows],
+                dates=days[rows],
+                tags=None if tags is None else [tags[i] for i in rows.tolist()],
+            )
+            self._sequences[key].extend(sequence[rows].tolist())
+        self._size += count
+        return count
+
+    def total_expenses(self):
+        """
+        Calculate the total amount of all expenses across partitions.
+        The partitions' exact running totals are merged, so the result is identical
+        to a single ExpenseTracker holding the same expenses.
+        """
+        return math.fsum(
+            partial for tracker in self.partitions.values() for partial in tracker.total_partials()
+        )
+
+    def summary(self):
+        """
+        Return a summary of all expenses grouped by date, in date order.
+        The partitions' exact per-date subtotals are merged, so every subtotal is
+        identical to that of a single ExpenseTracker holding the same expenses.
+        """
+        daily = {}
+        for tracker in self.partitions.values():
+            for date, partials in tracker.daily_partials().items():
+                daily.setdefault(date, []).extend(partials)
+        return {date: math.fsum(daily[date]) for date in sorted(daily)}
+
+    def expenses_between(self, start, end):
+        """
+        Get all expenses dated between two dates, inclusive, ordered by date and
+        then by insertion order, exactly as ExpenseTracker.expenses_between.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        """
+        keys = list(self.partitions)
+        if self.partition_by == "month":
+            first = start.year * 12 + start.month - 1
+            last = end.year * 12 + end.month - 1
+            keys = [key for key in keys if first <= key <= last]
+        matches = []
+        for key in keys:
+            tracker = self.partitions[key]
+            sequence = self._sequences[key]
+            for row in tracker.positions_between(start, end):
+                expense = tracker.expenses[row]
+                matches.append((expense["date"], sequence[row], expense))
+        matches.sort(key=lambda match: match[:2])
+        return [expense for _, _, expense in matches]
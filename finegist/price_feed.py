@@ -0,0 +1,201 @@
+import asyncio
+import inspect
+import json
+
+# Approximate number of bytes read from a tick file per call to a worker thread.
+READ_SIZE = 1 << 16
+
+
+def parse_tick(line):
+    """
+    Parse one JSON Lines price tick, e.g. {"symbol": "ABC", "price": 101.5}.
+    :param line: The line, as str or bytes.
+    :return: A (symbol, price) tuple, or None for a blank line.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+        symbol, price = record["symbol"], float(record["price"])
+    except (ValueError, KeyError, TypeError) as error:
+        raise ValueError(f"Invalid price tick: {line!r}") from error
+    if not price > 0:
+        raise ValueError(f"Invalid price tick: {line!r}")
+    return symbol, price
+
+
+async def stream_ticks(reader):
+    """
+    Asynchronously yield price ticks from a stream of JSON lines, such as a socket.
+    :param reader: An asyncio.StreamReader.
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        tick = parse_tick(line)
+        if tick is not None:
+            yield tick
+
+
+async def file_ticks(path, delay=0.0):
+    """
+    Asynchronously yield price ticks from a JSON Lines file, a local stand-in for a live feed.
+    The file is read in blocks in a worker thread, so the event loop never waits on the disk.
+    :param path: Path to the file.
+    :param delay: Seconds to wait between ticks to simulate a feed (default 0).
+    """
+    with await asyncio.to_thread(open, path, encoding="utf-8") as f:
+        while True:
+            lines = await asyncio.to_thread(f.readlines, READ_SIZE)
+            if not lines:
+                return
+            for line in lines:
+                tick = parse_tick(line)
+                if tick is not None:
+                    yield tick
+                await asyncio.sleep(delay)
+
+
+class PortfolioRevaluer:
+    """
+    Revalues an InvestmentPortfolio from a stream of price ticks.
+
+    Ticks are coalesced per symbol: between two flushes only the latest price of
+    each symbol is kept, so a burst of ticks costs one revaluation per symbol.
+    Revaluing a holding adjusts the portfolio totals incrementally. Subscribers
+    receive a snapshot at most once per `min_interval` seconds. Each subscriber
+    has its own one-slot mailbox, and a slow subscriber only ever misses
+    intermediate snapshots; it never holds up the feed.
+    """
+
+    def __init__(self, portfolio, min_interval=1.0):
+        """
+        Initialize the revaluer.
+        :param portfolio: The InvestmentPortfolio to revalue; holdings need a quantity to be priced.
+        :param min_interval: Minimum number of seconds between notifications (default 1).
+        """
+        if min_interval < 0:
+            raise ValueError("Minimum interval must be non-negative.")
+        self.portfolio = portfolio
+        self.min_interval = min_interval
+        self.subscribers = []
+        self.errors = []
+        self.tick_count = 0
+        self._pending = {}
+
+    def subscribe(self, callback):
+        """
+        Register a function or coroutine function called with each snapshot.
+        Coroutine functions are awaited on the event loop; plain functions run in a worker thread,
+        so a blocking subscriber does not stall the feed.
+        :param callback: Receives a dict with "total_invested", "total_current_value" and "updated" prices.
+        """
+        self.subscribers.append(callback)
+
+    def push(self, symbol, price):
+        """
+        Queue a price for a symbol, replacing any price not yet applied.
+        :param symbol: Name of the investment.
+        :param price: Price per unit.
+        """
+        self._pending[symbol] = price
+        self.tick_count += 1
+
+    def flush(self):
+        """
+        Apply the queued prices to the holdings that have a quantity.
+        :return: Dict of the prices applied, by symbol.
+        """
+        pending, self._pending = self._pending, {}
+        updated = {}
+        holdings = self.portfolio.holdings
+        for symbol, price in pending.items():
+            holding = holdings.get(symbol)
+            if holding is not None and holding.get("quantity"):
+                self.portfolio.revalue(symbol, price=price)
+                updated[symbol] = price
+        return updated
+
+    def snapshot(self, updated=None):
+        """
+        Current portfolio totals, with the prices applied since the previous snapshot.
+        """
+        return {
+            "total_invested": self.portfolio.total_invested(),
+            "total_current_value": self.portfolio.total_current_value(),
+            "updated": updated or {},
+        }
+
+    async def _deliver(self, callback, mailbox):
+        while True:
+            snapshot = await mailbox.get()
+            try:
+                if inspect.iscoroutinefunction(callback):
+                    await callback(snapshot)
+                else:
+                    await asyncio.to_thread(callback, snapshot)
+            except Exception as error:
+                self.errors.append(error)
+            finally:
+                mailbox.task_done()
+
+    @staticmethod
+    def _post(mailbox, snapshot):
+        """
+        Put a snapshot in a one-slot mailbox, replacing one not yet delivered.
+        """
+        if mailbox.full():
+            mailbox.get_nowait()
+            mailbox.task_done()
+        mailbox.put_nowait(snapshot)
+
+    async def run(self, ticks):
+        """
+        Consume a feed until it ends, revaluing the portfolio and notifying subscribers.
+        :param ticks: Async iterable of (symbol, price) tuples or {"symbol", "price"} dicts.
+        :return: The final snapshot.
+        """
+        mailboxes = [asyncio.Queue(maxsize=1) for _ in self.subscribers]
+        deliveries = [
+            asyncio.create_task(self._deliver(callback, mailbox))
+            for callback, mailbox in zip(self.subscribers, mailboxes)
+        ]
+        arrived = asyncio.Event()
+        finished = False
+
+        async def consume():
+            nonlocal finished
+            try:
+                async for tick in ticks:
+                    if isinstance(tick, dict):
+                        self.push(tick["symbol"], tick["price"])
+                    else:
+                        self.push(*tick)
+                    arrived.set()
+            finally:
+                finished = True
+                arrived.set()
+
+        consumer = asyncio.create_task(consume())
+        try:
+            while True:
+                await arrived.wait()
+                arrived.clear()
+                updated = self.flush()
+                if updated or finished:
+                    snapshot = self.snapshot(updated)
+                    for mailbox in mailboxes:
+                        self._post(mailbox, snapshot)
+                if finished:
+                    break
+                await asyncio.sleep(self.min_interval)
+            await consumer
+            await asyncio.gather(*(mailbox.join() for mailbox in mailboxes))
+        finally:
+            consumer.cancel()
+            for delivery in deliveries:
+                delivery.cancel()
+            await asyncio.gather(consumer, *deliveries, return_exceptions=True)
+        return snapshot
@@ -0,0 +1,309 @@
+from collections.abc import Mapping
+from datetime import date as _date
+
+import numpy as np
+
+from .calendar_periods import PERIODS, period_starts
+from .columnar_store import batch_ordinals
+
+# Trading days per year, used to annualize daily volatility.
+TRADING_DAYS = 252
+
+
+def forward_fill(prices):
+    """
+    Carry the last known price forward over missing (NaN) entries, column by column.
+    Entries before a column's first price stay NaN. Returns the input itself when nothing is missing.
+    :param prices: 2D array of prices, one row per date.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    missing = np.isnan(prices)
+    if not missing.any():
+        return prices
+    rows = np.where(missing, 0, np.arange(len(prices))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return prices[rows, np.arange(prices.shape[1])]
+
+
+def time_weighted_return(values, flows=None):
+    """
+    Time-weighted return of a value series, removing the effect of external cash flows.
+    :param values: 1D array of portfolio values, one per date.
+    :param flows: External cash flow on each date, already included in that date's value (optional).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < 2:
+        return 0.0
+    flows = np.zeros(len(values)) if flows is None else np.asarray(flows, dtype=np.float64)
+    previous = values[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (values[1:] - flows[1:]) / previous
+    growth = np.where(previous > 0, growth, 1.0)
+    return float(np.prod(growth) - 1)
+
+
+class PriceHistory:
+    """
+    Daily prices of many holdings in one contiguous date x symbol matrix.
+
+    Dates are kept sorted as ordinals and each symbol owns a column; missing
+    prices are NaN and are forward-filled by the analytics. Returns, rolling
+    volatility, drawdown and portfolio values are whole-matrix NumPy operations,
+    so they cost one pass over the data regardless of the number of holdings.
+    """
+
+    def __init__(self, capacity=256, symbols=()):
+        """
+        Initialize an empty history.
+        :param capacity: Number of dates to reserve space for up front (optional).
+        :param symbols: Symbols to create columns for up front (optional).
+        """
+        capacity = max(int(capacity), 1)
+        self._ordinals = np.empty(capacity, dtype=np.int64)
+        self._prices = np.full((capacity, max(len(symbols), 8)), np.nan)
+        self._size = 0
+        self.symbols = []
+        self._columns = {}
+        for symbol in symbols:
+            self._column(symbol)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, symbol):
+        return symbol in self._columns
+
+    def _column(self, symbol):
+        column = self._columns.get(symbol)
+        if column is None:
+            column = self._columns[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            if column >= self._prices.shape[1]:
+                grown = np.full((self._prices.shape[0], 2 * self._prices.shape[1]), np.nan)
+                grown[:, :column] = self._prices
+                self._prices = grown
+        return column
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._ordinals)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        ordinals = np.empty(capacity, dtype=np.int64)
+        ordinals[:self._size] = self._ordinals[:self._size]
+        prices = np.full((capacity, self._prices.shape[1]), np.nan)
+        prices[:self._size] = self._prices[:self._size]
+        self._ordinals, self._prices = ordinals, prices
+
+    def _row(self, ordinal):
+        """
+        Row of a date, inserting it in order when it is new. Appending is O(1);
+        inserting before the last date shifts the later rows.
+        """
+        size = self._size
+        if size and self._ordinals[size - 1] == ordinal:
+            return size - 1
+        position = int(np.searchsorted(self._ordinals[:size], ordinal))
+        if position < size and self._ordinals[position] == ordinal:
+            return position
+        self._reserve(1)
+        self._ordinals[position + 1:size + 1] = self._ordinals[position:size]
+        self._prices[position + 1:size + 1] = self._prices[position:size]
+        self._ordinals[position] = ordinal
+        self._prices[position] = np.nan
+        self._size += 1
+        return position
+
+    def record(self, symbol, date, price):
+        """
+        Record the price of one symbol on one date.
+        :param symbol: Symbol or name of the holding.
+        :param date: Date of the price.
+        :param price: The price.
+        """
+        self.record_prices(date, {symbol: price})
+
+    def record_prices(self, date, prices):
+        """
+        Record the prices of many symbols on one date.
+        :param date: Date of the prices.
+        :param prices: Mapping of symbol to price.
+        """
+        if any(not price > 0 for price in prices.values()):
+            raise ValueError("Price must be greater than zero.")
+        columns = [self._column(symbol) for symbol in prices]
+        row = self._row(date.toordinal())
+        self._prices[row, columns] = list(prices.values())
+
+    def extend(self, dates, symbols, prices):
+        """
+        Append a block of prices dated after every date already recorded.
+        :param dates: Increasing sequence or datetime64 array of dates.
+        :param symbols: Symbols of the block's columns.
+        :param prices: 2D array of prices, one row per date and one column per symbol; NaN for missing.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 2 or prices.shape[1] != len(symbols):
+            raise ValueError("Prices must have one row per date and one column per symbol.")
+        ordinals, invalid = batch_ordinals(dates, len(prices), _date.min)
+        if invalid.any():
+            raise ValueError("Dates must be dates.")
+        if len(ordinals) > 1 and not (np.diff(ordinals) > 0).all():
+            raise ValueError("Dates must be strictly increasing.")
+        if self._size and len(ordinals) and ordinals[0] <= self._ordinals[self._size - 1]:
+            raise ValueError("Dates must come after the last recorded date.")
+        with np.errstate(invalid="ignore"):
+            if (prices <= 0).any():
+                raise ValueError("Price must be greater than zero.")
+        columns = [self._column(symbol) for symbol in symbols]
+        self._reserve(len(ordinals))
+        start = self._size
+        self._ordinals[start:start + len(ordinals)] = ordinals
+        self._prices[start:start + len(ordinals), columns] = prices
+        self._size += len(ordinals)
+
+    @property
+    def ordinals(self):
+        """
+        Date ordinals of the rows, in increasing order.
+        """
+        return self._ordinals[:self._size]
+
+    @property
+    def dates(self):
+        """
+        Dates of the rows, in increasing order.
+        """
+        return [_date.fromordinal(ordinal) for ordinal in self.ordinals.tolist()]
+
+    def _columns_for(self, symbols):
+        if symbols is None:
+            return slice(0, len(self.symbols))
+        missing = [symbol for symbol in symbols if symbol not in self._columns]
+        if missing:
+            raise ValueError(f"No prices recorded for: {', '.join(map(str, missing))}.")
+        return [self._columns[symbol] for symbol in symbols]
+
+    def prices(self, symbols=None, fill=True):
+        """
+        Price matrix, one row per date and one column per symbol.
+        When nothing needs filling this is a read-only view of the storage.
+        :param symbols: Symbols to include, in order (optional, defaults to every symbol).
+        :param fill: Forward-fill missing prices (default True).
+        """
+        prices = self._prices[:self._size, self._columns_for(symbols)]
+        if not fill:
+            return prices.copy()
+        prices.flags.writeable = False
+        return forward_fill(prices)
+
+    def returns(self, symbols=None, period="day"):
+        """
+        Simple returns per period, computed on forward-filled prices.
+        :param symbols: Symbols to include, in order (optional, defaults to every symbol).
+        :param period: "day" for row-to-row returns, or "week", "month", "quarter" or "year".
+        :return: Tuple (ordinals, returns) where row i is the return up to ordinals[i]; for
+            calendar periods the ordinal is the first day of the period.
+        """
+        prices = self.prices(symbols)
+        ordinals = self.ordinals
+        if period != "day":
+            if period not in PERIODS:
+                raise ValueError(f"Period must be 'day' or one of: {', '.join(PERIODS)}.")
+            starts = period_starts(ordinals, period)
+            last = np.append(np.flatnonzero(np.diff(starts)), len(starts) - 1) if len(starts) else starts
+            prices = prices[last]
+            ordinals = starts[last]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = prices[1:] / prices[:-1] - 1
+        return ordinals[1:], returns
+
+    def rolling_volatility(self, window=21, symbols=None, periods_per_year=TRADING_DAYS):
+        """
+        Rolling standard deviation of daily returns, annualized.
+        Row i covers the `window` returns ending at return i; rows without a full window are NaN.
+        :param window: Number of daily returns per window (default 21).
+        :param symbols: Symbols to include, in order (optional, defaults to every symbol).
+        :param periods_per_year: Annualization factor; 1 leaves the volatility per period (default 252).
+        """
+        if window < 2:
+            raise ValueError("Window must be at least 2.")
+        _, returns = self.returns(symbols)
+        volatility = np.full(returns.shape, np.nan)
+        if len(returns) < window:
+            return volatility
+        # Windowed sums from running sums; windows touching a missing return stay NaN.
+        missing = np.isnan(returns)
+        has_missing = missing.any()
+        if has_missing:
+            returns[missing] = 0.0
+        sums = np.zeros((len(returns) + 1, returns.shape[1]))
+        np.cumsum(returns, axis=0, out=sums[1:])
+        total = sums[window:] - sums[:-window]
+        np.square(returns, out=returns)
+        np.cumsum(returns, axis=0, out=sums[1:])
+        variance = sums[window:] - sums[:-window]
+        variance -= total * total / window
+        np.maximum(variance, 0.0, out=variance)
+        variance *= periods_per_year / (window - 1)
+        np.sqrt(variance, out=volatility[window - 1:])
+        if has_missing:
+            np.cumsum(missing, axis=0, out=sums[1:])
+            volatility[window - 1:][sums[window:] - sums[:-window] > 0] = np.nan
+        return volatility
+
+    def drawdown(self, symbols=None):
+        """
+        Drawdown of each symbol from its running peak, as a fraction (0 at a new high).
+        :param symbols: Symbols to include, in order (optional, defaults to every symbol).
+        """
+        prices = self.prices(symbols)
+        peaks = np.fmax.accumulate(prices, axis=0)
+        return prices / peaks - 1
+
+    def portfolio_values(self, quantities):
+        """
+        Value of a portfolio on every date. Holdings without a price yet count as zero.
+        :param quantities: Mapping of symbol to quantity, or an array aligned with `symbols`
+            (1D for fixed quantities, or 2D with one row per date).
+        """
+        if isinstance(quantities, Mapping):
+            symbols = list(quantities)
+            prices = self.prices(symbols)
+            quantities = np.fromiter(quantities.values(), dtype=np.float64, count=len(symbols))
+        else:
+            prices = self.prices()
+            quantities = np.asarray(quantities, dtype=np.float64)
+        if np.isnan(prices).any():
+            prices = np.nan_to_num(prices)
+        if quantities.ndim == 2:
+            return np.einsum("ij,ij->i", prices, quantities)
+        return prices @ quantities
+
+    def max_drawdown(self, quantities):
+        """
+        Largest peak-to-trough fall of a portfolio's value, as a fraction.
+        :param quantities: Quantities, as accepted by portfolio_values.
+        """
+        values = self.portfolio_values(quantities)
+        if not len(values):
+            return 0.0
+        peaks = np.maximum.accumulate(values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return float(np.nanmin(np.where(peaks > 0, values / peaks - 1, 0.0)))
+
+    def time_weighted_return(self, quantities, flows=None):
+        """
+        Time-weighted return of a portfolio over the whole history.
+        With a 2D array of quantities and no explicit flows, every change in quantity
+        is treated as an external cash flow at that date's prices.
+        :param quantities: Quantities, as accepted by portfolio_values.
+        :param flows: External cash flow on each date (optional).
+        """
+        values = self.portfolio_values(quantities)
+        if flows is None and not isinstance(quantities, Mapping) and np.ndim(quantities) == 2:
+            changes = np.diff(np.asarray(quantities, dtype=np.float64), axis=0, prepend=0.0)
+            flows = np.einsum("ij,ij->i", np.nan_to_num(self.prices()), changes)
+        return time_weighted_return(values, flows)
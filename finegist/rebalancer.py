@@ -0,0 +1,131 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class Rebalancer:
+    """
+    Computes rebalancing trades against target weights for one portfolio or a
+    whole book of them.
+
+    Portfolios are rows of a (portfolios x assets) value matrix, so a book is
+    processed in one vectorized pass. An asset is traded back to its target only
+    when its weight has drifted outside the band. Trades smaller than the minimum
+    trade size are dropped. When the buys would cost more than the sells plus the
+    available cash, every buy in that portfolio is scaled down by the same factor.
+    Weights that do not add up to 1 leave the remainder as a cash target.
+    """
+
+    def __init__(self, target_weights, band=0.05, min_trade=0.0):
+        """
+        Initialize the rebalancer.
+        :param target_weights: Mapping of investment name to target weight, e.g. {"Stocks": 0.6, "Bonds": 0.4}.
+        :param band: Allowed absolute drift of a weight before it is traded, e.g. 0.05 for five
+            percentage points; a scalar or a mapping by name (default 0.05).
+        :param min_trade: Smallest trade amount worth placing (default 0).
+        """
+        if not isinstance(target_weights, Mapping) or not target_weights:
+            raise ValueError("Target weights must be a non-empty mapping of name to weight.")
+        self.names = list(target_weights)
+        self.targets = np.fromiter(target_weights.values(), dtype=np.float64, count=len(self.names))
+        if (self.targets < 0).any() or self.targets.sum() > 1 + 1e-9:
+            raise ValueError("Target weights must be non-negative and add up to at most 1.")
+        if isinstance(band, Mapping):
+            band = [band.get(name, 0.0) for name in self.names]
+        self.bands = np.broadcast_to(np.asarray(band, dtype=np.float64), self.targets.shape)
+        if (self.bands < 0).any():
+            raise ValueError("Band must be non-negative.")
+        if min_trade < 0:
+            raise ValueError("Minimum trade must be non-negative.")
+        self.min_trade = min_trade
+
+    def rebalance_arrays(self, values, cash=0.0, targets=None, bands=None):
+        """
+        Compute trades for many portfolios in one vectorized pass.
+        :param values: (portfolios x assets) array of current values, columns in the order of `names`
+            unless explicit targets are given; a 1D array is treated as a single portfolio.
+        :param cash: Available cash per portfolio, or one value for all (default 0).
+        :param targets: Target weights aligned with the columns, 1D or one row per portfolio
+            (optional, defaults to the rebalancer's targets).
+        :param bands: Drift bands aligned with the columns (optional, defaults to the rebalancer's bands).
+        :return: Dict with "trades" (positive buys, negative sells, same shape as values),
+            "cash" left after trading and "drifted", the mask of assets outside their band.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        single = values.ndim == 1
+        values = np.atleast_2d(values)
+        targets = self.targets if targets is None else np.asarray(targets, dtype=np.float64)
+        bands = self.bands if bands is None else np.asarray(bands, dtype=np.float64)
+        if values.shape[1] != np.shape(targets)[-1]:
+            raise ValueError("Values must have one column per target weight.")
+        cash = np.broadcast_to(np.asarray(cash, dtype=np.float64), values.shape[:1])
+        if (values < 0).any() or (cash < 0).any():
+            raise ValueError("Values and cash must be non-negative.")
+
+        totals = values.sum(axis=1) + cash
+        safe_totals = np.where(totals > 0, totals, 1.0)[:, None]
+        desired = targets * safe_totals
+        drifted = (np.abs(values / safe_totals - targets) > bands) & (totals[:, None] > 0)
+        trades = np.where(drifted, desired - values, 0.0)
+        trades[np.abs(trades) < self.min_trade] = 0.0
+
+        buys = np.where(trades > 0, trades, 0.0)
+        buy_total = buys.sum(axis=1)
+        available = cash - np.where(trades < 0, trades, 0.0).sum(axis=1)
+        scale = np.divide(available, buy_total, out=np.ones_like(buy_total), where=buy_total > available)
+        trades = np.where(trades > 0, trades * scale[:, None], trades)
+        trades[(trades > 0) & (trades < self.min_trade)] = 0.0
+
+        result = {"trades": trades, "cash": cash - trades.sum(axis=1), "drifted": drifted}
+        if single:
+            result = {key: value[0] for key, value in result.items()}
+        return result
+
+    def _columns(self, portfolios):
+        """
+        Target names followed by every other name held in the portfolios.
+        """
+        names = list(self.names)
+        known = set(names)
+        for portfolio in portfolios:
+            for name in portfolio.holdings:
+                if name not in known:
+                    known.add(name)
+                    names.append(name)
+        return names
+
+    def rebalance_book(self, portfolios, cash=0.0):
+        """
+        Compute the trade lists for a whole book of InvestmentPortfolio objects at once.
+        Holdings without a target weight are sold.
+        :param portfolios: Sequence of InvestmentPortfolio instances.
+        :param cash: Available cash per portfolio, or one value for all (default 0).
+        :return: One trade list per portfolio; each trade is a dict with "name", "action" ("buy"
+            or "sell") and "amount".
+        """
+        portfolios = list(portfolios)
+        names = self._columns(portfolios)
+        columns = {name: i for i, name in enumerate(names)}
+        values = np.zeros((len(portfolios), len(names)))
+        for row, portfolio in enumerate(portfolios):
+            for name, holding in portfolio.holdings.items():
+                values[row, columns[name]] = holding["current_value"]
+        extra = len(names) - len(self.names)
+        targets = np.concatenate([self.targets, np.zeros(extra)])
+        bands = np.concatenate([self.bands, np.zeros(extra)])
+        trades = self.rebalance_arrays(values, cash, targets, bands)["trades"]
+        books = []
+        for row in trades:
+            books.append([
+                {"name": names[i], "action": "buy" if row[i] > 0 else "sell", "amount": float(abs(row[i]))}
+                for i in np.flatnonzero(row).tolist()
+            ])
+        return books
+
+    def rebalance(self, portfolio, cash=0.0):
+        """
+        Compute the trade list for a single InvestmentPortfolio.
+        :param portfolio: The InvestmentPortfolio to rebalance.
+        :param cash: Available cash (default 0).
+        """
+        return self.rebalance_book([portfolio], cash)[0]
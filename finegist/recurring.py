@@ -0,0 +1,124 @@
+import calendar
+from datetime import date as _date, timedelta
+
+from .expense_index import tag_tuple
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+
+
+def _add_months(day, months, anchor_day):
+    """
+    Shift a date by whole months, clamping the anchor day to the month's length.
+    """
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    month += 1
+    return _date(year, month, min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+class RecurringExpense:
+    """
+    A compact rule for an expense that repeats, such as rent or a subscription.
+    Occurrences are never stored; any one of them is computed in O(1) and
+    counts over a date range are solved arithmetically.
+    """
+
+    def __init__(self, description, amount, start, frequency="monthly", interval=1, end=None, tags=None):
+        """
+        Initialize a recurring expense.
+        :param description: Description of the expense.
+        :param amount: Amount of each occurrence.
+        :param start: Date of the first occurrence.
+        :param frequency: One of "daily", "weekly", "monthly" or "yearly" (default "monthly").
+        :param interval: Number of periods between occurrences, e.g. 2 for every other week (default 1).
+        :param end: Last date an occurrence may fall on (optional, open-ended by default).
+        :param tags: Tags or categories of the expense (optional).
+        """
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero.")
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Frequency must be one of: {', '.join(FREQUENCIES)}.")
+        if interval <= 0:
+            raise ValueError("Interval must be greater than zero.")
+        if end is not None and end < start:
+            raise ValueError("End date must not be before the start date.")
+        self.description = description
+        self.amount = amount
+        self.start = start
+        self.frequency = frequency
+        self.interval = interval
+        self.end = end
+        self.tags = tag_tuple(tags)
+
+    @property
+    def _step_days(self):
+        return {"daily": 1, "weekly": 7}.get(self.frequency, 0) * self.interval
+
+    @property
+    def _step_months(self):
+        return {"monthly": 1, "yearly": 12}.get(self.frequency, 0) * self.interval
+
+    def occurrence(self, n):
+        """
+        Date of the n-th occurrence, counting from 0, ignoring the end date.
+        :param n: Index of the occurrence.
+        """
+        if self._step_days:
+            return self.start + timedelta(days=n * self._step_days)
+        return _add_months(self.start, n * self._step_months, self.start.day)
+
+    def _first_index_on_or_after(self, day):
+        """
+        Index of the first occurrence dated on or after `day`.
+        """
+        if day <= self.start:
+            return 0
+        if self._step_days:
+            return -(-(day - self.start).days // self._step_days)
+        months = (day.year - self.start.year) * 12 + day.month - self.start.month
+        index = months // self._step_months
+        while self.occurrence(index) < day:
+            index += 1
+        return index
+
+    def _index_range(self, start, end):
+        """
+        Half-open range of occurrence indexes dated within [start, end].
+        """
+        if self.end is not None and self.end < end:
+            end = self.end
+        if end < start or end < self.start:
+            return 0, 0
+        first = self._first_index_on_or_after(start)
+        stop = self._first_index_on_or_after(end + timedelta(days=1))
+        return first, max(first, stop)
+
+    def count_between(self, start, end):
+        """
+        Number of occurrences dated between two dates, inclusive.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        """
+        first, stop = self._index_range(start, end)
+        return stop - first
+
+    def total_between(self, start, end):
+        """
+        Total amount of the occurrences dated between two dates, inclusive.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        """
+        return self.count_between(start, end) * self.amount
+
+    def occurrences(self, start, end):
+        """
+        Lazily yield the occurrences between two dates, inclusive, as expense dicts.
+        :param start: The first date of the range.
+        :param end: The last date of the range.
+        """
+        first, stop = self._index_range(start, end)
+        for index in range(first, stop):
+            expense = {"description": self.description, "amount": self.amount, "date": self.occurrence(index)}
+            if self.tags:
+                expense["tags"] = self.tags
+            yield expense
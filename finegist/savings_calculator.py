@@ -1,3 +1,57 @@
+import math
+
+import numpy as np
+
+# Compounding periods per year; None means continuous compounding.
+COMPOUNDING = {
+    "daily": 365,
+    "weekly": 52,
+    "monthly": 12,
+    "quarterly": 4,
+    "semiannually": 2,
+    "annually": 1,
+    "continuous": None,
+}
+
+
+def monthly_rate(annual_rate, compounding="monthly"):
+    """
+    Convert a nominal annual interest rate to the equivalent effective monthly rate.
+    :param annual_rate: Nominal annual rate (in percentage, e.g. 5 for 5%); may be an array.
+    :param compounding: One of the COMPOUNDING keys (default "monthly").
+    :return: The monthly rate as a decimal, e.g. 0.01 for 1%.
+    """
+    if compounding not in COMPOUNDING:
+        raise ValueError(f"Compounding must be one of: {', '.join(COMPOUNDING)}.")
+    periods = COMPOUNDING[compounding]
+    annual_rate = np.asarray(annual_rate, dtype=np.float64) / 100
+    if periods is None:
+        return np.expm1(annual_rate / 12)
+    return np.expm1(periods / 12 * np.log1p(annual_rate / periods))
+
+
+def _projected_balance(months, initial_balance, contribution, rate, growth):
+    """
+    Balance after `months` months of end-of-month contributions that grow by
+    `growth` per month, and its derivative with respect to `months`.
+    """
+    log_p = np.log1p(rate)
+    log_q = np.log1p(growth)
+    p_m = np.exp(months * log_p)
+    q_m = np.exp(months * log_q)
+    same = np.isclose(rate, growth)
+    spread = np.where(same, 1.0, rate - growth)
+    annuity = np.where(same, months * p_m / (1 + rate), (p_m - q_m) / spread)
+    d_annuity = np.where(
+        same,
+        p_m / (1 + rate) * (1 + months * log_p),
+        (p_m * log_p - q_m * log_q) / spread,
+    )
+    balance = initial_balance * p_m + contribution * annuity
+    slope = initial_balance * p_m * log_p + contribution * d_annuity
+    return balance, slope
+
+
 class SavingsCalculator:
     def __init__(self, income, expenses):
         """
@@ -28,4 +82,135 @@ class SavingsCalculator:
         monthly_savings = self.calculate_savings()
         if monthly_savings <= 0:
             raise ValueError("Monthly savings must be greater than zero to reach the target.")
-        return target_savings / monthly_savings
\ No newline at end of file
+        return target_savings / monthly_savings
+
+    @staticmethod
+    def calculate_batch(incomes, expenses, targets=None):
+        """
+        Calculate savings and months to target for many income/expenses pairs at once.
+        Rows are validated together; invalid rows are reported through masks
+        instead of raising, and their results are NaN.
+        :param incomes: Array of monthly incomes.
+        :param expenses: Array of monthly expenses, or a single value for every row.
+        :param targets: Array of target savings, or a single value for every row (optional).
+        :return: Dict with "savings" and "months_to_target" arrays and an "errors" dict of
+            boolean masks: "income", "expenses", "target" and "savings" (not greater than zero).
+            Without targets, months to target are NaN and the target mask is all False.
+        """
+        no_targets = targets is None
+        if no_targets:
+            incomes, expenses = np.broadcast_arrays(
+                np.asarray(incomes, dtype=np.float64), np.asarray(expenses, dtype=np.float64)
+            )
+            targets = np.full(incomes.shape, np.nan)
+        else:
+            incomes, expenses, targets = np.broadcast_arrays(
+                np.asarray(incomes, dtype=np.float64),
+                np.asarray(expenses, dtype=np.float64),
+                np.asarray(targets, dtype=np.float64),
+            )
+        with np.errstate(invalid="ignore"):
+            errors = {
+                "income": ~(incomes >= 0),
+                "expenses": ~(expenses >= 0),
+                "target": np.zeros(targets.shape, dtype=bool) if no_targets else ~(targets >= 0),
+            }
+        savings = np.where(errors["income"] | errors["expenses"], np.nan, incomes - expenses)
+        with np.errstate(invalid="ignore"):
+            errors["savings"] = ~(savings > 0)
+        failed = errors["target"] | errors["savings"]
+        months = np.full(savings.shape, np.nan)
+        np.divide(targets, savings, out=months, where=~failed)
+        return {"savings": savings, "months_to_target": months, "errors": errors}
+
+    @staticmethod
+    def project_months_to_target(savings, target_savings, annual_rate, compounding="monthly",
+                                 contribution_growth=0.0, initial_balance=0.0):
+        """
+        Months needed to reach a target with interest, for one or many scenarios.
+        Contributions are made at the end of each month and interest compounds on the
+        balance. Without contribution growth the answer is the closed form
+        log((T*r + C) / (P*r + C)) / log(1 + r); with growth, a few Newton steps
+        starting from that closed form are taken on every scenario at once.
+        Every argument except compounding may be an array; they are broadcast together.
+        :param savings: Monthly contribution C.
+        :param target_savings: The target savings amount T.
+        :param annual_rate: Nominal annual interest rate (in percentage, e.g. 5 for 5%).
+        :param compounding: One of the COMPOUNDING keys (default "monthly").
+        :param contribution_growth: Annual growth rate of the contribution (in percentage, e.g. 3 for 3%, default 0).
+        :param initial_balance: Starting balance P (default 0).
+        :return: Array of fractional months; NaN where the target can never be reached
+            or the inputs are invalid.
+        """
+        rate = monthly_rate(annual_rate, compounding)
+        contribution, target, rate, growth, balance = np.broadcast_arrays(
+            np.asarray(savings, dtype=np.float64),
+            np.asarray(target_savings, dtype=np.float64),
+            rate,
+            np.expm1(np.log1p(np.asarray(contribution_growth, dtype=np.float64) / 100) / 12),
+            np.asarray(initial_balance, dtype=np.float64),
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            valid = (target >= 0) & (rate >= 0) & (growth >= 0) & (balance >= 0) & (contribution >= 0)
+            reachable = valid & ((target <= balance) | (contribution > 0) | ((rate > 0) & (balance > 0)))
+            # Closed form without growth; it is also an upper bound once contributions grow.
+            linear = (target - balance) / contribution
+            logarithmic = np.log((target * rate + contribution) / (balance * rate + contribution)) / np.log1p(rate)
+            months = np.where(target <= balance, 0.0, np.where(rate > 0, logarithmic, linear))
+        months = np.where(reachable, np.maximum(months, 0.0), np.nan)
+        solve = reachable & (growth > 0) & (months > 0)
+        if solve.any():
+            m = months[solve]
+            args = (balance[solve], contribution[solve], rate[solve], growth[solve])
+            # The balance is increasing and convex in m, so Newton from the right converges monotonically.
+            for _ in range(100):
+                value, slope = _projected_balance(m, *args)
+                step = (value - target[solve]) / slope
+                m = np.maximum(m - step, 0.0)
+                if np.all(np.abs(step) <= 1e-10 * np.maximum(m, 1.0)):
+                    break
+            months[solve] = m
+        return months
+
+    def calculate_months_to_target_with_interest(self, target_savings, annual_rate, compounding="monthly",
+                                                 contribution_growth=0.0, initial_balance=0.0):
+        """
+        Calculate the number of months required to reach a target savings in an interest-bearing account.
+        :param target_savings: The target savings amount.
+        :param annual_rate: Nominal annual interest rate (in percentage, e.g. 5 for 5%).
+        :param compounding: One of the COMPOUNDING keys (default "monthly").
+        :param contribution_growth: Annual growth rate of the monthly savings (in percentage, default 0).
+        :param initial_balance: Starting balance (default 0).
+        """
+        if target_savings < 0:
+            raise ValueError("Target savings must be non-negative.")
+        if annual_rate < 0 or contribution_growth < 0 or initial_balance < 0:
+            raise ValueError("Interest rate, contribution growth and initial balance must be non-negative.")
+        months = self.project_months_to_target(
+            self.calculate_savings(), target_savings, annual_rate, compounding, contribution_growth, initial_balance
+        )
+        if np.isnan(months):
+            raise ValueError("Monthly savings must be greater than zero to reach the target.")
+        return float(months)
+
+    def balance_path(self, annual_rate, compounding="monthly", contribution_growth=0.0, initial_balance=0.0,
+                     months=None):
+        """
+        Lazily yield the projected balance at the end of each month.
+        :param annual_rate: Nominal annual interest rate (in percentage, e.g. 5 for 5%).
+        :param compounding: One of the COMPOUNDING keys (default "monthly").
+        :param contribution_growth: Annual growth rate of the monthly savings (in percentage, default 0).
+        :param initial_balance: Starting balance (default 0).
+        :param months: Number of months to yield (optional, endless by default).
+        :return: Generator of (month, balance) pairs, starting at month 1.
+        """
+        rate = float(monthly_rate(annual_rate, compounding))
+        growth = math.expm1(math.log1p(contribution_growth / 100) / 12)
+        balance = initial_balance
+        contribution = self.calculate_savings()
+        month = 0
+        while months is None or month < months:
+            month += 1
+            balance = balance * (1 + rate) + contribution
+            contribution *= 1 + growth
+            yield month, balance
@@ -0,0 +1,265 @@
+import heapq
+import itertools
+import math
+import random
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    KLL-style quantile sketch over a stream of numbers.
+
+    Values are kept in a stack of compactors; when a level fills up it is sorted
+    and every other item is promoted to the next level with double weight. Memory
+    stays around k * log(n / k) values, updates cost amortized O(log k), and the
+    rank error is roughly 1.7 / k with high probability. Sketches built on
+    different partitions or time windows can be merged.
+    """
+
+    def __init__(self, k=200, seed=None):
+        """
+        Initialize an empty sketch.
+        :param k: Accuracy parameter; larger values use more memory and give tighter quantiles.
+        :param seed: Seed for the random compaction offsets (optional).
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8.")
+        self.k = k
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._levels = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level):
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append([])
+                items.sort()
+                keep = [items.pop()] if len(items) % 2 else []
+                self._levels[level + 1].extend(items[self._rng.randint(0, 1)::2])
+                self._levels[level] = keep
+            level += 1
+
+    def update(self, value):
+        """
+        Add one value to the sketch.
+        :param value: The value to add.
+        """
+        value = float(value)
+        self._levels[0].append(value)
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def update_many(self, values):
+        """
+        Add an array of values to the sketch.
+        :param values: Iterable or array of values.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        self.count += len(values)
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        step = self._capacity(0)
+        for start in range(0, len(values), step):
+            self._levels[0].extend(values[start:start + step].tolist())
+            self._compress()
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one.
+        :param other: A QuantileSketch built with any k.
+        """
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted(self):
+        values = []
+        weights = []
+        for level, items in enumerate(self._levels):
+            values.extend(items)
+            weights.extend([1 << level] * len(items))
+        order = np.argsort(values, kind="stable")
+        return np.asarray(values)[order], np.cumsum(np.asarray(weights)[order])
+
+    def quantile(self, q):
+        """
+        Estimate the value at quantile q.
+        :param q: Quantile between 0 and 1, e.g. 0.5 for the median.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1.")
+        if self.count == 0:
+            raise ValueError("Sketch is empty.")
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        values, cumulative = self._weighted()
+        index = int(np.searchsorted(cumulative, q * cumulative[-1]))
+        return float(values[min(index, len(values) - 1)])
+
+    def rank(self, value):
+        """
+        Estimate the fraction of values less than or equal to `value`.
+        :param value: The value to rank.
+        """
+        if self.count == 0:
+            raise ValueError("Sketch is empty.")
+        values, cumulative = self._weighted()
+        index = int(np.searchsorted(values, value, side="right"))
+        return float(cumulative[index - 1] / cumulative[-1]) if index else 0.0
+
+    @property
+    def size(self):
+        """
+        Number of values retained by the sketch.
+        """
+        return sum(len(items) for items in self._levels)
+
+
+class HeavyHitters:
+    """
+    Weighted Misra-Gries summary for the top keys of a stream.
+
+    At most `capacity` counters are kept. Each estimate undercounts the true
+    weight of its key by at most total_weight / (capacity + 1), so every key
+    above that share of the stream is guaranteed to be reported. Summaries can
+    be merged.
+
+    Counters are stored relative to a shared offset, so decrementing every
+    counter when a new key arrives on a full summary is a single addition, and
+    the counters that drop to zero are popped from a min-heap. Updating an
+    existing key is O(log capacity) and any update is amortized O(log capacity);
+    weighted updates cannot be O(1) because the smallest counter has to be found.
+    """
+
+    def __init__(self, capacity=50):
+        """
+        Initialize an empty summary.
+        :param capacity: Maximum number of counters kept.
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be greater than zero.")
+        self.capacity = capacity
+        self.total = 0
+        self._counters = {}
+        self._offset = 0
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def _push(self, key):
+        """
+        Record the current counter of a key in the heap; older entries for it become stale.
+        Once stale entries outnumber the live ones the heap is rebuilt, which also folds
+        the offset back into the counters.
+        """
+        if len(self._heap) >= 2 * self.capacity + 16:
+            for existing in self._counters:
+                self._counters[existing] -= self._offset
+            self._offset = 0
+            self._heap = [(raw, next(self._sequence), existing) for existing, raw in self._counters.items()]
+            heapq.heapify(self._heap)
+        else:
+            heapq.heappush(self._heap, (self._counters[key], next(self._sequence), key))
+
+    def _smallest(self):
+        """
+        Drop stale heap entries and return the live entry of the smallest counter.
+        """
+        heap = self._heap
+        counters = self._counters
+        while counters.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def update(self, key, weight=1):
+        """
+        Add weight to a key.
+        :param key: The key, e.g. a merchant name.
+        :param weight: The weight to add, e.g. an amount (default 1).
+        """
+        if weight <= 0:
+            raise ValueError("Weight must be greater than zero.")
+        self.total += weight
+        counters = self._counters
+        if key in counters:
+            counters[key] += weight
+            self._push(key)
+            return
+        if len(counters) < self.capacity:
+            counters[key] = self._offset + weight
+            self._push(key)
+            return
+        decrement = min(weight, self._smallest()[0] - self._offset)
+        self._offset += decrement
+        while counters and self._smallest()[0] <= self._offset:
+            _, _, existing = heapq.heappop(self._heap)
+            del counters[existing]
+        if weight > decrement:
+            counters[key] = self._offset + weight - decrement
+            self._push(key)
+
+    def _estimates(self):
+        """
+        Current estimate of every tracked key.
+        """
+        offset = self._offset
+        return {key: raw - offset for key, raw in self._counters.items()}
+
+    def merge(self, other):
+        """
+        Fold another summary into this one.
+        :param other: A HeavyHitters summary.
+        """
+        counters = self._estimates()
+        for key, weight in other._estimates().items():
+            counters[key] = counters.get(key, 0) + weight
+        if len(counters) > self.capacity:
+            cutoff = sorted(counters.values(), reverse=True)[self.capacity]
+            counters = {key: weight - cutoff for key, weight in counters.items() if weight > cutoff}
+        self._counters = counters
+        self._offset = 0
+        self._heap = [(weight, next(self._sequence), key) for key, weight in counters.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+        return self
+
+    def top(self, n=10):
+        """
+        Return up to n (key, estimated weight) pairs, heaviest first.
+        :param n: Number of keys to return.
+        """
+        return sorted(self._estimates().items(), key=lambda item: item[1], reverse=True)[:n]
+
+    @property
+    def error_bound(self):
+        """
+        Maximum amount by which any estimate can undercount its key.
+        """
+        return self.total / (self.capacity + 1)
@@ -0,0 +1,98 @@
+import random
+import unittest
+from datetime import date, timedelta
+from finegist.anomaly_detector import RunningStats, SpendAnomalyDetector
+from finegist.expense_tracker import ExpenseTracker
+
+class TestRunningStats(unittest.TestCase):
+    def test_mean_and_variance(self):
+        """
+        Test the running mean and sample variance.
+        """
+        stats = RunningStats()
+        for value in (2, 4, 4, 4, 5, 5, 7, 9):
+            stats.update(value)
+        self.assertAlmostEqual(stats.mean, 5)
+        self.assertAlmostEqual(stats.variance, 32 / 7)
+        self.assertIsNone(RunningStats().z_score(1))
+
+    def test_ewma(self):
+        """
+        Test that the EWMA tracks recent values.
+        """
+        stats = RunningStats(alpha=0.5)
+        for value in (10, 10, 20, 20):
+            stats.update(value)
+        self.assertAlmostEqual(stats.ewma, 17.5)
+        self.assertGreater(stats.ewm_variance, 0)
+
+class TestSpendAnomalyDetector(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a steady stream of coffee purchases for testing.
+        """
+        rng = random.Random(3)
+        start = date(2025, 1, 1)
+        self.expenses = [
+            {"description": "Coffee", "amount": round(rng.uniform(4, 6), 2), "date": start + timedelta(days=i)}
+            for i in range(140)
+        ]
+
+    def test_flags_outlier(self):
+        """
+        Test that a single unusually large expense is flagged.
+        """
+        flagged = []
+        detector = SpendAnomalyDetector(min_samples=10, callback=flagged.append)
+        self.assertEqual(list(detector.stream(self.expenses)), [])
+        outlier = {"description": "Coffee", "amount": 40, "date": date(2025, 6, 4)}
+        record = detector.observe(outlier)
+        self.assertIs(record["expense"], outlier)
+        self.assertEqual({reason["group"] for reason in record["reasons"]}, {("description", "Coffee"), ("weekday", 2)})
+        self.assertEqual(flagged, [record])
+
+    def test_min_samples(self):
+        """
+        Test that groups with too little history never flag.
+        """
+        detector = SpendAnomalyDetector(min_samples=10)
+        for expense in self.expenses[:5]:
+            detector.observe(expense)
+        self.assertIsNone(detector.observe({"description": "Coffee", "amount": 500, "date": None}))
+
+    def test_group_by_tags_with_ewma(self):
+        """
+        Test grouping by tags and scoring against the EWMA.
+        """
+        detector = SpendAnomalyDetector(alpha=0.2, group_by="tags")
+        for expense in self.expenses:
+            detector.observe(dict(expense, tags=("food",)))
+        record = detector.observe({"description": "Steakhouse", "amount": 60, "date": None, "tags": ("food",)})
+        self.assertEqual(len(record["reasons"]), 2)
+        self.assertIn("ewma_z_score", record["reasons"][1])
+
+    def test_inline_with_tracker(self):
+        """
+        Test screening expenses inline as they are added to a tracker.
+        """
+        flagged = []
+        tracker = ExpenseTracker(columnar=True)
+        tracker.add_listener(SpendAnomalyDetector(min_samples=10, callback=flagged.append).observe)
+        tracker.add_expenses_bulk(self.expenses)
+        tracker.add_expense("Coffee", 45, date(2025, 6, 4))
+        self.assertEqual(len(flagged), 1)
+        self.assertEqual(flagged[0]["expense"]["amount"], 45)
+
+    def test_invalid_configuration(self):
+        """
+        Test rejecting invalid settings.
+        """
+        with self.assertRaises(ValueError):
+            SpendAnomalyDetector(threshold=0)
+        with self.assertRaises(ValueError):
+            SpendAnomalyDetector(alpha=1.5)
+        with self.assertRaises(ValueError):
+            SpendAnomalyDetector(group_by="merchant")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import os
+import tempfile
 import unittest
-from finegist.budget import Budget
+from datetime import date, datetime
+from finegist.budget import Budget, EnvelopeBudget
+from finegist.columnar_store import BulkValidationError
 
 class TestBudget(unittest.TestCase):
     def setUp(self):  # Perbaikan: Ubah "setup" menjadi "setUp"
@@ -44,5 +48,174 @@ class TestBudget(unittest.TestCase):
         self.assertEqual(summary["total_expenses"], 3500)
         self.assertEqual(summary["remaining_budget"], 1500)
 
+    def test_running_totals(self):
+        """
+        Test that the running totals match the recorded expenses.
+        """
+        for amount in (100, 250, 400):
+            self.budget.add_expense("Item", amount)
+        self.assertEqual(self.budget.total_expenses(), sum(e["amount"] for e in self.budget.expenses))
+        self.assertEqual(self.budget.remaining_budget(), 4250)
+        self.assertEqual(self.budget.summary()["remaining_budget"], 4250)
+
+    def test_add_expenses_bulk(self):
+        """
+        Test adding a batch of expenses to the budget.
+        """
+        added = self.budget.add_expenses_bulk([("Groceries", 1500), {"description": "Rent", "amount": 2000}])
+        self.assertEqual(added, 2)
+        self.assertEqual(self.budget.expenses[1]["description"], "Rent")
+        self.assertEqual(self.budget.remaining_budget(), 1500)
+
+    def test_add_expenses_bulk_exceeding_budget(self):
+        """
+        Test that all rows exceeding the budget are reported together.
+        """
+        with self.assertRaises(BulkValidationError) as context:
+            self.budget.add_expenses_bulk(descriptions=["A", "B", "C"], amounts=[6000, 10, 7000])
+        self.assertEqual(context.exception.rows, [0, 2])
+        self.assertEqual(self.budget.expenses, [])
+
+    def test_add_expenses_bulk_invalid_rows(self):
+        """
+        Test that invalid amounts and dates are rejected before anything is stored.
+        """
+        with self.assertRaises(BulkValidationError) as context:
+            self.budget.add_expenses_bulk([("a", float("nan"), "garbage"), ("b", 5, 12345), ("c", 0), ("d", 5)])
+        self.assertEqual(context.exception.rows, [0, 1, 2])
+        self.assertEqual(self.budget.expenses, [])
+        self.assertEqual(self.budget.total_expenses(), 0)
+        with self.assertRaises(ValueError):
+            self.budget.add_expense("e", 5, "2025-01-01")
+
+class TestBudgetCompaction(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a budget with expenses spread over three months.
+        """
+        self.budget = Budget("Household", 100000, compaction_period="month")
+        for day in range(1, 29):
+            for month in (1, 2, 3):
+                self.budget.add_expense("Groceries", 10 + day, date(2025, month, day))
+
+    def test_compact(self):
+        """
+        Test that old expenses are folded into one record per month without changing totals.
+        """
+        total = self.budget.total_expenses()
+        folded = self.budget.compact(before=date(2025, 3, 1))
+        self.assertEqual(folded, 56)
+        self.assertEqual(len(self.budget.expenses), 2 + 28)
+        january = self.budget.expenses[0]
+        self.assertEqual((january["date"], january["count"]), (date(2025, 1, 1), 28))
+        self.assertEqual(january["amount"], sum(10 + day for day in range(1, 29)))
+        self.assertEqual(self.budget.total_expenses(), total)
+        self.assertEqual(self.budget.compact(before=date(2025, 3, 1)), 0)
+        self.assertEqual(len(self.budget.expenses), 30)
+
+    def test_compact_merges_aggregates(self):
+        """
+        Test that compacting again merges new rows into existing aggregates.
+        """
+        self.budget.compact(before=date(2025, 2, 15))
+        self.budget.compact(before=date(2025, 4, 1))
+        self.assertEqual([e["count"] for e in self.budget.expenses], [28, 28, 28])
+
+    def test_archive(self):
+        """
+        Test that compacted expenses are appended to the archive file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "archive.jsonl")
+            self.budget.compact(before=date(2025, 2, 1), archive_path=path)
+            self.budget.compact(before=date(2025, 3, 1), archive_path=path)
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), 56)
+        self.assertIn('"2025-02-28"', lines[-1])
+
+    def test_compact_datetime_dates(self):
+        """
+        Test that expenses and cutoffs given as datetimes are compacted by their day.
+        """
+        budget = Budget("Travel", 10 ** 6)
+        budget.add_expense("Taxi", 5.0, datetime(2025, 1, 3, 8, 30))
+        budget.add_expenses_bulk(descriptions=["Train", "Hotel"], amounts=[7.0, 90.0],
+                                 dates=[datetime(2025, 1, 4, 9), date(2025, 2, 2)])
+        self.assertEqual(budget.expenses[0]["date"], date(2025, 1, 3))
+        self.assertEqual(budget.compact(before=datetime(2025, 2, 1, 12)), 2)
+        self.assertEqual([e["date"] for e in budget.expenses], [date(2025, 1, 1), date(2025, 2, 2)])
+
+    def test_retention(self):
+        """
+        Test that a budget with a retention period compacts itself as it grows.
+        """
+        budget = Budget("Streaming", 10 ** 9, retention_days=30)
+        budget.add_expenses_bulk(descriptions=["Old"] * 5000, amounts=[1.0] * 5000, dates=date(2020, 1, 1))
+        budget.add_expense("Recent", 2.0)
+        self.assertLess(len(budget.expenses), 10)
+        self.assertEqual(budget.total_expenses(), 5002.0)
+        with self.assertRaises(ValueError):
+            Budget("Plain", 100).compact()
+
+class TestEnvelopeBudget(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a household budget tree for testing.
+        """
+        self.household = EnvelopeBudget("Household", 5000)
+        self.food = self.household.add_envelope("Food", 1000)
+        self.groceries = self.food.add_envelope("Groceries", 600)
+        self.dining = self.food.add_envelope("Dining", 300)
+        self.rent = self.household.add_envelope("Rent", 2000)
+
+    def test_roll_up(self):
+        """
+        Test that leaf expenses update every ancestor.
+        """
+        self.groceries.add_expense("Market", 200)
+        self.dining.add_expenses_bulk([("Pizza", 40), ("Sushi", 60)])
+        self.rent.add_expense("May rent", 1800)
+        self.assertEqual(self.groceries.remaining_budget(), 400)
+        self.assertEqual(self.food.total_expenses(), 300)
+        self.assertEqual(self.food.remaining_budget(), 700)
+        self.assertEqual(self.household.total_expenses(), 2100)
+        self.assertEqual(self.household.expenses, [])
+
+    def test_lookup(self):
+        """
+        Test finding envelopes by path.
+        """
+        self.assertIs(self.household.envelope("Food", "Groceries"), self.groceries)
+        self.assertEqual([node.name for node in self.groceries.ancestors()], ["Food", "Household"])
+        with self.assertRaises(ValueError):
+            self.household.envelope("Travel")
+        with self.assertRaises(ValueError):
+            self.household.add_envelope("Food", 10)
+
+    def test_ancestor_limits(self):
+        """
+        Test that an expense larger than any ancestor's allocation is rejected everywhere.
+        """
+        leaf = self.groceries.add_envelope("Organic", 5000)
+        with self.assertRaises(ValueError):
+            leaf.add_expense("Hamper", 1500)
+        with self.assertRaises(ValueError):
+            leaf.add_expenses_bulk(descriptions=["Hamper"], amounts=[1500])
+        self.assertEqual(self.household.total_expenses(), 0)
+
+    def test_tree_summary(self):
+        """
+        Test the summary of the whole tree.
+        """
+        self.groceries.add_expense("Market", 500)
+        self.food.add_expense("Snacks", 550)
+        summary = self.household.tree_summary()
+        self.assertEqual(summary["total_expenses"], 1050)
+        food = summary["envelopes"][0]
+        self.assertEqual((food["name"], food["remaining_budget"]), ("Food", -50))
+        self.assertEqual(food["envelopes"][0]["total_expenses"], 500)
+        self.assertEqual(self.household.over_budget(), [self.food])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
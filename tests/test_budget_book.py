@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from finegist.budget import Budget
+from finegist.budget_book import BudgetBook
+from finegist.columnar_store import BulkValidationError
+
+class TestBudgetBook(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a book with a few budgets for testing.
+        """
+        self.book = BudgetBook(capacity=2)
+        self.book.add_budgets([10, 20, 30], ["Alice", "Bob", "Carol"], [1000, 500, 200])
+
+    def test_apply_expenses(self):
+        """
+        Test applying a batch of expenses keyed by budget id.
+        """
+        self.book.apply_expenses(np.array([10, 20, 10, 30]), [300, 450, 400, 200])
+        self.book.add_expense(30, 50)
+        self.assertEqual(self.book.spent_amounts.tolist(), [700, 450, 250])
+        self.assertEqual(self.book.remaining_budgets().tolist(), [300, 50, -50])
+        self.assertEqual(self.book.summary(20), {"name": "Bob", "total_amount": 500, "total_expenses": 450, "remaining_budget": 50})
+
+    def test_over_and_near_limit(self):
+        """
+        Test finding budgets over or near their limit.
+        """
+        self.book.apply_expenses([10, 20, 30, 30], [100, 460, 150, 100])
+        self.assertEqual(self.book.over_budget(), [30])
+        self.assertEqual(self.book.near_limit(0.9), [20, 30])
+
+    def test_invalid_expenses(self):
+        """
+        Test that unknown ids and oversize expenses are reported before anything is applied.
+        """
+        with self.assertRaises(BulkValidationError) as context:
+            self.book.apply_expenses([10, 99, 20, 98], [1, 1, 1, 1])
+        self.assertEqual(context.exception.rows, [1, 3])
+        with self.assertRaises(BulkValidationError) as context:
+            self.book.apply_expenses(np.array([10, 20]), [10, 600])
+        self.assertEqual(context.exception.rows, [1])
+        self.assertEqual(self.book.spent_amounts.tolist(), [0, 0, 0])
+
+    def test_duplicate_ids(self):
+        """
+        Test rejecting duplicate budget ids.
+        """
+        with self.assertRaises(BulkValidationError) as context:
+            self.book.add_budgets([40, 10, 40], ["D", "A", "D"], [1, 1, 1])
+        self.assertEqual(context.exception.rows, [1, 2])
+        self.assertEqual(len(self.book), 3)
+
+    def test_summaries(self):
+        """
+        Test batch summaries as columns.
+        """
+        self.book.apply_expenses([20], [100])
+        summaries = self.book.summaries([20, 30])
+        self.assertEqual(summaries["name"], ["Bob", "Carol"])
+        self.assertEqual(summaries["remaining_budget"].tolist(), [400, 200])
+        self.assertEqual(len(self.book.summaries()["id"]), 3)
+
+    def test_string_ids_and_from_budgets(self):
+        """
+        Test building a book from Budget objects and using non-integer ids.
+        """
+        budget = Budget("Monthly", 5000)
+        budget.add_expense("Rent", 2000)
+        book = BudgetBook.from_budgets([budget, Budget("Travel", 800)])
+        self.assertEqual(book.summary(0)["remaining_budget"], 3000)
+        book.add_budget("team-a", "Team A", 100)
+        book.apply_expenses(["team-a", 1], [100, 50])
+        self.assertEqual(book.near_limit(1.0), ["team-a"])
+        self.assertIn("team-a", book)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from datetime import date
+import numpy as np
+from finegist.calendar_periods import PERIOD_SPAN, PERIODS, period_start, period_starts
+
+class TestCalendarPeriods(unittest.TestCase):
+    def test_period_start(self):
+        """
+        Test the first day of the period containing a date.
+        """
+        day = date(2024, 5, 17).toordinal()
+        self.assertEqual(date.fromordinal(period_start(day, "week")), date(2024, 5, 13))
+        self.assertEqual(date.fromordinal(period_start(day, "month")), date(2024, 5, 1))
+        self.assertEqual(date.fromordinal(period_start(day, "quarter")), date(2024, 4, 1))
+        self.assertEqual(date.fromordinal(period_start(day, "year")), date(2024, 1, 1))
+
+    def test_period_starts_matches_period_start(self):
+        """
+        Test that the vectorized version agrees with the scalar one over several years.
+        """
+        ordinals = np.arange(date(2023, 12, 1).toordinal(), date(2026, 2, 1).toordinal())
+        for period in PERIODS:
+            expected = [period_start(ordinal, period) for ordinal in ordinals.tolist()]
+            self.assertEqual(period_starts(ordinals, period).tolist(), expected)
+
+    def test_period_span_reaches_next_period(self):
+        """
+        Test that adding the span to a period start lands in the following period.
+        """
+        start = date(2024, 1, 1).toordinal()
+        for period in PERIODS:
+            following = period_start(start + PERIOD_SPAN[period], period)
+            self.assertGreater(following, start)
+            self.assertEqual(period_start(following - 1, period), start)
+
+if __name__ == "__main__":
+    unittest.main()
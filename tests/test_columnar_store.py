@@ -0,0 +1,76 @@
+import unittest
+from datetime import date
+import numpy as np
+from finegist.columnar_store import BulkValidationError, ColumnarExpenseStore, batch_columns, batch_ordinals
+
+class TestColumnarExpenseStore(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a small store for testing.
+        """
+        self.store = ColumnarExpenseStore(capacity=2)
+
+    def test_append_and_index(self):
+        """
+        Test appending rows and reading them back as dicts.
+        """
+        self.store.append({"description": "Rent", "amount": 1500, "date": date(2025, 1, 1)})
+        self.store.append({"description": "Lunch", "amount": 12.5, "date": date(2025, 1, 2)})
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store[0], {"description": "Rent", "amount": 1500.0, "date": date(2025, 1, 1)})
+        self.assertEqual(self.store[-1]["description"], "Lunch")
+        self.assertEqual(len(self.store[0:2]), 2)
+        with self.assertRaises(IndexError):
+            self.store[2]
+
+    def test_growth_and_interning(self):
+        """
+        Test that the arrays grow past their capacity and descriptions are interned.
+        """
+        for day in range(1, 11):
+            self.store.append({"description": "Coffee", "amount": day, "date": date(2025, 1, day)})
+        self.assertEqual(len(self.store), 10)
+        self.assertEqual(self.store.descriptions, ["Coffee"])
+        self.assertEqual(list(self.store.description_ids), [0] * 10)
+        self.assertEqual(float(self.store.amounts.sum()), 55)
+        self.assertEqual(self.store.nbytes, 10 * 16)
+
+    def test_columns_are_read_only(self):
+        """
+        Test that the exposed column views cannot be modified.
+        """
+        self.store.append({"description": "A", "amount": 10, "date": date(2025, 1, 2)})
+        with self.assertRaises(ValueError):
+            self.store.amounts[0] = 1
+
+    def test_extend(self):
+        """
+        Test appending a batch of columns.
+        """
+        self.store.extend(["A", "B", "A"], np.array([1.0, 2.0, 3.0]), np.array([date(2025, 1, 1).toordinal()] * 3))
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.descriptions, ["A", "B"])
+        self.assertEqual(self.store[2]["amount"], 3.0)
+
+    def test_batch_columns_rejects_non_numeric(self):
+        """
+        Test that non-numeric amounts are reported by row.
+        """
+        with self.assertRaises(BulkValidationError) as context:
+            batch_columns([("A", 1), ("B", "x"), ("C", None)])
+        self.assertEqual(context.exception.rows, [1, 2])
+
+    def test_batch_ordinals(self):
+        """
+        Test converting dates of a batch to ordinals.
+        """
+        default = date(2025, 1, 1)
+        ordinals, invalid = batch_ordinals([None, date(2025, 1, 2), "bad"], 3, default)
+        self.assertEqual(ordinals[:2].tolist(), [default.toordinal(), default.toordinal() + 1])
+        self.assertEqual(invalid.tolist(), [False, False, True])
+        ordinals, invalid = batch_ordinals(np.array(["2025-01-01", "NaT"], dtype="datetime64[D]"), 2, default)
+        self.assertEqual(ordinals[0], default.toordinal())
+        self.assertEqual(invalid.tolist(), [False, True])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from finegist.cost_basis import CostBasisLedger
+from finegist.investment_portfolio import InvestmentPortfolio
+
+class TestCostBasisLedger(unittest.TestCase):
+    def trade(self, method):
+        """
+        Build a ledger with two buys and a sale spanning both lots.
+        """
+        ledger = CostBasisLedger(method)
+        ledger.buy("ABC", 10, 100)
+        ledger.buy("ABC", 10, 200)
+        result = ledger.sell("ABC", 15, 250)
+        return ledger, result
+
+    def test_fifo(self):
+        """
+        Test that FIFO consumes the oldest lots first.
+        """
+        ledger, result = self.trade("fifo")
+        self.assertEqual(result["cost"], 10 * 100 + 5 * 200)
+        self.assertEqual(result["realized"], 15 * 250 - 2000)
+        self.assertEqual(ledger.lots("ABC"), [{"quantity": 5, "unit_cost": 200, "date": None}])
+
+    def test_lifo(self):
+        """
+        Test that LIFO consumes the newest lots first.
+        """
+        ledger, result = self.trade("lifo")
+        self.assertEqual(result["cost"], 10 * 200 + 5 * 100)
+        self.assertEqual(ledger.cost_basis("ABC"), 500)
+
+    def test_average(self):
+        """
+        Test that average cost keeps one merged lot.
+        """
+        ledger, result = self.trade("average")
+        self.assertEqual(result["cost"], 15 * 150)
+        self.assertEqual(len(ledger.lots("ABC")), 1)
+        self.assertEqual(ledger.cost_basis("ABC"), 750)
+        ledger.buy("ABC", 5, 50)
+        self.assertEqual(ledger.lots("ABC")[0]["unit_cost"], 100)
+
+    def test_report(self):
+        """
+        Test realized and unrealized P&L from running totals.
+        """
+        ledger, _ = self.trade("fifo")
+        ledger.buy("XYZ", 4, 25)
+        report = ledger.report({"ABC": 300})
+        self.assertEqual(report["positions"]["ABC"]["unrealized"], 5 * 300 - 1000)
+        self.assertIsNone(report["positions"]["XYZ"]["unrealized"])
+        self.assertEqual(report["realized"], 1750)
+        self.assertEqual(ledger.realized_gain(), 1750)
+
+    def test_record_trades(self):
+        """
+        Test streaming a long trade history.
+        """
+        ledger = CostBasisLedger()
+        trades = ((("ABC", "buy", 1, i), ("ABC", "sell", 1, i + 1)) for i in range(1, 10001))
+        count = ledger.record_trades(trade for pair in trades for trade in pair)
+        self.assertEqual(count, 20000)
+        self.assertEqual(ledger.quantity("ABC"), 0)
+        self.assertEqual(ledger.realized_gain("ABC"), 10000)
+        ledger.record_trades([{"symbol": "XYZ", "side": "buy", "quantity": 2, "price": 5}])
+        self.assertEqual(ledger.cost_basis("XYZ"), 10)
+
+    def test_invalid_trades(self):
+        """
+        Test that invalid trades are rejected.
+        """
+        ledger = CostBasisLedger()
+        ledger.buy("ABC", 1, 10)
+        with self.assertRaises(ValueError):
+            ledger.sell("ABC", 2, 10)
+        with self.assertRaises(ValueError):
+            ledger.sell("XYZ", 1, 10)
+        with self.assertRaises(ValueError):
+            ledger.record_trades([("ABC", "hold", 1, 10)])
+        with self.assertRaises(ValueError):
+            CostBasisLedger("hifo")
+
+    def test_portfolio_trades(self):
+        """
+        Test that portfolio buys and sells keep holdings in step with the lots.
+        """
+        portfolio = InvestmentPortfolio(cost_basis="fifo")
+        portfolio.buy("ABC", 10, 100)
+        portfolio.buy("ABC", 10, 200)
+        result = portfolio.sell("ABC", 15, 250)
+        self.assertEqual(result["realized"], 1750)
+        holding = portfolio.holding("ABC")
+        self.assertEqual((holding["quantity"], holding["amount"], holding["current_value"]), (5, 1000, 1250))
+        self.assertEqual(portfolio.total_invested(), 1000)
+        self.assertEqual(portfolio.pnl_report()["unrealized"], 250)
+        portfolio.sell("ABC", 5, 100)
+        self.assertEqual(portfolio.investments, [])
+        self.assertEqual(portfolio.ledger.realized_gain(), 1750 - 500)
+
+    def test_rejected_portfolio_trades_leave_ledger_unchanged(self):
+        """
+        Test that trades the portfolio rejects are not recorded in the ledger.
+        """
+        portfolio = InvestmentPortfolio()
+        with self.assertRaises(ValueError):
+            portfolio.buy("Z", 1, 0)
+        self.assertEqual(portfolio.ledger.lots("Z"), [])
+        portfolio.buy("A", 10, 1)
+        portfolio.update_investment("A", amount=5)
+        with self.assertRaises(ValueError):
+            portfolio.sell("A", 5, 1)
+        with self.assertRaises(ValueError):
+            portfolio.sell("A", 5, 0)
+        self.assertEqual(portfolio.ledger.quantity("A"), 10)
+        self.assertEqual(portfolio.ledger.realized_gain(), 0)
+        self.assertEqual(portfolio.ledger.trade_count, 1)
+
+    def test_removed_holding_drops_lots(self):
+        """
+        Test that removing a holding discards its lots, so a later position starts afresh.
+        """
+        portfolio = InvestmentPortfolio()
+        portfolio.buy("A", 10, 100)
+        portfolio.remove_investment("A")
+        portfolio.buy("A", 5, 200)
+        self.assertEqual(portfolio.sell("A", 5, 200)["realized"], 0)
+        report = portfolio.ledger.report()["positions"]["A"]
+        self.assertEqual((report["quantity"], report["cost_basis"]), (0, 0))
+
+    def test_sell_requires_cost_basis(self):
+        """
+        Test that units added without a purchase cannot be sold by quantity.
+        """
+        portfolio = InvestmentPortfolio()
+        portfolio.add_investment("A", 1000, 1000, quantity=10)
+        with self.assertRaisesRegex(ValueError, "cost basis"):
+            portfolio.sell("A", 5, 100)
+        self.assertEqual(portfolio.holding("A")["quantity"], 10)
+
+    def test_sale_cost(self):
+        """
+        Test previewing the cost of a sale without consuming lots.
+        """
+        for method, expected in (("fifo", 2000), ("lifo", 2500), ("average", 2250)):
+            ledger = CostBasisLedger(method)
+            ledger.buy("ABC", 10, 100)
+            ledger.buy("ABC", 10, 200)
+            self.assertAlmostEqual(ledger.sale_cost("ABC", 15), expected)
+            self.assertAlmostEqual(ledger.sell("ABC", 15, 300)["cost"], expected)
+
+if __name__ == "__main__":
+    unittest.main()
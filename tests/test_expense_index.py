@@ -0,0 +1,51 @@
+import unittest
+from finegist.expense_index import ExpenseSearchIndex, intersect_postings, tokenize
+
+class TestExpenseSearchIndex(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up an index with a few expenses for testing.
+        """
+        self.index = ExpenseSearchIndex()
+        self.index.add(0, "Starbucks Coffee", ["Food"])
+        self.index.add(1, "Shell fuel station", ["car"])
+        self.index.add_many(2, ["coffee beans", "Star-Market"], [["food"], []])
+
+    def test_tokenize(self):
+        """
+        Test splitting descriptions into lowercase words.
+        """
+        self.assertEqual(tokenize("Star-Market #12"), ["star", "market", "12"])
+
+    def test_keyword(self):
+        """
+        Test matching every word of a keyword query.
+        """
+        self.assertEqual(self.index.keyword("coffee"), [0, 2])
+        self.assertEqual(self.index.keyword("COFFEE beans"), [2])
+        self.assertEqual(self.index.keyword("tea"), [])
+        self.assertEqual(self.index.keyword(""), [])
+
+    def test_prefix(self):
+        """
+        Test matching words by prefix.
+        """
+        self.assertEqual(self.index.prefix("sta"), [0, 1, 3])
+        self.assertEqual(self.index.prefix("zzz"), [])
+
+    def test_tags(self):
+        """
+        Test tag lookups and tag counts.
+        """
+        self.assertEqual(self.index.tag(" food "), [0, 2])
+        self.assertEqual(self.index.tags(), {"food": 2, "car": 1})
+
+    def test_intersect_postings(self):
+        """
+        Test intersecting sorted posting lists.
+        """
+        self.assertEqual(intersect_postings([[1, 3, 5, 7], [3, 7, 9], [0, 3, 7]]), [3, 7])
+        self.assertEqual(intersect_postings([[1, 2], []]), [])
+
+if __name__ == "__main__":
+    unittest.main()
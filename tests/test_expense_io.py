@@ -0,0 +1,106 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from finegist.expense_io import (
+    batched,
+    read_expenses_csv,
+    read_expenses_jsonl,
+    summarize_expenses,
+    write_expenses_csv,
+    write_expenses_jsonl,
+)
+from finegist.columnar_store import BulkValidationError
+from finegist.expense_tracker import ExpenseTracker
+
+class TestExpenseIO(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a tracker with a few expenses for testing.
+        """
+        self.tracker = ExpenseTracker()
+        self.tracker.add_expense("Lunch", 50, date(2025, 5, 1))
+        self.tracker.add_expense("Dinner, late", 100, date(2025, 5, 2))
+        self.tracker.add_expense("Coffee", 5, date(2025, 5, 1))
+
+    def test_csv_round_trip(self):
+        """
+        Test writing expenses to CSV and reading them back.
+        """
+        buffer = io.StringIO()
+        self.assertEqual(write_expenses_csv(self.tracker.expenses, buffer), 3)
+        buffer.seek(0)
+        rows = list(read_expenses_csv(buffer))
+        self.assertEqual(rows[1], {"description": "Dinner, late", "amount": 100.0, "date": date(2025, 5, 2)})
+        self.assertEqual(len(rows), 3)
+
+    def test_jsonl_round_trip_with_path(self):
+        """
+        Test writing expenses to a JSONL file and reading them back.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "expenses.jsonl")
+            write_expenses_jsonl(self.tracker.expenses, path)
+            rows = list(read_expenses_jsonl(path))
+        self.assertEqual([row["description"] for row in rows], ["Lunch", "Dinner, late", "Coffee"])
+        self.assertEqual(rows[2]["date"], date(2025, 5, 1))
+
+    def test_readers_are_lazy(self):
+        """
+        Test that readers yield rows before the whole input is parsed.
+        """
+        buffer = io.StringIO("description,amount,date\nLunch,50,2025-05-01\nBad,oops,2025-05-01\n")
+        rows = read_expenses_csv(buffer)
+        self.assertEqual(next(rows)["description"], "Lunch")
+        with self.assertRaises(ValueError):
+            next(rows)
+
+    def test_missing_columns(self):
+        """
+        Test that a CSV without the required columns is rejected.
+        """
+        with self.assertRaises(ValueError):
+            list(read_expenses_csv(io.StringIO("name,value\nLunch,50\n")))
+
+    def test_summarize_stream(self):
+        """
+        Test aggregating a stream without loading it into a tracker.
+        """
+        buffer = io.StringIO()
+        write_expenses_jsonl(self.tracker.expenses, buffer)
+        buffer.seek(0)
+        self.assertEqual(summarize_expenses(read_expenses_jsonl(buffer)), self.tracker.summary())
+
+    def test_import_expenses(self):
+        """
+        Test importing a stream into a tracker in batches.
+        """
+        buffer = io.StringIO()
+        write_expenses_csv(self.tracker.expenses, buffer)
+        buffer.seek(0)
+        tracker = ExpenseTracker(columnar=True)
+        self.assertEqual(tracker.import_expenses(read_expenses_csv(buffer), batch_size=2), 3)
+        self.assertEqual(tracker.summary(), self.tracker.summary())
+
+    def test_import_expenses_reports_stream_rows(self):
+        """
+        Test that a rejected batch reports rows by their position in the whole stream.
+        """
+        tracker = ExpenseTracker()
+        rows = [("A", 1), ("B", 2), ("C", 3), ("D", -4)]
+        with self.assertRaises(BulkValidationError) as context:
+            tracker.import_expenses(rows, batch_size=2)
+        self.assertEqual(context.exception.rows, [3])
+        self.assertEqual(len(tracker.expenses), 2)
+
+    def test_batched(self):
+        """
+        Test grouping rows into batches.
+        """
+        self.assertEqual(list(batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+        with self.assertRaises(ValueError):
+            list(batched(range(5), 0))
+
+if __name__ == "__main__":
+    unittest.main()
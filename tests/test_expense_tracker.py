@@ -1,5 +1,7 @@
 import unittest
 from datetime import datetime, timedelta
+import numpy as np
+from finegist.columnar_store import BulkValidationError
 from finegist.expense_tracker import ExpenseTracker
 
 class TestExpenseTracker(unittest.TestCase):
@@ -65,5 +67,291 @@ class TestExpenseTracker(unittest.TestCase):
         self.assertEqual(summary[today], 50)
         self.assertEqual(summary[yesterday], 100)
 
+    def test_expenses_by_date_out_of_order(self):
+        """
+        Test date lookups when expenses arrive out of date order.
+        """
+        first = datetime(2025, 5, 1).date()
+        second = datetime(2025, 5, 2).date()
+        self.tracker.add_expense("Taxi", 20, second)
+        self.tracker.add_expense("Lunch", 50, first)
+        self.tracker.add_expense("Dinner", 100, second)
+        self.assertEqual([e["description"] for e in self.tracker.expenses_by_date(second)], ["Taxi", "Dinner"])
+        self.assertEqual(self.tracker.expenses_by_date(datetime(2025, 5, 3).date()), [])
+
+    def test_expenses_between(self):
+        """
+        Test querying expenses in an inclusive date range.
+        """
+        base = datetime(2025, 5, 1).date()
+        for offset in (4, 0, 2, 6, 2):
+            self.tracker.add_expense(f"Day {offset}", 10 + offset, base + timedelta(days=offset))
+        in_range = self.tracker.expenses_between(base + timedelta(days=1), base + timedelta(days=4))
+        self.assertEqual([e["description"] for e in in_range], ["Day 2", "Day 2", "Day 4"])
+        self.assertEqual(len(self.tracker.expenses_between(base, base + timedelta(days=6))), 5)
+        self.assertEqual(self.tracker.expenses_between(base + timedelta(days=7), base + timedelta(days=9)), [])
+
+    def test_add_expense_mixes_date_and_datetime(self):
+        """
+        Test that a datetime is stored as its date and indexed alongside plain dates.
+        """
+        self.tracker.add_expense("Coffee", 5)
+        self.tracker.add_expense("Lunch", 10, datetime.now())
+        today = datetime.now().date()
+        self.assertEqual(self.tracker.expenses[-1]["date"], today)
+        self.assertEqual(len(self.tracker.expenses_by_date(today)), 2)
+        self.assertEqual(self.tracker.summary(), {today: 15})
+
+    def test_queries_accept_datetimes(self):
+        """
+        Test that datetime arguments to the query methods match by their date.
+        """
+        self.tracker.add_expense("Coffee shop", 10, datetime(2025, 5, 1, 10))
+        moment = datetime(2025, 5, 1, 18, 30)
+        self.assertEqual(len(self.tracker.expenses_by_date(moment)), 1)
+        self.assertEqual(len(self.tracker.expenses_between(moment, moment)), 1)
+        self.assertEqual(self.tracker.projected_total(moment, moment), 10)
+        self.assertEqual(len(self.tracker.search(keyword="coffee", start=moment, end=moment)), 1)
+
+    def test_running_totals(self):
+        """
+        Test that totals and the summary stay in step with every added expense.
+        """
+        date = datetime(2025, 5, 1).date()
+        for amount in (10, 20, 30):
+            self.tracker.add_expense("Snack", amount, date)
+            self.assertEqual(self.tracker.total_expenses(), sum(e["amount"] for e in self.tracker.expenses))
+        summary = self.tracker.summary()
+        self.assertEqual(summary, {date: 60})
+        summary[date] = 0
+        self.assertEqual(self.tracker.summary()[date], 60)
+
+    def test_add_expenses_bulk_records(self):
+        """
+        Test adding a batch of records in one call.
+        """
+        first = datetime(2025, 5, 1).date()
+        second = datetime(2025, 5, 2).date()
+        self.tracker.add_expense("Coffee", 5, first)
+        added = self.tracker.add_expenses_bulk([
+            {"description": "Lunch", "amount": 50, "date": second},
+            ("Dinner", 100, first),
+            ("Snack", 5),
+        ])
+        self.assertEqual(added, 3)
+        self.assertEqual(len(self.tracker.expenses), 4)
+        self.assertEqual(self.tracker.total_expenses(), 160)
+        self.assertEqual([e["description"] for e in self.tracker.expenses_by_date(first)], ["Coffee", "Dinner"])
+        self.assertEqual(self.tracker.summary()[second], 50)
+        self.assertEqual(self.tracker.expenses_by_date(datetime.now().date())[0]["description"], "Snack")
+
+    def test_add_expenses_bulk_columns(self):
+        """
+        Test adding a batch given as column arrays.
+        """
+        dates = np.array(["2025-05-03", "2025-05-01", "2025-05-03"], dtype="datetime64[D]")
+        self.tracker.add_expenses_bulk(descriptions=["A", "B", "C"], amounts=np.array([1.0, 2.0, 3.0]), dates=dates)
+        in_range = self.tracker.expenses_between(datetime(2025, 5, 1).date(), datetime(2025, 5, 3).date())
+        self.assertEqual([e["description"] for e in in_range], ["B", "A", "C"])
+        self.assertEqual(self.tracker.summary()[datetime(2025, 5, 3).date()], 4)
+
+    def test_add_expenses_bulk_reports_all_invalid_rows(self):
+        """
+        Test that every invalid row is reported and nothing is added.
+        """
+        with self.assertRaises(BulkValidationError) as context:
+            self.tracker.add_expenses_bulk(descriptions=["A", "B", "C", "D"], amounts=[10, -1, 0, float("nan")])
+        self.assertEqual(context.exception.rows, [1, 2, 3])
+        self.assertEqual(len(self.tracker.expenses), 0)
+        self.assertEqual(self.tracker.total_expenses(), 0)
+
+    def test_add_expenses_bulk_reports_invalid_dates(self):
+        """
+        Test that rows with invalid dates are reported before anything is added.
+        """
+        day = datetime(2025, 5, 1).date()
+        with self.assertRaises(BulkValidationError) as context:
+            self.tracker.add_expenses_bulk([("A", 1, day), ("B", 2, "2025-05-02"), ("C", 3, day), ("D", -1, day)])
+        self.assertEqual(context.exception.rows, [1, 3])
+        self.assertEqual(len(self.tracker.expenses), 0)
+        self.assertEqual(self.tracker.total_expenses(), 0)
+        self.tracker.add_expenses_bulk([("A", 1, datetime(2025, 5, 1, 12)), ("B", 2, day)])
+        self.assertEqual(self.tracker.expenses[0]["date"], day)
+        self.assertEqual(self.tracker.summary(), {day: 3})
+
+    def test_add_expenses_bulk_mismatched_columns(self):
+        """
+        Test that columns of different lengths are rejected.
+        """
+        with self.assertRaises(ValueError):
+            self.tracker.add_expenses_bulk(descriptions=["A"], amounts=[1, 2])
+
+    def test_rollup(self):
+        """
+        Test grouping expenses into calendar periods.
+        """
+        self.tracker.add_expense("A", 10, datetime(2025, 1, 5).date())   # Sunday
+        self.tracker.add_expense("B", 20, datetime(2025, 1, 6).date())   # Monday
+        self.tracker.add_expense("C", 30, datetime(2025, 4, 1).date())
+        self.tracker.add_expense("D", 40, datetime(2024, 12, 31).date())
+        d = lambda y, m, day: datetime(y, m, day).date()
+        self.assertEqual(self.tracker.rollup("week"), {d(2024, 12, 30): 50, d(2025, 1, 6): 20, d(2025, 3, 31): 30})
+        self.assertEqual(self.tracker.rollup("month"), {d(2024, 12, 1): 40, d(2025, 1, 1): 30, d(2025, 4, 1): 30})
+        self.assertEqual(self.tracker.rollup("quarter"), {d(2024, 10, 1): 40, d(2025, 1, 1): 30, d(2025, 4, 1): 30})
+        self.assertEqual(self.tracker.rollup("year"), {d(2024, 1, 1): 40, d(2025, 1, 1): 60})
+        with self.assertRaises(ValueError):
+            self.tracker.rollup("decade")
+
+    def test_rollup_invalidates_affected_bucket(self):
+        """
+        Test that cached rollups pick up new expenses.
+        """
+        d = lambda y, m, day: datetime(y, m, day).date()
+        self.tracker.add_expense("A", 10, d(2025, 1, 5))
+        self.tracker.add_expense("B", 20, d(2025, 2, 5))
+        self.assertEqual(self.tracker.rollup("month"), {d(2025, 1, 1): 10, d(2025, 2, 1): 20})
+        self.tracker.add_expense("C", 5, d(2025, 1, 31))
+        self.tracker.add_expense("D", 7, d(2024, 6, 1))
+        self.tracker.add_expenses_bulk([("E", 1, d(2025, 2, 28)), ("F", 2, d(2025, 3, 1))])
+        self.assertEqual(
+            self.tracker.rollup("month"),
+            {d(2024, 6, 1): 7, d(2025, 1, 1): 15, d(2025, 2, 1): 21, d(2025, 3, 1): 2},
+        )
+        self.assertEqual(list(self.tracker.rollup("month")), sorted(self.tracker.rollup("month")))
+
+    def test_add_expense_with_tags(self):
+        """
+        Test storing tags on an expense.
+        """
+        self.tracker.add_expense("Groceries", 80, datetime(2025, 5, 1).date(), tags=["food", "weekly"])
+        self.assertEqual(self.tracker.expenses[0]["tags"], ("food", "weekly"))
+        self.assertEqual(self.tracker.tags(), {"food": 1, "weekly": 1})
+
+    def test_single_string_tag(self):
+        """
+        Test that a string is taken as one tag rather than a sequence of letters.
+        """
+        day = datetime(2025, 5, 1).date()
+        self.tracker.add_expense("Groceries", 80, day, tags="food")
+        self.tracker.add_expenses_bulk([("Bakery", 5, day, "food")])
+        self.assertEqual(self.tracker.expenses[0]["tags"], ("food",))
+        self.assertEqual(self.tracker.tags(), {"food": 2})
+        rule = self.tracker.add_recurring_expense("Gym", 30, day, tags="health")
+        self.assertEqual(rule.tags, ("health",))
+
+    def test_search(self):
+        """
+        Test keyword, tag and prefix search combined with date ranges.
+        """
+        d = lambda day: datetime(2025, 5, day).date()
+        self.tracker.add_expense("Starbucks coffee", 5, d(1), tags=["Food"])
+        self.tracker.add_expense("Shell fuel", 60, d(2), tags=["car"])
+        self.assertEqual(len(self.tracker.search(keyword="coffee")), 1)
+        self.tracker.add_expense("Coffee beans", 15, d(3), tags=["food"])
+        self.tracker.add_expenses_bulk([("starbucks COFFEE", 6, d(4), ["food"]), ("Star Market", 30, d(5))])
+        self.assertEqual([e["amount"] for e in self.tracker.search(keyword="coffee")], [5, 15, 6])
+        self.assertEqual([e["amount"] for e in self.tracker.search(keyword="starbucks coffee")], [5, 6])
+        self.assertEqual([e["amount"] for e in self.tracker.search(prefix="star")], [5, 6, 30])
+        self.assertEqual([e["amount"] for e in self.tracker.search(tag="FOOD", keyword="coffee", start=d(2))], [15, 6])
+        self.assertEqual(self.tracker.search(tag="car", end=d(1)), [])
+        self.assertEqual(self.tracker.search(keyword="tea"), [])
+        with self.assertRaises(ValueError):
+            self.tracker.search(start=d(1))
+
+    def test_search_date_ranges(self):
+        """
+        Test narrow and wide date ranges, which intersect the date index or filter the matches.
+        """
+        start = datetime(2025, 1, 1).date()
+        rows = [
+            (("Coffee", "Tea", "Fuel")[i % 3], i + 1, start + timedelta(days=i % 20), "food" if i % 2 else None)
+            for i in range(300)
+        ]
+        self.tracker.add_expenses_bulk(rows)
+        for first, last in ((3, 3), (0, 18), (5, None), (None, 2)):
+            lo = None if first is None else start + timedelta(days=first)
+            hi = None if last is None else start + timedelta(days=last)
+            expected = [
+                amount for description, amount, day, tag in rows
+                if description == "Coffee" and tag and (lo is None or day >= lo) and (hi is None or day <= hi)
+            ]
+            found = self.tracker.search(keyword="coffee", tag="food", start=lo, end=hi)
+            self.assertEqual([e["amount"] for e in found], expected)
+
+    def test_sketches(self):
+        """
+        Test the optional quantile and top merchant sketches.
+        """
+        with self.assertRaises(ValueError):
+            self.tracker.spend_quantile(0.5)
+        date = datetime(2025, 5, 1).date()
+        for amount in range(1, 51):
+            self.tracker.add_expense("Coffee", amount, date)
+        self.tracker.enable_sketches(seed=1)
+        for amount in range(51, 101):
+            self.tracker.add_expense("Rent" if amount > 90 else "Coffee", amount, date)
+        self.tracker.add_expenses_bulk(descriptions=["Rent"], amounts=[1000], dates=date)
+        self.assertEqual(self.tracker.spend_quantile(0.5), 51)
+        self.assertEqual(self.tracker.spend_quantile(1), 1000)
+        self.assertEqual(self.tracker.top_merchants(1), [("Coffee", 4095)])
+        self.assertEqual(self.tracker.top_merchants(2)[1], ("Rent", 1955))
+
+    def test_recurring_expenses(self):
+        """
+        Test lazily expanded recurring expenses alongside recorded ones.
+        """
+        d = lambda y, m, day: datetime(y, m, day).date()
+        self.tracker.add_recurring_expense("Rent", 1000, d(2025, 1, 1), end=d(2034, 12, 31))
+        self.tracker.add_recurring_expense("Gym", 20, d(2025, 1, 6), frequency="weekly")
+        self.tracker.add_expense("Lunch", 15, d(2025, 1, 6))
+        self.assertEqual(self.tracker.total_expenses(), 15)
+        self.assertEqual(len(self.tracker.expenses), 1)
+        self.assertEqual(self.tracker.projected_total(d(2025, 1, 1), d(2025, 1, 31)), 1000 + 4 * 20 + 15)
+        self.assertEqual(self.tracker.projected_total(d(2025, 1, 1), d(2044, 12, 31)), 120 * 1000 + 1043 * 20 + 15)
+        in_range = self.tracker.expenses_between(d(2025, 1, 1), d(2025, 1, 13), include_recurring=True)
+        self.assertEqual([e["description"] for e in in_range], ["Rent", "Lunch", "Gym", "Gym"])
+        self.assertEqual(len(self.tracker.expenses_between(d(2025, 1, 1), d(2025, 1, 13))), 1)
+
+class TestColumnarExpenseTracker(TestExpenseTracker):
+    def setUp(self):
+        """
+        Run the same tests against the columnar storage backend.
+        """
+        self.tracker = ExpenseTracker(columnar=True)
+
+    def test_columnar_storage(self):
+        """
+        Test that the columnar backend keeps rows in typed arrays.
+        """
+        date = datetime(2025, 5, 1).date()
+        self.tracker.add_expense("Coffee", 4.5, date)
+        self.tracker.add_expense("Coffee", 3.5, date)
+        self.assertTrue(self.tracker.columnar)
+        self.assertEqual(self.tracker.expenses.descriptions, ["Coffee"])
+        self.assertEqual(self.tracker.expenses[-1], {"description": "Coffee", "amount": 3.5, "date": date})
+        self.assertEqual(self.tracker.summary(), {date: 8.0})
+
+    def test_add_expense_rejects_non_dates(self):
+        """
+        Test that a list tracker rejects a non-date value without keeping the row,
+        even once a rollup is cached.
+        """
+        tracker = ExpenseTracker()
+        tracker.add_expense("Coffee", 5, datetime(2025, 5, 1).date())
+        tracker.rollup("month")
+        with self.assertRaises(ValueError):
+            tracker.add_expense("Lunch", 10, "2025-05-02")
+        self.assertEqual(len(tracker.expenses), 1)
+        self.assertEqual(tracker.total_expenses(), 5)
+        self.assertEqual(tracker.summary(), {datetime(2025, 5, 1).date(): 5})
+        self.assertEqual(tracker.rollup("month"), {datetime(2025, 5, 1).date(): 5})
+
+    def test_columnar_requires_date_objects(self):
+        """
+        Test that the columnar backend rejects non-date values.
+        """
+        with self.assertRaises(ValueError):
+            self.tracker.add_expense("Lunch", 50, "2025-05-01")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
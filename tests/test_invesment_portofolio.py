@@ -54,5 +54,45 @@ class TestInvestmentPortfolio(unittest.TestCase):
         self.assertEqual(summary["total_current_value"], 3700)
         self.assertEqual(len(summary["investments"]), 2)
 
+    def test_repeated_buys_merge(self):
+        """
+        Test that buying the same investment again merges into one holding.
+        """
+        self.portfolio.add_investment("Stock A", 1000, 1200, quantity=10)
+        self.portfolio.add_investment("Stock A", 500, 600, quantity=5)
+        self.assertEqual(len(self.portfolio.investments), 1)
+        holding = self.portfolio.holding("Stock A")
+        self.assertEqual((holding["amount"], holding["current_value"], holding["quantity"]), (1500, 1800, 15))
+        self.assertEqual(self.portfolio.total_invested(), 1500)
+
+    def test_update_and_revalue(self):
+        """
+        Test updating and revaluing holdings keeps the totals in step.
+        """
+        self.portfolio.add_investment("Stock A", 1000, 1200, quantity=10)
+        self.portfolio.add_investment("Stock B", 2000, 2500)
+        self.portfolio.update_investment("Stock B", amount=1500)
+        self.portfolio.revalue("Stock A", price=150)
+        self.portfolio.revalue("Stock B", current_value=1000)
+        self.assertEqual(self.portfolio.total_invested(), 2500)
+        self.assertEqual(self.portfolio.total_current_value(), 2500)
+        with self.assertRaises(ValueError):
+            self.portfolio.revalue("Stock B", price=10)
+        with self.assertRaises(ValueError):
+            self.portfolio.update_investment("Stock C", amount=10)
+
+    def test_remove_investment(self):
+        """
+        Test removing a holding by name.
+        """
+        self.portfolio.add_investment("Stock A", 1000, 1200)
+        self.portfolio.add_investment("Stock B", 2000, 2500)
+        removed = self.portfolio.remove_investment("Stock A")
+        self.assertEqual(removed["amount"], 1000)
+        self.assertEqual(self.portfolio.total_invested(), 2000)
+        self.assertEqual(self.portfolio.total_current_value(), 2500)
+        with self.assertRaises(ValueError):
+            self.portfolio.remove_investment("Stock A")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
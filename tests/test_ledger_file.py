@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+import numpy as np
+from finegist.expense_tracker import ExpenseTracker
+from finegist.ledger_file import ExpenseLedgerFile
+
+class TestExpenseLedgerFile(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a temporary ledger path for testing.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "expenses.ledger")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append_and_read(self):
+        """
+        Test appending rows and reading them back from the mapped file.
+        """
+        with ExpenseLedgerFile(self.path) as ledger:
+            ledger.append({"description": "Lunch", "amount": 50, "date": date(2025, 5, 1)})
+            ledger.extend(["Rent", "Café"], np.array([1500.0, 4.5]), [date(2025, 5, 2).toordinal()] * 2)
+            self.assertEqual(len(ledger), 3)
+            self.assertEqual(ledger[2], {"description": "Café", "amount": 4.5, "date": date(2025, 5, 2)})
+            self.assertEqual(ledger.total(), 1554.5)
+        self.assertEqual(os.path.getsize(self.path), 16 + 3 * 64)
+
+    def test_reopen_is_zero_copy(self):
+        """
+        Test that a reopened ledger exposes its columns as views over the map.
+        """
+        with ExpenseLedgerFile(self.path) as ledger:
+            ledger.extend(["A", "B"], [1.0, 2.0], [1, 2])
+        with ExpenseLedgerFile(self.path, readonly=True) as ledger:
+            self.assertFalse(ledger.amounts.flags.owndata)
+            self.assertEqual(ledger.amounts.tolist(), [1.0, 2.0])
+            with self.assertRaises(ValueError):
+                ledger.append({"description": "C", "amount": 3, "date": date(2025, 1, 1)})
+
+    def test_reader_refresh(self):
+        """
+        Test that a read-only reader sees rows appended by a writer after refresh.
+        """
+        writer = ExpenseLedgerFile(self.path)
+        reader = ExpenseLedgerFile(self.path, readonly=True)
+        writer.extend(["A"], [1.0], [1])
+        self.assertEqual(len(reader), 0)
+        self.assertEqual(reader.refresh(), 1)
+        self.assertEqual(reader[0]["description"], "A")
+        writer.close()
+        reader.close()
+
+    def test_rejects_invalid_input(self):
+        """
+        Test rejecting foreign files and descriptions that do not fit a record.
+        """
+        with open(self.path, "wb") as f:
+            f.write(b"not a ledger file")
+        with self.assertRaises(ValueError):
+            ExpenseLedgerFile(self.path)
+        other = os.path.join(self.directory.name, "other.ledger")
+        with ExpenseLedgerFile(other) as ledger:
+            with self.assertRaises(ValueError):
+                ledger.extend(["x" * 53], [1.0], [1])
+            self.assertEqual(len(ledger), 0)
+
+    def test_tracker_on_ledger(self):
+        """
+        Test an ExpenseTracker persisted through a ledger file.
+        """
+        tracker = ExpenseTracker.open_ledger(self.path)
+        tracker.add_expense("Lunch", 50, date(2025, 5, 1))
+        tracker.add_expenses_bulk([("Dinner", 100, date(2025, 5, 2)), ("Coffee", 5, date(2025, 5, 1))])
+        tracker.expenses.close()
+
+        reopened = ExpenseTracker.open_ledger(self.path, readonly=True)
+        self.assertEqual(reopened.total_expenses(), 155)
+        self.assertEqual(reopened.summary(), {date(2025, 5, 1): 55, date(2025, 5, 2): 100})
+        self.assertEqual([e["description"] for e in reopened.expenses_by_date(date(2025, 5, 1))], ["Lunch", "Coffee"])
+
+        writer = ExpenseTracker.open_ledger(self.path)
+        writer.add_expense("Taxi", 20, date(2025, 5, 3))
+        self.assertEqual(reopened.refresh(), 1)
+        self.assertEqual(reopened.total_expenses(), 175)
+        writer.expenses.close()
+        reopened.expenses.close()
+
+    def test_tracker_indexes_ledger_lazily(self):
+        """
+        Test that opening a ledger defers indexing until a query needs it.
+        """
+        with ExpenseLedgerFile(self.path) as ledger:
+            ledger.extend(["A", "B"], [1.0, 2.0], [date(2025, 5, 1).toordinal()] * 2)
+        tracker = ExpenseTracker.open_ledger(self.path)
+        self.assertEqual(tracker._date_index, {})
+        writer = ExpenseLedgerFile(self.path)
+        writer.extend(["C"], [4.0], [date(2025, 5, 2).toordinal()])
+        self.assertEqual(tracker.refresh(), 1)
+        self.assertEqual(tracker._date_index, {})
+        tracker.add_expense("D", 8, date(2025, 5, 2))
+        self.assertEqual(tracker.total_expenses(), 15)
+        self.assertEqual([e["description"] for e in tracker.expenses_by_date(date(2025, 5, 2))], ["C", "D"])
+        writer.close()
+        tracker.expenses.close()
+
+if __name__ == "__main__":
+    unittest.main()
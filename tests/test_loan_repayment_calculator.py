@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from finegist.loan_repayment_calculator import LoanRepaymentCalculator
 
 class TestLoanRepaymentCalculator(unittest.TestCase):
@@ -24,6 +25,75 @@ class TestLoanRepaymentCalculator(unittest.TestCase):
         self.assertAlmostEqual(schedule[0]["principal_payment"] + schedule[0]["interest_payment"], 1060.66, places=2)
         self.assertAlmostEqual(schedule[-1]["remaining_balance"], 0, places=2)
 
+    def test_remaining_balance(self):
+        """
+        Test the closed-form balance against the month-by-month schedule.
+        """
+        schedule = self.calculator.generate_repayment_schedule()
+        for month in (1, 37, 120):
+            self.assertAlmostEqual(self.calculator.remaining_balance(month), schedule[month - 1]["remaining_balance"], places=2)
+        self.assertEqual(self.calculator.remaining_balance(0), 100000)
+        np.testing.assert_allclose(self.calculator.remaining_balance(np.array([0, 120])), [100000, 0], atol=1e-6)
+        calculator = LoanRepaymentCalculator(principal=1200, annual_interest_rate=0, years=1)
+        self.assertEqual(calculator.remaining_balance(3), 900)
+        with self.assertRaises(ValueError):
+            self.calculator.remaining_balance(121)
+
+    def test_schedule_arrays(self):
+        """
+        Test that the array schedule matches the list schedule.
+        """
+        schedule = self.calculator.generate_repayment_schedule()
+        arrays = self.calculator.schedule_arrays(decimals=2)
+        self.assertEqual(len(arrays["month"]), 120)
+        for key in ("principal_payment", "interest_payment", "remaining_balance"):
+            np.testing.assert_allclose(arrays[key], [row[key] for row in schedule], atol=0.011)
+        window = self.calculator.schedule_arrays(start=60, stop=61)
+        self.assertEqual(window["month"].tolist(), [60, 61])
+        self.assertAlmostEqual(window["interest_payment"][0], schedule[59]["interest_payment"], places=2)
+        with self.assertRaises(ValueError):
+            self.calculator.schedule_arrays(start=0)
+
+    def test_iter_repayment_schedule(self):
+        """
+        Test that the schedule can be generated lazily.
+        """
+        rows = self.calculator.iter_repayment_schedule()
+        first = next(rows)
+        self.assertEqual(first, self.calculator.generate_repayment_schedule()[0])
+        self.assertEqual(next(rows)["month"], 2)
+
+    def test_calculate_batch(self):
+        """
+        Test evaluating many loans at once, including zero-rate loans.
+        """
+        result = LoanRepaymentCalculator.calculate_batch([100000, 1200, 5000], [5, 0, 3.5], [10, 1, 2])
+        for i, (principal, rate, years) in enumerate([(100000, 5, 10), (1200, 0, 1), (5000, 3.5, 2)]):
+            payment = LoanRepaymentCalculator(principal, rate, years).calculate_monthly_payment()
+            self.assertAlmostEqual(result["monthly_payment"][i], payment)
+            self.assertAlmostEqual(result["total_cost"][i], payment * years * 12)
+        self.assertAlmostEqual(result["total_interest"][1], 0)
+
+    def test_calculate_batch_grid(self):
+        """
+        Test evaluating the Cartesian grid of principals, rates and terms.
+        """
+        result = LoanRepaymentCalculator.calculate_batch([100000, 200000], [0, 4, 6], [15, 30], grid=True)
+        self.assertEqual(result["monthly_payment"].shape, (2, 3, 2))
+        expected = LoanRepaymentCalculator(200000, 4, 15).calculate_monthly_payment()
+        self.assertAlmostEqual(result["monthly_payment"][1, 1, 0], expected)
+        self.assertAlmostEqual(result["monthly_payment"][0, 0, 1], 100000 / 360)
+
+    def test_calculate_batch_errors(self):
+        """
+        Test that invalid loans are masked instead of raising.
+        """
+        result = LoanRepaymentCalculator.calculate_batch([-1, 1000, 1000], [5, -5, 5], [10, 10, 0])
+        np.testing.assert_array_equal(result["errors"]["principal"], [True, False, False])
+        np.testing.assert_array_equal(result["errors"]["rate"], [False, True, False])
+        np.testing.assert_array_equal(result["errors"]["years"], [False, False, True])
+        self.assertTrue(np.isnan(result["monthly_payment"]).all())
+
     def test_invalid_principal(self):
         """
         Test initializing with an invalid principal amount.
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from finegist.investment_portfolio import InvestmentPortfolio
+from finegist.monte_carlo import MonteCarloSimulator
+
+class TestMonteCarloSimulator(unittest.TestCase):
+    def test_lognormal_mean(self):
+        """
+        Test that the mean outcome matches the expected annual return.
+        """
+        simulator = MonteCarloSimulator(mean_return=0.07, volatility=0.15, max_workers=0, seed=1)
+        result = simulator.simulate(1000, 10, paths=20000)
+        self.assertAlmostEqual(result["mean"][-1] / (1000 * 1.07 ** 10), 1, delta=0.03)
+        self.assertEqual(len(result["years"]), 11)
+        bands = result["bands"]
+        self.assertTrue((bands[5] <= bands[50]).all() and (bands[50] <= bands[95]).all())
+        self.assertEqual(bands[50][0], 1000)
+
+    def test_deterministic_seeding(self):
+        """
+        Test that results depend on the seed and not on the number of workers.
+        """
+        serial = MonteCarloSimulator(max_workers=0, seed=7).simulate(1000, 5, paths=25000)
+        with MonteCarloSimulator(max_workers=2, seed=7) as simulator:
+            parallel = simulator.simulate(1000, 5, paths=25000)
+        np.testing.assert_array_equal(serial["terminal_values"], parallel["terminal_values"])
+
+    def test_zero_volatility(self):
+        """
+        Test that without volatility every path compounds contributions exactly.
+        """
+        simulator = MonteCarloSimulator(mean_return=0.0, volatility=0.0, max_workers=0)
+        result = simulator.simulate(1000, 3, paths=10, annual_contribution=1200, target=4600)
+        np.testing.assert_allclose(result["bands"][50], [1000, 2200, 3400, 4600])
+        self.assertEqual(result["probability_of_target"], 1.0)
+
+    def test_bootstrap(self):
+        """
+        Test resampling historical returns.
+        """
+        simulator = MonteCarloSimulator(model="bootstrap", historical_returns=[0.01], max_workers=0, seed=3)
+        self.assertAlmostEqual(simulator.simulate(100, 1, paths=5)["mean"][-1], 100 * 1.01 ** 12)
+        self.assertEqual(simulator.probability_of_target(100, 200, 1, paths=5), 0.0)
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator(model="bootstrap")
+
+    def test_portfolio_simulation(self):
+        """
+        Test projecting an investment portfolio.
+        """
+        portfolio = InvestmentPortfolio()
+        portfolio.add_investment("Fund", 1000, 1500)
+        simulator = MonteCarloSimulator(volatility=0, mean_return=0.1, steps_per_year=1, max_workers=0)
+        result = portfolio.simulate(2, simulator, paths=10, target=1800)
+        self.assertAlmostEqual(result["mean"][-1], 1815)
+        self.assertEqual(result["probability_of_target"], 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import math
+import random
+import unittest
+from datetime import date, timedelta
+from finegist.expense_tracker import ExpenseTracker
+from finegist.partitioned_tracker import PartitionedExpenseTracker
+
+class TestPartitionedExpenseTracker(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up random expenses shared by the partitioned and plain trackers.
+        """
+        rng = random.Random(7)
+        start = date(2024, 11, 1)
+        merchants = ["Coffee", "Rent", "Fuel", "Groceries", "Cinema"]
+        self.rows = [
+            (rng.choice(merchants), rng.randint(1, 400) / 4, start + timedelta(days=rng.randint(0, 120)))
+            for _ in range(500)
+        ]
+        self.reference = ExpenseTracker()
+        for row in self.rows:
+            self.reference.add_expense(*row)
+
+    def check_matches_reference(self, tracker):
+        self.assertEqual(len(tracker), len(self.rows))
+        self.assertEqual(tracker.total_expenses(), self.reference.total_expenses())
+        self.assertEqual(tracker.summary(), self.reference.summary())
+        start, end = date(2024, 12, 20), date(2025, 1, 10)
+        self.assertEqual(tracker.expenses_between(start, end), self.reference.expenses_between(start, end))
+
+    def test_month_partitions(self):
+        """
+        Test partitioning by calendar month.
+        """
+        tracker = PartitionedExpenseTracker(partition_by="month")
+        for row in self.rows:
+            tracker.add_expense(*row)
+        self.assertEqual(sorted(tracker.partitions), [2024 * 12 + 10, 2024 * 12 + 11, 2025 * 12, 2025 * 12 + 1, 2025 * 12 + 2])
+        self.check_matches_reference(tracker)
+
+    def test_hash_partitions_with_bulk_ingest(self):
+        """
+        Test hash partitioning fed through the bulk API.
+        """
+        tracker = PartitionedExpenseTracker(partition_by="hash", partitions=3)
+        tracker.add_expenses_bulk(self.rows[:250])
+        tracker.add_expenses_bulk(self.rows[250:])
+        self.assertLessEqual(len(tracker.partitions), 3)
+        self.check_matches_reference(tracker)
+
+    def test_totals_identical_for_inexact_amounts(self):
+        """
+        Test that totals and per-date subtotals match a single tracker exactly for
+        amounts that are not exact in binary.
+        """
+        rng = random.Random(11)
+        merchants = ["Coffee", "Rent", "Fuel", "Groceries", "Cinema", "Books"]
+        rows = [
+            (rng.choice(merchants), rng.choice([0.1, 0.2, 0.3, 1.7, 1e6 + 0.01]),
+             date(2025, 1, 1) + timedelta(days=rng.randint(0, 90)))
+            for _ in range(2000)
+        ]
+        reference = ExpenseTracker()
+        for row in rows:
+            reference.add_expense(*row)
+        monthly = PartitionedExpenseTracker(partition_by="month")
+        monthly.add_expenses_bulk(rows[:800])
+        for row in rows[800:]:
+            monthly.add_expense(*row)
+        hashed = PartitionedExpenseTracker(partition_by="hash", partitions=4)
+        hashed.add_expenses_bulk(rows)
+        self.assertEqual(reference.total_expenses(), math.fsum(amount for _, amount, _ in rows))
+        self.assertEqual(monthly.total_expenses(), reference.total_expenses())
+        self.assertEqual(hashed.total_expenses(), reference.total_expenses())
+        self.assertEqual(monthly.summary(), reference.summary())
+        self.assertEqual(hashed.summary(), reference.summary())
+
+    def test_invalid_configuration(self):
+        """
+        Test rejecting unknown partitioning schemes.
+        """
+        with self.assertRaises(ValueError):
+            PartitionedExpenseTracker(partition_by="week")
+        with self.assertRaises(ValueError):
+            PartitionedExpenseTracker(partition_by="hash", partitions=0)
+
+if __name__ == "__main__":
+    unittest.main()
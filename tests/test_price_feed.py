@@ -0,0 +1,125 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from finegist.investment_portfolio import InvestmentPortfolio
+from finegist.price_feed import PortfolioRevaluer, file_ticks, parse_tick, stream_ticks
+
+async def ticks(items, delay=0.0):
+    """
+    Yield ticks from a list, optionally pausing between them.
+    """
+    for item in items:
+        yield item
+        await asyncio.sleep(delay)
+
+class TestPortfolioRevaluer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """
+        Set up a portfolio with two priced holdings and one without a quantity.
+        """
+        self.portfolio = InvestmentPortfolio()
+        self.portfolio.buy("ABC", 10, 100)
+        self.portfolio.buy("XYZ", 5, 20)
+        self.portfolio.add_investment("Fund", 500, 500)
+
+    async def test_coalesces_bursts(self):
+        """
+        Test that a burst of ticks is applied once per symbol with the latest price.
+        """
+        revaluer = PortfolioRevaluer(self.portfolio, min_interval=0)
+        revaluer.push("ABC", 101)
+        revaluer.push("ABC", 105)
+        revaluer.push("Fund", 3)
+        revaluer.push("Unknown", 1)
+        self.assertEqual(revaluer.flush(), {"ABC": 105})
+        self.assertEqual(self.portfolio.total_current_value(), 1050 + 100 + 500)
+
+    async def test_run(self):
+        """
+        Test consuming a feed and notifying sync and async subscribers.
+        """
+        seen = []
+        received = []
+
+        async def slow(snapshot):
+            await asyncio.sleep(0.05)
+            received.append(snapshot)
+
+        revaluer = PortfolioRevaluer(self.portfolio, min_interval=0.01)
+        revaluer.subscribe(seen.append)
+        revaluer.subscribe(slow)
+        feed = [("ABC", 100 + i) for i in range(50)] + [{"symbol": "XYZ", "price": 30}]
+        final = await revaluer.run(ticks(feed, 0.001))
+        self.assertEqual(final["total_current_value"], 1490 + 150 + 500)
+        self.assertEqual(seen[-1], final)
+        self.assertEqual(received[-1], final)
+        self.assertLessEqual(len(received), len(seen))
+        self.assertLess(len(seen), 51)
+        self.assertEqual(revaluer.tick_count, 51)
+
+    async def test_sync_subscribers_run_off_the_loop(self):
+        """
+        Test that a blocking plain-function subscriber runs in a worker thread.
+        """
+        threads = []
+
+        def blocking(snapshot):
+            time.sleep(0.01)
+            threads.append(threading.get_ident())
+
+        revaluer = PortfolioRevaluer(self.portfolio, min_interval=0)
+        revaluer.subscribe(blocking)
+        await revaluer.run(ticks([("ABC", 110), ("XYZ", 21)], 0.001))
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    async def test_subscriber_errors(self):
+        """
+        Test that a failing subscriber does not stop the feed.
+        """
+        def broken(snapshot):
+            raise RuntimeError("boom")
+
+        revaluer = PortfolioRevaluer(self.portfolio, min_interval=0)
+        revaluer.subscribe(broken)
+        final = await revaluer.run(ticks([("ABC", 200)]))
+        self.assertEqual(final["total_current_value"], 2000 + 100 + 500)
+        self.assertIsInstance(revaluer.errors[0], RuntimeError)
+
+    async def test_file_and_stream_ticks(self):
+        """
+        Test the file and stream stand-ins for a live feed.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ticks.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"symbol": "ABC", "price": 120}\n\n{"symbol": "XYZ", "price": 25}\n')
+            revaluer = PortfolioRevaluer(self.portfolio, min_interval=0)
+            final = await revaluer.run(file_ticks(path))
+        self.assertEqual(final["total_current_value"], 1200 + 125 + 500)
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'{"symbol": "ABC", "price": 90}\n')
+        reader.feed_eof()
+        self.assertEqual([tick async for tick in stream_ticks(reader)], [("ABC", 90.0)])
+
+    async def test_invalid_tick(self):
+        """
+        Test that malformed ticks are rejected.
+        """
+        with self.assertRaises(ValueError):
+            parse_tick('{"symbol": "ABC"}')
+        with self.assertRaises(ValueError):
+            parse_tick('{"symbol": "ABC", "price": -1}')
+        revaluer = PortfolioRevaluer(self.portfolio)
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"not json\n")
+        reader.feed_eof()
+        with self.assertRaises(ValueError):
+            await revaluer.run(stream_ticks(reader))
+
+if __name__ == "__main__":
+    unittest.main()
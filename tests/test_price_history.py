@@ -0,0 +1,104 @@
+import unittest
+from datetime import date, timedelta
+import numpy as np
+from finegist.investment_portfolio import InvestmentPortfolio
+from finegist.price_history import PriceHistory, forward_fill, time_weighted_return
+
+class TestPriceHistory(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a history of two symbols over five days.
+        """
+        self.start = date(2025, 1, 1)
+        self.history = PriceHistory()
+        self.history.extend(
+            [self.start + timedelta(days=i) for i in range(5)],
+            ["ABC", "XYZ"],
+            [[100, np.nan], [110, 50], [99, np.nan], [121, 40], [110, 60]],
+        )
+
+    def test_forward_fill(self):
+        """
+        Test that missing prices carry the last known price forward.
+        """
+        filled = forward_fill([[np.nan, 1.0], [2.0, np.nan], [np.nan, 3.0]])
+        self.assertTrue(np.isnan(filled[0, 0]))
+        np.testing.assert_array_equal(filled[1:], [[2.0, 1.0], [2.0, 3.0]])
+
+    def test_record_out_of_order(self):
+        """
+        Test that prices recorded out of order are kept sorted by date.
+        """
+        self.history.record("ABC", date(2024, 12, 31), 90)
+        self.history.record("NEW", date(2025, 1, 3), 10)
+        self.assertEqual(self.history.dates[0], date(2024, 12, 31))
+        self.assertEqual(len(self.history), 6)
+        self.assertEqual(self.history.prices(["NEW"])[-1, 0], 10)
+        with self.assertRaises(ValueError):
+            self.history.extend([date(2025, 1, 2)], ["ABC"], [[1.0]])
+        with self.assertRaises(ValueError):
+            self.history.record("ABC", date(2025, 1, 9), 0)
+
+    def test_returns(self):
+        """
+        Test daily and monthly returns.
+        """
+        ordinals, returns = self.history.returns(["ABC"])
+        self.assertEqual(ordinals[0], date(2025, 1, 2).toordinal())
+        np.testing.assert_allclose(returns[:, 0], [0.1, -0.1, 0.2222222222, -0.0909090909])
+        _, xyz = self.history.returns(["XYZ"])
+        np.testing.assert_allclose(xyz[1:, 0], [0.0, -0.2, 0.5])
+        self.history.record("ABC", date(2025, 2, 3), 132)
+        ordinals, monthly = self.history.returns(["ABC"], period="month")
+        self.assertEqual(ordinals.tolist(), [date(2025, 2, 1).toordinal()])
+        self.assertAlmostEqual(monthly[0, 0], 0.2)
+
+    def test_rolling_volatility(self):
+        """
+        Test rolling volatility against a direct computation.
+        """
+        volatility = self.history.rolling_volatility(window=3, periods_per_year=1)
+        _, returns = self.history.returns()
+        self.assertTrue(np.isnan(volatility[:2]).all())
+        self.assertAlmostEqual(volatility[2, 0], np.std(returns[:3, 0], ddof=1))
+        self.assertAlmostEqual(volatility[3, 0], np.std(returns[1:4, 0], ddof=1))
+        self.assertTrue(np.isnan(volatility[2, 1]))
+        self.assertAlmostEqual(volatility[3, 1], np.std(returns[1:4, 1], ddof=1))
+
+    def test_drawdown(self):
+        """
+        Test drawdown per symbol and for a portfolio.
+        """
+        drawdown = self.history.drawdown(["ABC"])[:, 0]
+        np.testing.assert_allclose(drawdown, [0, 0, -0.1, 0, 110 / 121 - 1])
+        self.assertAlmostEqual(self.history.max_drawdown({"ABC": 1}), -0.1)
+
+    def test_time_weighted_return(self):
+        """
+        Test that cash flows from buying more units do not count as returns.
+        """
+        self.assertAlmostEqual(self.history.time_weighted_return({"ABC": 2}), 0.1)
+        quantities = np.array([[1, 0], [1, 0], [2, 0], [2, 0], [2, 0]])
+        self.assertAlmostEqual(self.history.time_weighted_return(quantities), 0.1)
+        self.assertAlmostEqual(time_weighted_return([100, 210, 231], [0, 100, 0]), 0.21)
+
+class TestPortfolioPrices(unittest.TestCase):
+    def test_record_prices(self):
+        """
+        Test that recording prices revalues holdings and builds a value history.
+        """
+        portfolio = InvestmentPortfolio()
+        portfolio.buy("ABC", 10, 100)
+        portfolio.add_investment("Fund", 500, 500)
+        portfolio.record_prices(date(2025, 1, 1), {"ABC": 100})
+        portfolio.record_prices(date(2025, 1, 2), {"ABC": 120, "Fund": 3})
+        self.assertEqual(portfolio.holding("ABC")["current_value"], 1200)
+        self.assertEqual(portfolio.total_current_value(), 1700)
+        portfolio.record_prices(date(2024, 12, 31), {"ABC": 90})
+        self.assertEqual(portfolio.total_current_value(), 1700)
+        dates, values = portfolio.value_history()
+        self.assertEqual(dates[0], date(2024, 12, 31))
+        np.testing.assert_array_equal(values, [900, 1000, 1200])
+
+if __name__ == "__main__":
+    unittest.main()
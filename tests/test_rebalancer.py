@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from finegist.investment_portfolio import InvestmentPortfolio
+from finegist.rebalancer import Rebalancer
+
+class TestRebalancer(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a 60/40 rebalancer with a five-point band.
+        """
+        self.rebalancer = Rebalancer({"Stocks": 0.6, "Bonds": 0.4}, band=0.05, min_trade=10)
+
+    def test_within_band(self):
+        """
+        Test that portfolios within their bands are left alone.
+        """
+        result = self.rebalancer.rebalance_arrays([620, 380])
+        np.testing.assert_array_equal(result["trades"], [0, 0])
+        self.assertFalse(result["drifted"].any())
+
+    def test_rebalance_arrays(self):
+        """
+        Test a book of portfolios in one pass.
+        """
+        values = np.array([[700, 300], [500, 500], [600, 395]])
+        result = self.rebalancer.rebalance_arrays(values, cash=[0, 0, 5])
+        np.testing.assert_allclose(result["trades"], [[-100, 100], [100, -100], [0, 0]])
+        np.testing.assert_allclose(result["cash"], [0, 0, 5])
+
+    def test_cash_limits_buys(self):
+        """
+        Test that buys are scaled down to the cash available.
+        """
+        rebalancer = Rebalancer({"Stocks": 0.5, "Bonds": 0.5}, band=0.01)
+        result = rebalancer.rebalance_arrays([[100, 100]], cash=[200])
+        np.testing.assert_allclose(result["trades"], [[100, 100]])
+        result = rebalancer.rebalance_arrays([[100, 100]], cash=[200], targets=[0.5, 0.5])
+        self.assertAlmostEqual(result["cash"][0], 0)
+        result = Rebalancer({"Stocks": 0.4, "Bonds": 0.4}, band=0.01).rebalance_arrays([[100, 0]], cash=[400])
+        np.testing.assert_allclose(result["trades"], [[100, 200]])
+        self.assertAlmostEqual(result["cash"][0], 100)
+
+    def test_minimum_trade(self):
+        """
+        Test that trades below the minimum size are dropped.
+        """
+        rebalancer = Rebalancer({"Stocks": 0.6, "Bonds": 0.4}, band=0.0, min_trade=50)
+        result = rebalancer.rebalance_arrays([[620, 380], [700, 300]])
+        np.testing.assert_allclose(result["trades"], [[0, 0], [-100, 100]])
+
+    def test_rebalance_portfolio(self):
+        """
+        Test trade lists for InvestmentPortfolio objects, selling untargeted holdings.
+        """
+        portfolio = InvestmentPortfolio()
+        portfolio.add_investment("Stocks", 500, 800)
+        portfolio.add_investment("Bonds", 200, 100)
+        portfolio.add_investment("Crypto", 100, 100)
+        trades = self.rebalancer.rebalance(portfolio)
+        self.assertEqual(trades, [
+            {"name": "Stocks", "action": "sell", "amount": 200.0},
+            {"name": "Bonds", "action": "buy", "amount": 300.0},
+            {"name": "Crypto", "action": "sell", "amount": 100.0},
+        ])
+        books = self.rebalancer.rebalance_book([portfolio, InvestmentPortfolio()], cash=[0, 100])
+        self.assertEqual(books[1], [
+            {"name": "Stocks", "action": "buy", "amount": 60.0},
+            {"name": "Bonds", "action": "buy", "amount": 40.0},
+        ])
+
+    def test_invalid_targets(self):
+        """
+        Test that invalid targets are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Rebalancer({"Stocks": 0.8, "Bonds": 0.4})
+        with self.assertRaises(ValueError):
+            Rebalancer({})
+        with self.assertRaises(ValueError):
+            self.rebalancer.rebalance_arrays([[1, 2, 3]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from datetime import date
+from finegist.recurring import RecurringExpense
+
+class TestRecurringExpense(unittest.TestCase):
+    def expand(self, rule, start, end):
+        """
+        Brute-force the occurrences of a rule to check the arithmetic against.
+        """
+        dates = []
+        index = 0
+        while True:
+            day = rule.occurrence(index)
+            if day > end or (rule.end is not None and day > rule.end):
+                return dates
+            if day >= start:
+                dates.append(day)
+            index += 1
+
+    def test_monthly_clamps_to_month_end(self):
+        """
+        Test that a rule anchored on the 31st falls on the last day of shorter months.
+        """
+        rule = RecurringExpense("Rent", 1500, date(2024, 1, 31))
+        days = [e["date"] for e in rule.occurrences(date(2024, 1, 1), date(2024, 4, 30))]
+        self.assertEqual(days, [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)])
+
+    def test_counts_match_expansion(self):
+        """
+        Test arithmetic counts against brute-force expansion for several rules.
+        """
+        rules = [
+            RecurringExpense("Rent", 1500, date(2024, 1, 31)),
+            RecurringExpense("Gym", 30, date(2024, 3, 4), frequency="weekly", interval=2),
+            RecurringExpense("Water", 5, date(2024, 3, 4), frequency="daily", interval=10, end=date(2025, 2, 1)),
+            RecurringExpense("Insurance", 900, date(2020, 2, 29), frequency="yearly"),
+            RecurringExpense("Phone", 40, date(2024, 5, 15), frequency="monthly", interval=3),
+        ]
+        ranges = [
+            (date(2024, 1, 1), date(2030, 12, 31)),
+            (date(2024, 3, 5), date(2024, 3, 17)),
+            (date(2025, 2, 28), date(2025, 3, 31)),
+            (date(2019, 1, 1), date(2020, 2, 28)),
+        ]
+        for rule in rules:
+            for start, end in ranges:
+                expected = self.expand(rule, start, end)
+                self.assertEqual(rule.count_between(start, end), len(expected), (rule.description, start, end))
+                self.assertEqual([e["date"] for e in rule.occurrences(start, end)], expected)
+                self.assertEqual(rule.total_between(start, end), len(expected) * rule.amount)
+
+    def test_long_horizon_is_arithmetic(self):
+        """
+        Test totals over a long horizon.
+        """
+        rule = RecurringExpense("Salary", 10, date(2000, 1, 1), frequency="daily")
+        self.assertEqual(rule.count_between(date(2000, 1, 1), date(2999, 12, 31)), (date(2999, 12, 31) - date(2000, 1, 1)).days + 1)
+
+    def test_invalid_rules(self):
+        """
+        Test rejecting invalid rules.
+        """
+        with self.assertRaises(ValueError):
+            RecurringExpense("Rent", 0, date(2024, 1, 1))
+        with self.assertRaises(ValueError):
+            RecurringExpense("Rent", 10, date(2024, 1, 1), frequency="hourly")
+        with self.assertRaises(ValueError):
+            RecurringExpense("Rent", 10, date(2024, 1, 1), interval=0)
+        with self.assertRaises(ValueError):
+            RecurringExpense("Rent", 10, date(2024, 1, 1), end=date(2023, 1, 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from finegist.savings_calculator import SavingsCalculator
+import numpy as np
+from finegist.savings_calculator import SavingsCalculator, monthly_rate
 
 class TestSavingsCalculator(unittest.TestCase):
     def setUp(self):
@@ -49,5 +50,111 @@ class TestSavingsCalculator(unittest.TestCase):
         with self.assertRaises(ValueError):
             calculator.calculate_months_to_target(10000)
 
+    def test_calculate_batch(self):
+        """
+        Test calculating savings and months to target for many rows at once.
+        """
+        result = SavingsCalculator.calculate_batch([5000, 4000, 3000], [3000, 3000, 1000], [10000, 5000, 8000])
+        np.testing.assert_array_equal(result["savings"], [2000, 1000, 2000])
+        np.testing.assert_array_equal(result["months_to_target"], [5, 5, 4])
+        for mask in result["errors"].values():
+            self.assertFalse(mask.any())
+
+    def test_calculate_batch_errors(self):
+        """
+        Test that invalid rows are masked instead of raising.
+        """
+        result = SavingsCalculator.calculate_batch([5000, -1, 3000, 4000, np.nan], [3000, 0, 3000, 1000, 0], [10000, 100, 100, -5, 100])
+        errors = result["errors"]
+        np.testing.assert_array_equal(errors["income"], [False, True, False, False, True])
+        np.testing.assert_array_equal(errors["target"], [False, False, False, True, False])
+        np.testing.assert_array_equal(errors["savings"], [False, True, True, False, True])
+        self.assertEqual(result["months_to_target"][0], 5)
+        self.assertTrue(np.isnan(result["months_to_target"][1:]).all())
+        self.assertEqual(result["savings"][3], 3000)
+
+    def test_calculate_batch_without_targets(self):
+        """
+        Test that a batch without targets reports no target errors.
+        """
+        result = SavingsCalculator.calculate_batch([1000, 500], [400, 600])
+        np.testing.assert_array_equal(result["savings"], [600, -100])
+        np.testing.assert_array_equal(result["errors"]["target"], [False, False])
+        np.testing.assert_array_equal(result["errors"]["savings"], [False, True])
+        self.assertTrue(np.isnan(result["months_to_target"]).all())
+
+    def test_calculate_batch_broadcast(self):
+        """
+        Test that a single target applies to every row.
+        """
+        result = SavingsCalculator.calculate_batch(np.array([5000, 6000]), 3000, 12000)
+        np.testing.assert_array_equal(result["months_to_target"], [6, 4])
+
+    def test_monthly_rate(self):
+        """
+        Test converting annual rates to effective monthly rates.
+        """
+        self.assertAlmostEqual(float(monthly_rate(12)), 0.01)
+        self.assertAlmostEqual(float(monthly_rate(12, "annually")), 1.12 ** (1 / 12) - 1)
+        self.assertAlmostEqual(float(monthly_rate(12, "continuous")), np.exp(0.01) - 1)
+        with self.assertRaises(ValueError):
+            monthly_rate(12, "hourly")
+
+    def test_months_to_target_with_interest(self):
+        """
+        Test the closed-form time to target against the month-by-month balance path.
+        """
+        months = self.calculator.calculate_months_to_target_with_interest(100000, 5, initial_balance=1000)
+        path = dict(self.calculator.balance_path(5, initial_balance=1000, months=int(months) + 1))
+        self.assertLess(path[int(months)], 100000)
+        self.assertGreater(path[int(months) + 1], 100000)
+        self.assertEqual(self.calculator.calculate_months_to_target_with_interest(10000, 0), 5)
+
+    def test_months_to_target_with_contribution_growth(self):
+        """
+        Test time to target when contributions grow, including growth equal to the interest rate.
+        """
+        for rate, growth in ((5, 3), (12, 100 * (1.01 ** 12 - 1)), (0, 10)):
+            months = self.calculator.calculate_months_to_target_with_interest(
+                50000, rate, contribution_growth=growth
+            )
+            path = dict(self.calculator.balance_path(rate, contribution_growth=growth, months=int(months) + 1))
+            self.assertLess(path[int(months)], 50000)
+            self.assertGreater(path[int(months) + 1], 50000)
+        plain = self.calculator.calculate_months_to_target_with_interest(50000, 5)
+        self.assertLess(months, plain)
+
+    def test_project_months_to_target_vectorized(self):
+        """
+        Test projecting many scenarios at once, with unreachable ones as NaN.
+        """
+        months = SavingsCalculator.project_months_to_target(
+            np.array([2000, 0, 0, 2000]), 10000, np.array([0, 5, 0, 5]), initial_balance=1000
+        )
+        self.assertAlmostEqual(months[0], 4.5)
+        self.assertGreater(months[1], 0)
+        self.assertTrue(np.isnan(months[2]))
+        self.assertLess(months[3], 4.5)
+        with self.assertRaises(ValueError):
+            SavingsCalculator(3000, 3000).calculate_months_to_target_with_interest(10000, 0)
+
+    def test_project_months_to_target_already_reached(self):
+        """
+        Test that a target at or below the starting balance takes zero months, even without contributions.
+        """
+        months = SavingsCalculator.project_months_to_target(
+            np.array([0, 0, 0, 500]), np.array([0, 100, 50, 100]), np.array([5, 0, 5, 0]),
+            initial_balance=np.array([0, 100, 100, 0]),
+        )
+        np.testing.assert_array_equal(months, [0, 0, 0, 0.2])
+
+    def test_balance_path_is_lazy(self):
+        """
+        Test that the balance path is generated on demand.
+        """
+        path = self.calculator.balance_path(0.0)
+        self.assertEqual(next(path), (1, 2000))
+        self.assertEqual(next(path), (2, 4000))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+import random
+import unittest
+import numpy as np
+from finegist.sketches import HeavyHitters, QuantileSketch
+
+class TestQuantileSketch(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a stream of random values for testing.
+        """
+        rng = random.Random(1)
+        self.values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+
+    def assert_close_rank(self, sketch, q):
+        estimate = sketch.quantile(q)
+        true_rank = np.searchsorted(np.sort(self.values), estimate, side="right") / len(self.values)
+        self.assertAlmostEqual(true_rank, q, delta=0.03)
+
+    def test_quantiles(self):
+        """
+        Test that estimated quantiles are close in rank to the true ones.
+        """
+        sketch = QuantileSketch(k=200, seed=3)
+        for value in self.values:
+            sketch.update(value)
+        for q in (0.1, 0.5, 0.95):
+            self.assert_close_rank(sketch, q)
+        self.assertEqual(sketch.quantile(0), min(self.values))
+        self.assertEqual(sketch.quantile(1), max(self.values))
+        self.assertLess(sketch.size, 1500)
+
+    def test_merge(self):
+        """
+        Test merging sketches built on separate halves of the stream.
+        """
+        left = QuantileSketch(seed=1)
+        right = QuantileSketch(seed=2)
+        left.update_many(self.values[:10000])
+        right.update_many(self.values[10000:])
+        left.merge(right)
+        self.assertEqual(left.count, len(self.values))
+        self.assert_close_rank(left, 0.5)
+        self.assertAlmostEqual(left.rank(left.quantile(0.5)), 0.5, delta=0.03)
+
+    def test_invalid_use(self):
+        """
+        Test errors for empty sketches and invalid quantiles.
+        """
+        sketch = QuantileSketch()
+        with self.assertRaises(ValueError):
+            sketch.quantile(0.5)
+        sketch.update(1)
+        with self.assertRaises(ValueError):
+            sketch.quantile(1.5)
+
+class TestHeavyHitters(unittest.TestCase):
+    def test_top_keys(self):
+        """
+        Test that dominant keys are reported with bounded error.
+        """
+        rng = random.Random(5)
+        summary = HeavyHitters(capacity=10)
+        true = {}
+        for _ in range(5000):
+            key = rng.choice(["Rent", "Rent", "Rent", "Groceries", "Groceries"]) if rng.random() < 0.6 else f"Shop {rng.randint(1, 500)}"
+            weight = rng.randint(1, 20)
+            true[key] = true.get(key, 0) + weight
+            summary.update(key, weight)
+        top = dict(summary.top(2))
+        self.assertEqual(set(top), {"Rent", "Groceries"})
+        for key, estimate in top.items():
+            self.assertLessEqual(estimate, true[key])
+            self.assertGreaterEqual(estimate, true[key] - summary.error_bound)
+
+    def test_merge(self):
+        """
+        Test merging two summaries.
+        """
+        left = HeavyHitters(capacity=2)
+        right = HeavyHitters(capacity=2)
+        for key, weight in (("A", 10), ("B", 5)):
+            left.update(key, weight)
+        for key, weight in (("A", 7), ("C", 4)):
+            right.update(key, weight)
+        left.merge(right)
+        self.assertEqual(left.total, 26)
+        self.assertEqual(left.top(1)[0][0], "A")
+        self.assertLessEqual(len(left.top(10)), 2)
+
+    def test_matches_plain_misra_gries(self):
+        """
+        Test that the offset-and-heap updates give the same counters as decrementing every counter.
+        """
+        rng = random.Random(9)
+        for capacity in (1, 3, 8):
+            summary = HeavyHitters(capacity)
+            counters = {}
+            for _ in range(2000):
+                key, weight = rng.randint(0, 20), rng.randint(1, 9)
+                summary.update(key, weight)
+                if key in counters or len(counters) < capacity:
+                    counters[key] = counters.get(key, 0) + weight
+                    continue
+                decrement = min(weight, min(counters.values()))
+                counters = {k: v - decrement for k, v in counters.items() if v > decrement}
+                if weight > decrement:
+                    counters[key] = weight - decrement
+            self.assertEqual(dict(summary.top(capacity)), counters)
+
+    def test_invalid_weight(self):
+        """
+        Test rejecting non-positive weights.
+        """
+        with self.assertRaises(ValueError):
+            HeavyHitters().update("A", 0)
+
+if __name__ == "__main__":
+    unittest.main()